@@ -0,0 +1,217 @@
+"""Baseline schema
+
+The tables init_db() created with create_all before migrations existed,
+frozen as they were then. Databases created that way already have them:
+stamp those instead of upgrading, then upgrade to apply the later revisions,
+
+    alembic stamp 0001
+    alembic upgrade head
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+GENDERS = ("MALE", "FEMALE", "OTHER")
+EMPLOYEE_TYPES = ("CADRE", "CIVIL_SERVANT", "PUBLIC_EMPLOYEE", "LABORER")
+EMPLOYEE_STATUSES = (
+    "ACTIVE", "ON_LEAVE", "UNPAID_LEAVE", "MATERNITY_LEAVE", "STUDYING", "DIPLOMATIC_SPOUSE",
+    "RETIRED", "RESIGNED", "TRANSFERRED", "SUSPENDED", "DISPATCHED", "ROTATED",
+)
+SALARY_GRADE_TYPES = ("A3_1", "A2_1", "A1", "A0", "B", "C1")
+CONTRACT_TYPES = (
+    "PROBATION", "FIXED_TERM_12", "FIXED_TERM_24", "FIXED_TERM_36", "INDEFINITE", "SEASONAL", "PART_TIME",
+)
+CONTRACT_STATUSES = ("DRAFT", "ACTIVE", "EXPIRED", "TERMINATED", "EXTENDED", "SUSPENDED")
+
+ENUM_TYPES = ("gender", "employeetype", "employeestatus", "salarygradetype", "contracttype", "contractstatus")
+
+TABLES = ("salary_histories", "contracts", "salary_levels", "salary_grades", "employees", "departments", "positions")
+
+
+def _base_columns():
+    """Columns every BaseModel table has"""
+    return (
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("created_by", sa.Uuid(), nullable=True),
+        sa.Column("updated_by", sa.Uuid(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def upgrade() -> None:
+    sqlite = op.get_bind().dialect.name == "sqlite"
+
+    op.create_table(
+        "positions",
+        sa.Column("code", sa.String(length=50), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("level", sa.Integer(), nullable=True),
+        sa.Column("order", sa.Integer(), nullable=True),
+        sa.Column("position_allowance", sa.Float(), nullable=True),
+        sa.Column("responsibility_allowance", sa.Float(), nullable=True),
+        sa.Column("is_leadership", sa.Boolean(), nullable=True),
+        sa.Column("is_management", sa.Boolean(), nullable=True),
+        sa.Column("is_executive_committee", sa.Boolean(), nullable=True),
+        sa.Column("is_presidium_member", sa.Boolean(), nullable=True),
+        *_base_columns(),
+        sa.UniqueConstraint("code"),
+    )
+    # departments.manager_id and employees.department_id reference each other:
+    # the manager key is added once employees exists (SQLite cannot ALTER it in
+    # and does not check the referenced table on create)
+    op.create_table(
+        "departments",
+        sa.Column("code", sa.String(length=50), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("parent_id", sa.Uuid(), nullable=True),
+        sa.Column("manager_id", sa.Uuid(), nullable=True),
+        sa.Column("order", sa.Integer(), nullable=True),
+        *_base_columns(),
+        sa.ForeignKeyConstraint(["parent_id"], ["departments.id"]),
+        *([sa.ForeignKeyConstraint(["manager_id"], ["employees.id"])] if sqlite else []),
+        sa.UniqueConstraint("code"),
+    )
+    op.create_table(
+        "employees",
+        sa.Column("employee_code", sa.String(length=50), nullable=False),
+        sa.Column("full_name", sa.String(length=255), nullable=False),
+        sa.Column("date_of_birth", sa.Date(), nullable=False),
+        sa.Column("gender", sa.Enum(*GENDERS, name="gender"), nullable=False),
+        sa.Column("citizen_id", sa.String(length=20), nullable=False),
+        sa.Column("citizen_id_issue_date", sa.Date(), nullable=True),
+        sa.Column("citizen_id_issue_place", sa.String(length=255), nullable=True),
+        sa.Column("phone_number", sa.String(length=20), nullable=True),
+        sa.Column("email", sa.String(length=255), nullable=True),
+        sa.Column("permanent_address", sa.Text(), nullable=True),
+        sa.Column("temporary_address", sa.Text(), nullable=True),
+        sa.Column("hometown", sa.String(length=255), nullable=True),
+        sa.Column("ethnicity", sa.String(length=50), nullable=True),
+        sa.Column("religion", sa.String(length=50), nullable=True),
+        sa.Column("party_member", sa.Date(), nullable=True),
+        sa.Column("employee_type", sa.Enum(*EMPLOYEE_TYPES, name="employeetype"), nullable=False),
+        sa.Column("status", sa.Enum(*EMPLOYEE_STATUSES, name="employeestatus"), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("social_insurance_start_date", sa.Date(), nullable=True),
+        sa.Column("department_id", sa.Uuid(), nullable=True),
+        sa.Column("position_id", sa.Uuid(), nullable=True),
+        sa.Column("education_level", sa.String(length=100), nullable=True),
+        sa.Column("political_theory_level", sa.String(length=100), nullable=True),
+        sa.Column("state_management_level", sa.String(length=100), nullable=True),
+        sa.Column("avatar_url", sa.String(length=500), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        *_base_columns(),
+        sa.ForeignKeyConstraint(["department_id"], ["departments.id"]),
+        sa.ForeignKeyConstraint(["position_id"], ["positions.id"]),
+        sa.UniqueConstraint("citizen_id"),
+    )
+    op.create_index("ix_employees_email", "employees", ["email"], unique=True)
+    op.create_index("ix_employees_employee_code", "employees", ["employee_code"], unique=True)
+    op.create_index("ix_employees_full_name", "employees", ["full_name"])
+    if not sqlite:
+        op.create_foreign_key("departments_manager_id_fkey", "departments", "employees", ["manager_id"], ["id"])
+
+    op.create_table(
+        "salary_grades",
+        sa.Column("code", sa.String(length=20), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("grade_type", sa.Enum(*SALARY_GRADE_TYPES, name="salarygradetype"), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("raise_period_months", sa.Integer(), nullable=False),
+        sa.Column("min_level", sa.Integer(), nullable=True),
+        sa.Column("max_level", sa.Integer(), nullable=False),
+        *_base_columns(),
+        sa.UniqueConstraint("code"),
+    )
+    op.create_table(
+        "salary_levels",
+        sa.Column("salary_grade_id", sa.Uuid(), nullable=False),
+        sa.Column("level", sa.Integer(), nullable=False),
+        sa.Column("coefficient", sa.Float(), nullable=False),
+        *_base_columns(),
+        sa.ForeignKeyConstraint(["salary_grade_id"], ["salary_grades.id"]),
+    )
+    op.create_table(
+        "contracts",
+        sa.Column("contract_number", sa.String(length=100), nullable=False),
+        sa.Column("employee_id", sa.Uuid(), nullable=False),
+        sa.Column("contract_type", sa.Enum(*CONTRACT_TYPES, name="contracttype"), nullable=False),
+        sa.Column("status", sa.Enum(*CONTRACT_STATUSES, name="contractstatus"), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("end_date", sa.Date(), nullable=True),
+        sa.Column("probation_end_date", sa.Date(), nullable=True),
+        sa.Column("contract_order", sa.Integer(), nullable=True),
+        sa.Column("previous_contract_id", sa.Uuid(), nullable=True),
+        sa.Column("basic_salary", sa.Float(), nullable=False),
+        sa.Column("salary_coefficient", sa.Float(), nullable=True),
+        sa.Column("allowances", sa.Float(), nullable=True),
+        sa.Column("position", sa.String(length=255), nullable=True),
+        sa.Column("department", sa.String(length=255), nullable=True),
+        sa.Column("work_location", sa.String(length=500), nullable=True),
+        sa.Column("job_description", sa.Text(), nullable=True),
+        sa.Column("signed_date", sa.Date(), nullable=True),
+        sa.Column("signed_by_employee", sa.Boolean(), nullable=True),
+        sa.Column("signed_by_employer", sa.Boolean(), nullable=True),
+        sa.Column("employer_representative", sa.String(length=255), nullable=True),
+        sa.Column("contract_file_url", sa.String(length=500), nullable=True),
+        sa.Column("appendix_file_url", sa.String(length=500), nullable=True),
+        sa.Column("termination_date", sa.Date(), nullable=True),
+        sa.Column("termination_reason", sa.Text(), nullable=True),
+        sa.Column("termination_decision_number", sa.String(length=100), nullable=True),
+        sa.Column("extended_to_contract_id", sa.Uuid(), nullable=True),
+        sa.Column("extension_reason", sa.Text(), nullable=True),
+        sa.Column("probation_warning_sent", sa.Boolean(), nullable=True),
+        sa.Column("expiry_warning_sent", sa.Boolean(), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        *_base_columns(),
+        sa.ForeignKeyConstraint(["employee_id"], ["employees.id"]),
+        sa.ForeignKeyConstraint(["extended_to_contract_id"], ["contracts.id"]),
+        sa.ForeignKeyConstraint(["previous_contract_id"], ["contracts.id"]),
+    )
+    op.create_index("ix_contracts_contract_number", "contracts", ["contract_number"], unique=True)
+    op.create_table(
+        "salary_histories",
+        sa.Column("employee_id", sa.Uuid(), nullable=False),
+        sa.Column("salary_grade_id", sa.Uuid(), nullable=False),
+        sa.Column("salary_level", sa.Integer(), nullable=False),
+        sa.Column("salary_coefficient", sa.Float(), nullable=False),
+        sa.Column("effective_date", sa.Date(), nullable=False),
+        sa.Column("next_raise_date", sa.Date(), nullable=True),
+        sa.Column("decision_number", sa.String(length=100), nullable=True),
+        sa.Column("decision_date", sa.Date(), nullable=True),
+        sa.Column("is_early_raise", sa.Boolean(), nullable=True),
+        sa.Column("early_raise_reason", sa.Text(), nullable=True),
+        sa.Column("seniority_allowance_percent", sa.Float(), nullable=True),
+        sa.Column("position_allowance", sa.Float(), nullable=True),
+        sa.Column("responsibility_allowance", sa.Float(), nullable=True),
+        sa.Column("hazard_allowance", sa.Float(), nullable=True),
+        sa.Column("other_allowances", sa.Float(), nullable=True),
+        sa.Column("is_current", sa.Boolean(), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        *_base_columns(),
+        sa.ForeignKeyConstraint(["employee_id"], ["employees.id"]),
+        sa.ForeignKeyConstraint(["salary_grade_id"], ["salary_grades.id"]),
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        op.drop_constraint("departments_manager_id_fkey", "departments", type_="foreignkey")
+    for table in TABLES:
+        op.drop_table(table)
+    if op.get_bind().dialect.name == "postgresql":
+        for name in ENUM_TYPES:
+            op.execute(f"DROP TYPE IF EXISTS {name}")
\ No newline at end of file
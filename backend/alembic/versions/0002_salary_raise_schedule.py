@@ -0,0 +1,68 @@
+"""Salary raise schedule
+
+Adds job_runs (watermarks of the incremental batch jobs), the
+salary_histories.is_raise_eligible flag and the (is_current,
+next_raise_date) index the due-for-raise list reads.
+
+salary_grades.raise_period_months becomes nullable without a default: NULL
+means the Settings period of the grade type applies. Existing grades keep
+the period they were saved with (36 months unless set otherwise); clear it
+on the grades that should follow the Settings rules.
+
+is_raise_eligible starts empty: with no job_runs row yet, the first
+recompute_raise_schedule() run is a full one and fills it.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_runs",
+        sa.Column("job_name", sa.String(length=100), nullable=False),
+        sa.Column("status", sa.Enum("RUNNING", "SUCCESS", "FAILED", name="jobrunstatus"), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("watermark", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("processed_count", sa.Integer(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("created_by", sa.Uuid(), nullable=True),
+        sa.Column("updated_by", sa.Uuid(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_job_runs_job_name_started_at", "job_runs", ["job_name", "started_at"])
+
+    op.add_column("salary_histories", sa.Column("is_raise_eligible", sa.Boolean(), nullable=True))
+    op.create_index("ix_salary_histories_current_next_raise", "salary_histories", ["is_current", "next_raise_date"])
+
+    with op.batch_alter_table("salary_grades") as batch:
+        batch.alter_column("raise_period_months", existing_type=sa.Integer(), nullable=True)
+
+
+def downgrade() -> None:
+    op.execute("UPDATE salary_grades SET raise_period_months = 36 WHERE raise_period_months IS NULL")
+    with op.batch_alter_table("salary_grades") as batch:
+        batch.alter_column("raise_period_months", existing_type=sa.Integer(), nullable=False)
+
+    op.drop_index("ix_salary_histories_current_next_raise", table_name="salary_histories")
+    with op.batch_alter_table("salary_histories") as batch:
+        batch.drop_column("is_raise_eligible")
+
+    op.drop_index("ix_job_runs_job_name_started_at", table_name="job_runs")
+    op.drop_table("job_runs")
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP TYPE IF EXISTS jobrunstatus")
\ No newline at end of file
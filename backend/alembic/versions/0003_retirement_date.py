@@ -0,0 +1,68 @@
+"""Employee retirement date
+
+Adds the indexed employees.retirement_date and fills it from the date of
+birth and gender with the deployment's RETIREMENT_AGE_MALE /
+RETIREMENT_AGE_FEMALE. The calculation is copied here as it stood for this
+revision, so later changes to the application do not change the migration.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+
+from datetime import date
+from typing import Optional
+import calendar
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+WRITE_CHUNK_SIZE = 5000
+
+employees = sa.table(
+    "employees",
+    sa.column("id", sa.Uuid()),
+    sa.column("date_of_birth", sa.Date()),
+    sa.column("gender", sa.String()),
+    sa.column("retirement_date", sa.Date()),
+)
+
+
+def _retirement_date(date_of_birth: Optional[date], gender: str) -> Optional[date]:
+    """Birthday at retirement age; 29 February falls back to the 28th"""
+    if date_of_birth is None:
+        return None
+    year = date_of_birth.year + (settings.RETIREMENT_AGE_FEMALE if gender == "FEMALE" else settings.RETIREMENT_AGE_MALE)
+    day = min(date_of_birth.day, calendar.monthrange(year, date_of_birth.month)[1])
+    return date_of_birth.replace(year=year, day=day)
+
+
+def upgrade() -> None:
+    op.add_column("employees", sa.Column("retirement_date", sa.Date(), nullable=True))
+    op.create_index("ix_employees_retirement_date", "employees", ["retirement_date"])
+
+    bind = op.get_bind()
+    params = [
+        {"_id": row.id, "_retirement_date": _retirement_date(row.date_of_birth, row.gender)}
+        for row in bind.execute(sa.select(employees.c.id, employees.c.date_of_birth, employees.c.gender))
+    ]
+    statement = (
+        employees.update()
+        .where(employees.c.id == sa.bindparam("_id"))
+        .values(retirement_date=sa.bindparam("_retirement_date"))
+    )
+    for start in range(0, len(params), WRITE_CHUNK_SIZE):
+        bind.execute(statement, params[start:start + WRITE_CHUNK_SIZE])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_employees_retirement_date", table_name="employees")
+    with op.batch_alter_table("employees") as batch:
+        batch.drop_column("retirement_date")
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""Contract warning flags and indexes
+
+Makes contracts.probation_warning_sent / expiry_warning_sent NOT NULL with
+a false server default (NULL flags are read as not sent), and adds the
+partial (status, end date) indexes over contracts still waiting for a
+warning that the warning scan reads.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+# name, date column, flag
+WARNING_INDEXES = (
+    ("ix_contracts_status_end_date_unwarned", "end_date", "expiry_warning_sent"),
+    ("ix_contracts_status_probation_end_date_unwarned", "probation_end_date", "probation_warning_sent"),
+)
+
+
+def upgrade() -> None:
+    for _, _, flag in WARNING_INDEXES:
+        contracts = sa.table("contracts", sa.column(flag, sa.Boolean()))
+        op.execute(contracts.update().where(contracts.c[flag].is_(None)).values({flag: False}))
+    with op.batch_alter_table("contracts") as batch:
+        for _, _, flag in WARNING_INDEXES:
+            batch.alter_column(flag, existing_type=sa.Boolean(), nullable=False, server_default=sa.false())
+
+    for name, column, flag in WARNING_INDEXES:
+        unwarned = sa.column(flag, sa.Boolean()).is_(False)
+        op.create_index(name, "contracts", ["status", column], postgresql_where=unwarned, sqlite_where=unwarned)
+
+
+def downgrade() -> None:
+    for name, _, _ in WARNING_INDEXES:
+        op.drop_index(name, table_name="contracts")
+    with op.batch_alter_table("contracts") as batch:
+        for _, _, flag in WARNING_INDEXES:
+            batch.alter_column(flag, existing_type=sa.Boolean(), nullable=True, server_default=None)
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""Department closure table
+
+Adds department_closure: one (ancestor, descendant, depth) row per pair of
+departments on a path of the hierarchy, each department being its own
+ancestor at depth 0, and fills it from departments.parent_id. The
+walk is copied here as it stood for this revision.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+INSERT_CHUNK_SIZE = 5000
+
+departments = sa.table("departments", sa.column("id", sa.Uuid()), sa.column("parent_id", sa.Uuid()))
+
+
+def upgrade() -> None:
+    closure = op.create_table(
+        "department_closure",
+        sa.Column("ancestor_id", sa.Uuid(), nullable=False),
+        sa.Column("descendant_id", sa.Uuid(), nullable=False),
+        sa.Column("depth", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["ancestor_id"], ["departments.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["descendant_id"], ["departments.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("ancestor_id", "descendant_id"),
+    )
+    op.create_index("ix_department_closure_descendant_depth", "department_closure", ["descendant_id", "depth"])
+
+    bind = op.get_bind()
+    parents = dict(bind.execute(sa.select(departments.c.id, departments.c.parent_id)).all())
+    rows = []
+    for department_id in parents:
+        # A cycle in parent_id stops the walk instead of looping
+        ancestor, depth, seen = department_id, 0, set()
+        while ancestor is not None and ancestor not in seen:
+            seen.add(ancestor)
+            rows.append({"ancestor_id": ancestor, "descendant_id": department_id, "depth": depth})
+            ancestor, depth = parents.get(ancestor), depth + 1
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        bind.execute(closure.insert(), rows[start:start + INSERT_CHUNK_SIZE])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_department_closure_descendant_depth", table_name="department_closure")
+    op.drop_table("department_closure")
\ No newline at end of file
@@ -0,0 +1,24 @@
+"""Salary history employee index
+
+Indexes salary_histories.employee_id, which the roster export joins the
+current salary rows on.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_salary_histories_employee_id", "salary_histories", ["employee_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_salary_histories_employee_id", table_name="salary_histories")
\ No newline at end of file
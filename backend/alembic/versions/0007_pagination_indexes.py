@@ -0,0 +1,37 @@
+"""Keyset pagination indexes
+
+Indexes the sort keys of the cursor-paginated lists, each ending with id:
+(full_name, id) replaces the single-column full_name index of employees,
+plus (created_at, id) on employees and contracts and (effective_date, id)
+on salary histories.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+PAGINATION_INDEXES = (
+    ("ix_employees_full_name_id", "employees", ["full_name", "id"]),
+    ("ix_employees_created_at_id", "employees", ["created_at", "id"]),
+    ("ix_contracts_created_at_id", "contracts", ["created_at", "id"]),
+    ("ix_salary_histories_effective_date_id", "salary_histories", ["effective_date", "id"]),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns in PAGINATION_INDEXES:
+        op.create_index(name, table, columns)
+    op.drop_index("ix_employees_full_name", table_name="employees")
+
+
+def downgrade() -> None:
+    op.create_index("ix_employees_full_name", "employees", ["full_name"])
+    for name, table, _ in PAGINATION_INDEXES:
+        op.drop_index(name, table_name=table)
\ No newline at end of file
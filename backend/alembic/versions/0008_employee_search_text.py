@@ -0,0 +1,81 @@
+"""Employee search text
+
+Adds employees.search_text, the accent-free lowercase words of the full
+name, employee code, citizen id and email, and fills it. On PostgreSQL it
+also installs pg_trgm and the trigram GIN index the search queries use;
+other databases search an in-process index instead. The normalization is
+copied here as it stood for this revision.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+
+from typing import Optional
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+WRITE_CHUNK_SIZE = 5000
+
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+
+employees = sa.table(
+    "employees",
+    sa.column("id", sa.Uuid()),
+    sa.column("full_name", sa.String()),
+    sa.column("employee_code", sa.String()),
+    sa.column("citizen_id", sa.String()),
+    sa.column("email", sa.String()),
+    sa.column("search_text", sa.Text()),
+)
+
+
+def _search_text(*parts: Optional[str]) -> str:
+    """Lowercase accent-free words of the parts, e.g. Nguyễn Đức An -> nguyen duc an"""
+    text = " ".join(part for part in parts if part).replace("đ", "d").replace("Đ", "D")
+    text = "".join(char for char in unicodedata.normalize("NFD", text) if not unicodedata.combining(char))
+    return " ".join(_NON_WORD.split(text.lower())).strip()
+
+
+def upgrade() -> None:
+    op.add_column("employees", sa.Column("search_text", sa.Text(), nullable=True))
+
+    bind = op.get_bind()
+    params = [
+        {"_id": row.id, "_search_text": _search_text(row.full_name, row.employee_code, row.citizen_id, row.email)}
+        for row in bind.execute(
+            sa.select(employees.c.id, employees.c.full_name, employees.c.employee_code, employees.c.citizen_id, employees.c.email)
+        )
+    ]
+    statement = (
+        employees.update()
+        .where(employees.c.id == sa.bindparam("_id"))
+        .values(search_text=sa.bindparam("_search_text"))
+    )
+    for start in range(0, len(params), WRITE_CHUNK_SIZE):
+        bind.execute(statement, params[start:start + WRITE_CHUNK_SIZE])
+
+    if bind.dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            "ix_employees_search_text_trgm",
+            "employees",
+            ["search_text"],
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_index("ix_employees_search_text_trgm", table_name="employees")
+    with op.batch_alter_table("employees") as batch:
+        batch.drop_column("search_text")
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""Payroll snapshots
+
+Adds payroll_snapshots and, on PostgreSQL, the trigger rejecting updates
+and deletes of its rows.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+EMPLOYEE_TYPES = ("CADRE", "CIVIL_SERVANT", "PUBLIC_EMPLOYEE", "LABORER")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # employeetype already exists on PostgreSQL, created with employees
+    employee_type = (
+        postgresql.ENUM(*EMPLOYEE_TYPES, name="employeetype", create_type=False)
+        if bind.dialect.name == "postgresql"
+        else sa.Enum(*EMPLOYEE_TYPES, name="employeetype")
+    )
+    op.create_table(
+        "payroll_snapshots",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("period", sa.Date(), nullable=False),
+        sa.Column("employee_id", sa.Uuid(), nullable=False),
+        sa.Column("revision", sa.Integer(), nullable=False),
+        sa.Column("computed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("department_id", sa.Uuid(), nullable=True),
+        sa.Column("employee_type", employee_type, nullable=False),
+        sa.Column("source", sa.String(length=20), nullable=False),
+        sa.Column("salary_history_id", sa.Uuid(), nullable=True),
+        sa.Column("contract_id", sa.Uuid(), nullable=True),
+        sa.Column("base_wage", sa.Float(), nullable=False),
+        sa.Column("salary_coefficient", sa.Float(), nullable=True),
+        sa.Column("seniority_allowance_percent", sa.Float(), nullable=True),
+        sa.Column("base_salary", sa.Float(), nullable=False),
+        sa.Column("position_allowance", sa.Float(), nullable=False),
+        sa.Column("responsibility_allowance", sa.Float(), nullable=False),
+        sa.Column("hazard_allowance", sa.Float(), nullable=False),
+        sa.Column("seniority_allowance", sa.Float(), nullable=False),
+        sa.Column("other_allowances", sa.Float(), nullable=False),
+        sa.Column("gross_pay", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("period", "employee_id", "revision", name="uq_payroll_snapshots_period_employee_revision"),
+    )
+    op.create_index("ix_payroll_snapshots_employee_period", "payroll_snapshots", ["employee_id", "period"])
+
+    if bind.dialect.name == "postgresql":
+        op.execute(
+            "CREATE OR REPLACE FUNCTION payroll_snapshots_immutable() RETURNS trigger AS $$ "
+            "BEGIN RAISE EXCEPTION 'payroll_snapshots rows are immutable'; END $$ LANGUAGE plpgsql"
+        )
+        op.execute(
+            "CREATE TRIGGER payroll_snapshots_immutable BEFORE UPDATE OR DELETE ON payroll_snapshots "
+            "FOR EACH ROW EXECUTE FUNCTION payroll_snapshots_immutable()"
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_payroll_snapshots_employee_period", table_name="payroll_snapshots")
+    op.drop_table("payroll_snapshots")
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP FUNCTION IF EXISTS payroll_snapshots_immutable()")
\ No newline at end of file
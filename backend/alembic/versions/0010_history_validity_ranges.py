@@ -0,0 +1,82 @@
+"""Salary history validity ranges and as-of indexes
+
+Adds salary_histories.effective_to, backfills it and is_current from the
+effective dates, and indexes (employee_id, effective_date) on salary
+histories and (employee_id, start_date) on contracts. The single-column
+employee_id index of salary_histories is covered by the new one.
+
+The backfill is copied here as relink_salary_histories() stood for this
+revision, so later changes to the application do not change the migration.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+"""
+
+from itertools import groupby
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+WRITE_CHUNK_SIZE = 5000
+
+salary_histories = sa.table(
+    "salary_histories",
+    sa.column("id", sa.Uuid()),
+    sa.column("employee_id", sa.Uuid()),
+    sa.column("effective_date", sa.Date()),
+    sa.column("effective_to", sa.Date()),
+    sa.column("is_current", sa.Boolean()),
+    sa.column("is_active", sa.Boolean()),
+    sa.column("created_at", sa.DateTime(timezone=True)),
+)
+
+
+def _relink(bind) -> None:
+    """Each active row is valid until the next one of its employee, the last is current"""
+    table = salary_histories
+    rows = bind.execute(
+        sa.select(table.c.id, table.c.employee_id, table.c.effective_date, table.c.is_active, table.c.effective_to, table.c.is_current)
+        .order_by(table.c.employee_id, table.c.effective_date, table.c.created_at, table.c.id)
+    ).all()
+
+    changed = []
+    for _, group in groupby(rows, key=lambda row: row.employee_id):
+        group = list(group)
+        chain = [row for row in group if row.is_active is not False]
+        values = {row.id: (None, False) for row in group}
+        for row, next_row in zip(chain, chain[1:] + [None]):
+            values[row.id] = (next_row.effective_date, False) if next_row is not None else (None, True)
+        for row in group:
+            if values[row.id] != (row.effective_to, bool(row.is_current)):
+                changed.append({"_id": row.id, "_effective_to": values[row.id][0], "_is_current": values[row.id][1]})
+
+    statement = (
+        table.update()
+        .where(table.c.id == sa.bindparam("_id"))
+        .values(effective_to=sa.bindparam("_effective_to"), is_current=sa.bindparam("_is_current"))
+    )
+    for start in range(0, len(changed), WRITE_CHUNK_SIZE):
+        bind.execute(statement, changed[start:start + WRITE_CHUNK_SIZE])
+
+
+def upgrade() -> None:
+    op.add_column("salary_histories", sa.Column("effective_to", sa.Date(), nullable=True))
+    op.create_index("ix_salary_histories_employee_effective_date", "salary_histories", ["employee_id", "effective_date"])
+    op.drop_index("ix_salary_histories_employee_id", table_name="salary_histories")
+    op.create_index("ix_contracts_employee_id_start_date", "contracts", ["employee_id", "start_date"])
+
+    _relink(op.get_bind())
+
+
+def downgrade() -> None:
+    op.drop_index("ix_contracts_employee_id_start_date", table_name="contracts")
+    op.create_index("ix_salary_histories_employee_id", "salary_histories", ["employee_id"])
+    op.drop_index("ix_salary_histories_employee_effective_date", table_name="salary_histories")
+    with op.batch_alter_table("salary_histories") as batch:
+        batch.drop_column("effective_to")
\ No newline at end of file
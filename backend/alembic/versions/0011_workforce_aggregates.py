@@ -0,0 +1,151 @@
+"""Workforce aggregates
+
+Adds the dashboard counters (workforce_aggregates) and the buckets each
+employee is counted in (workforce_members), then fills both with a full
+reconciliation. The bucket rules are copied here as app.models.workforce
+stood for this revision, so later changes to the application do not change
+the migration.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18
+"""
+
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+INSERT_CHUNK_SIZE = 5000
+
+ALL = "all"
+NONE = "none"
+DIMENSIONS = ("department", "employee_type", "status", "gender", "birth_month", "salary_grade_type")
+INACTIVE_STATUSES = ("RETIRED", "RESIGNED", "TRANSFERRED")
+# Enum names are stored, buckets hold the values
+GRADE_TYPE_VALUES = {"A3_1": "A3.1", "A2_1": "A2.1"}
+
+employees = sa.table(
+    "employees",
+    sa.column("id", sa.Uuid()),
+    sa.column("department_id", sa.Uuid()),
+    sa.column("employee_type", sa.String()),
+    sa.column("status", sa.String()),
+    sa.column("gender", sa.String()),
+    sa.column("date_of_birth", sa.Date()),
+    sa.column("is_active", sa.Boolean()),
+)
+salary_histories = sa.table(
+    "salary_histories",
+    sa.column("employee_id", sa.Uuid()),
+    sa.column("salary_grade_id", sa.Uuid()),
+    sa.column("is_current", sa.Boolean()),
+    sa.column("is_active", sa.Boolean()),
+)
+salary_grades = sa.table("salary_grades", sa.column("id", sa.Uuid()), sa.column("grade_type", sa.String()))
+workforce_members = sa.table(
+    "workforce_members",
+    sa.column("employee_id", sa.Uuid()),
+    sa.column("scope", sa.String()),
+    *(sa.column(dimension, sa.String()) for dimension in DIMENSIONS),
+)
+workforce_aggregates = sa.table(
+    "workforce_aggregates",
+    sa.column("scope", sa.String()),
+    sa.column("dimension", sa.String()),
+    sa.column("bucket", sa.String()),
+    sa.column("count", sa.Integer()),
+    sa.column("updated_at", sa.DateTime(timezone=True)),
+)
+
+
+def _buckets(row) -> dict:
+    """Scope plus one bucket per dimension, None where the employee is not counted"""
+    buckets = dict.fromkeys(("scope", *DIMENSIONS))
+    if not row.is_active:
+        return buckets
+    buckets["scope"] = str(row.department_id) if row.department_id is not None else None
+    buckets["status"] = row.status
+    if row.status in INACTIVE_STATUSES:
+        return buckets
+    buckets["department"] = str(row.department_id) if row.department_id is not None else NONE
+    buckets["employee_type"] = row.employee_type
+    buckets["gender"] = row.gender
+    buckets["birth_month"] = f"{row.date_of_birth:%Y-%m}" if row.date_of_birth is not None else NONE
+    buckets["salary_grade_type"] = GRADE_TYPE_VALUES.get(row.grade_type, row.grade_type) or NONE
+    return buckets
+
+
+def _reconcile(bind) -> None:
+    query = (
+        sa.select(
+            employees.c.id,
+            employees.c.department_id,
+            employees.c.employee_type,
+            employees.c.status,
+            employees.c.gender,
+            employees.c.date_of_birth,
+            employees.c.is_active,
+            salary_grades.c.grade_type,
+        )
+        .outerjoin(
+            salary_histories,
+            sa.and_(
+                salary_histories.c.employee_id == employees.c.id,
+                salary_histories.c.is_current.is_(True),
+                salary_histories.c.is_active.is_(True),
+            ),
+        )
+        .outerjoin(salary_grades, salary_grades.c.id == salary_histories.c.salary_grade_id)
+    )
+
+    members, counts = [], {}
+    for row in bind.execute(query):
+        buckets = _buckets(row)
+        members.append({"employee_id": row.id, **buckets})
+        scopes = [ALL] if buckets["scope"] is None else [ALL, buckets["scope"]]
+        for dimension in DIMENSIONS:
+            if buckets[dimension] is None:
+                continue
+            for scope in scopes:
+                key = (scope, dimension, buckets[dimension])
+                counts[key] = counts.get(key, 0) + 1
+
+    now = datetime.now(timezone.utc)
+    aggregates = [
+        {"scope": scope, "dimension": dimension, "bucket": bucket, "count": count, "updated_at": now}
+        for (scope, dimension, bucket), count in counts.items()
+    ]
+    for table, rows in ((workforce_members, members), (workforce_aggregates, aggregates)):
+        for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+            bind.execute(table.insert(), rows[start:start + INSERT_CHUNK_SIZE])
+
+
+def upgrade() -> None:
+    op.create_table(
+        "workforce_aggregates",
+        sa.Column("scope", sa.String(length=36), nullable=False),
+        sa.Column("dimension", sa.String(length=30), nullable=False),
+        sa.Column("bucket", sa.String(length=50), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("scope", "dimension", "bucket"),
+    )
+    op.create_table(
+        "workforce_members",
+        sa.Column("employee_id", sa.Uuid(), nullable=False),
+        sa.Column("scope", sa.String(length=36), nullable=True),
+        *(sa.Column(dimension, sa.String(length=50), nullable=True) for dimension in DIMENSIONS),
+        sa.PrimaryKeyConstraint("employee_id"),
+    )
+    _reconcile(op.get_bind())
+
+
+def downgrade() -> None:
+    op.drop_table("workforce_members")
+    op.drop_table("workforce_aggregates")
\ No newline at end of file
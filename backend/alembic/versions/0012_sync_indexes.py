@@ -0,0 +1,31 @@
+"""Delta sync indexes
+
+Indexes (updated_at, id) on employees and contracts, the order their
+"changes since" feeds are read in.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+SYNC_INDEXES = (
+    ("ix_employees_updated_at_id", "employees"),
+    ("ix_contracts_updated_at_id", "contracts"),
+)
+
+
+def upgrade() -> None:
+    for name, table in SYNC_INDEXES:
+        op.create_index(name, table, ["updated_at", "id"])
+
+
+def downgrade() -> None:
+    for name, table in SYNC_INDEXES:
+        op.drop_index(name, table_name=table)
\ No newline at end of file
@@ -0,0 +1,27 @@
+"""API v1 router"""
+
+from fastapi import APIRouter
+
+from app.api.v1.endpoints import (
+    contracts,
+    dashboard,
+    debug,
+    departments,
+    employees,
+    reference,
+    reports,
+    retirement,
+    salary,
+)
+
+api_router = APIRouter()
+
+api_router.include_router(employees.router, prefix="/employees", tags=["Employees"])
+api_router.include_router(contracts.router, prefix="/contracts", tags=["Contracts"])
+api_router.include_router(salary.router, prefix="/salary", tags=["Salary"])
+api_router.include_router(departments.router, prefix="/departments", tags=["Departments"])
+api_router.include_router(reference.router, prefix="/reference", tags=["Reference data"])
+api_router.include_router(retirement.router, prefix="/retirement", tags=["Retirement"])
+api_router.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboard"])
+api_router.include_router(reports.router, prefix="/reports", tags=["Reports"])
+api_router.include_router(debug.router, prefix="/debug", tags=["Debug"])
\ No newline at end of file
@@ -0,0 +1,93 @@
+"""Contract endpoints - Hợp đồng lao động"""
+
+from datetime import datetime
+from typing import List, Optional
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.conditional import conditional_json, make_etag
+from app.core.serialization import JSONBytesResponse, serializer_for
+from app.db.database import commit, execute, get_db, get_read_db, get_session
+from app.models.contract import Contract, ContractStatus, ContractType
+from app.services.sync import list_changes
+from app.services.uploads import receive_upload
+from app.utils.pagination import PageParams, page_params, paginate
+
+router = APIRouter()
+
+CONTRACT_SERIALIZER = serializer_for(Contract)
+
+# Upload kind -> column holding its URL
+CONTRACT_FILE_COLUMNS = {
+    "contract": Contract.contract_file_url,
+    "appendix": Contract.appendix_file_url,
+}
+
+
+@router.get("")
+def list_contracts(
+    employee_id: Optional[uuid.UUID] = None,
+    status: Optional[List[ContractStatus]] = Query(None),
+    contract_type: Optional[List[ContractType]] = Query(None),
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_read_db),
+):
+    """Contracts, newest first, cursor-paginated"""
+    query = CONTRACT_SERIALIZER.select().where(Contract.is_active.is_(True))
+    if employee_id is not None:
+        query = query.where(Contract.employee_id == employee_id)
+    if status:
+        query = query.where(Contract.status.in_(status))
+    if contract_type:
+        query = query.where(Contract.contract_type.in_(contract_type))
+    result = paginate(db, query, (Contract.created_at.desc(), Contract.id.desc()), page)
+    return JSONBytesResponse(result.to_response(CONTRACT_SERIALIZER.from_row))
+
+
+@router.get("/changes")
+def contract_changes(
+    since: Optional[datetime] = Query(None, description="Without a cursor, changes after this time"),
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+):
+    """Contracts changed since the last sync, oldest change first; deactivated ones are listed in deleted"""
+
+    def load(ids):
+        rows = db.execute(CONTRACT_SERIALIZER.select().where(Contract.id.in_(ids)))
+        return {row.id: CONTRACT_SERIALIZER.from_row(row) for row in rows}
+
+    return JSONBytesResponse(list_changes(db, Contract, page, load, since).to_response())
+
+
+@router.get("/{contract_id}")
+def get_contract(contract_id: uuid.UUID, request: Request, db: Session = Depends(get_db)):
+    """One contract; 304 when the client's ETag is current"""
+    row = db.execute(CONTRACT_SERIALIZER.select().where(Contract.id == contract_id)).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Contract not found")
+    etag = make_etag("contract", row.id, row.updated_at)
+    return conditional_json(request.headers, etag, row.updated_at, lambda: CONTRACT_SERIALIZER.from_row(row))
+
+
+@router.put("/{contract_id}/files/{kind}")
+async def upload_contract_file(
+    contract_id: uuid.UUID,
+    request: Request,
+    kind: str = Path(..., pattern="^(contract|appendix)$"),
+    db=Depends(get_session),
+):
+    """Upload the signed contract or appendix scan (multipart field "file"); identical files are stored once"""
+    found = (await execute(db, select(Contract.id).where(Contract.id == contract_id, Contract.is_active.is_(True)))).scalar()
+    # Give the connection back while the body streams in
+    await commit(db)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Contract not found")
+
+    stored = await receive_upload(request)
+    column = CONTRACT_FILE_COLUMNS[kind]
+    await execute(db, update(Contract).where(Contract.id == contract_id).values({column: stored.url}))
+    await commit(db)
+    return {"kind": kind, "url": stored.url, "size": stored.size, "duplicate": not stored.created}
\ No newline at end of file
@@ -0,0 +1,21 @@
+"""Dashboard endpoints - Bảng điều khiển"""
+
+from typing import Optional
+import uuid
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.db.database import get_read_db
+from app.services.dashboard import get_workforce_dashboard
+
+router = APIRouter()
+
+
+@router.get("/workforce")
+def workforce_structure(
+    department_id: Optional[uuid.UUID] = None,
+    db: Session = Depends(get_read_db),
+):
+    """Headcount by department, type, status, gender, age band and salary grade type, with freshness timestamps"""
+    return get_workforce_dashboard(db, department_id=department_id)
\ No newline at end of file
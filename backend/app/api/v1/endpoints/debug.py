@@ -0,0 +1,19 @@
+"""Debug endpoints - development and staging only"""
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.core.config import settings
+from app.core.sql_profiler import get_recent_profiles
+
+router = APIRouter()
+
+
+@router.get("/sql-profiles")
+def sql_profiles(
+    limit: int = Query(20, ge=1, le=settings.SQL_PROFILER_HISTORY),
+    n_plus_one: bool = Query(False, description="Only requests with N+1 suspects"),
+):
+    """SQL profiles of the latest requests handled by this worker, newest first"""
+    if not settings.SQL_PROFILER_ENABLED:
+        raise HTTPException(status_code=404, detail="SQL profiler is disabled")
+    return get_recent_profiles(limit, n_plus_one)
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""Department hierarchy endpoints - Cây đơn vị"""
+
+from typing import Optional
+import uuid
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.db.database import get_read_db
+from app.models.employee import Employee
+from app.services.department_tree import (
+    get_ancestors,
+    get_headcount_rollup,
+    get_subtree,
+    subtree_employees_query,
+)
+from app.services.employee_profile import VIEWS, apply_load_plan, get_load_plan, serialize_employee
+from app.utils.pagination import PageParams, page_params, paginate
+
+router = APIRouter()
+
+
+@router.get("/headcount")
+def headcount_rollup(
+    root_id: Optional[uuid.UUID] = None,
+    db: Session = Depends(get_read_db),
+):
+    """Direct and roll-up headcount per department"""
+    return get_headcount_rollup(db, root_id=root_id)
+
+
+@router.get("/{department_id}/subtree")
+def department_subtree(
+    department_id: uuid.UUID,
+    include_self: bool = True,
+    active_only: bool = True,
+    db: Session = Depends(get_read_db),
+):
+    """Departments under a department"""
+    return get_subtree(db, department_id, include_self=include_self, active_only=active_only)
+
+
+@router.get("/{department_id}/ancestors")
+def department_ancestors(department_id: uuid.UUID, db: Session = Depends(get_read_db)):
+    """Breadcrumb from the top-level unit to the department"""
+    return get_ancestors(db, department_id)
+
+
+@router.get("/{department_id}/employees")
+def department_employees(
+    department_id: uuid.UUID,
+    include_sub_units: bool = True,
+    view: str = Query("summary", pattern=f"^({'|'.join(VIEWS)})$"),
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_read_db),
+):
+    """Employees of a department, including sub-units by default"""
+    query = subtree_employees_query(department_id)
+    if not include_sub_units:
+        query = query.where(Employee.department_id == department_id)
+    plan = get_load_plan(view)
+    result = paginate(db, apply_load_plan(query, plan), (Employee.full_name, Employee.id), page)
+    return result.to_response(lambda employee: serialize_employee(employee, plan))
\ No newline at end of file
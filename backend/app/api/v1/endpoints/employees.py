@@ -0,0 +1,197 @@
+"""Employee endpoints - Hồ sơ nhân sự"""
+
+from dataclasses import asdict
+from datetime import date, datetime
+from typing import List, Optional
+import uuid
+
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Query, Request, UploadFile
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.conditional import conditional_json
+from app.core.config import settings
+from app.core.serialization import JSONBytesResponse
+from app.db.database import ReadSessionLocal, commit, execute, get_db, get_read_db, get_session
+from app.models.employee import Employee, EmployeeStatus, EmployeeType
+from app.services.department_tree import subtree_department_ids
+from app.services.employee_profile import (
+    VIEWS,
+    apply_load_plan,
+    employee_version,
+    get_employee_profile,
+    get_load_plan,
+    serialize_employee,
+)
+from app.services.employee_search import search_employees
+from app.services.sync import list_changes
+from app.services.uploads import (
+    AVATAR_EXTENSIONS,
+    AVATAR_THUMBNAIL_SIZES,
+    generate_thumbnails,
+    receive_upload,
+    thumbnail_url,
+    verify_image,
+)
+from app.utils.pagination import PageParams, page_params, paginate
+
+router = APIRouter()
+
+EMPLOYEE_SORTS = {
+    "name": (Employee.full_name, Employee.id),
+    "newest": (Employee.created_at.desc(), Employee.id.desc()),
+}
+
+VIEW_PATTERN = f"^({'|'.join(VIEWS)})$"
+
+
+@router.get("")
+def list_employees(
+    department_id: Optional[uuid.UUID] = None,
+    include_sub_units: bool = True,
+    employee_type: Optional[List[EmployeeType]] = Query(None),
+    status: Optional[List[EmployeeStatus]] = Query(None),
+    sort: str = Query("name", pattern="^(name|newest)$"),
+    view: str = Query("summary", pattern=VIEW_PATTERN),
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_read_db),
+):
+    """Employees, cursor-paginated, loaded with the view's load plan"""
+    query = select(Employee).where(Employee.is_active.is_(True))
+    if department_id is not None:
+        if include_sub_units:
+            query = query.where(Employee.department_id.in_(subtree_department_ids(department_id)))
+        else:
+            query = query.where(Employee.department_id == department_id)
+    if employee_type:
+        query = query.where(Employee.employee_type.in_(employee_type))
+    if status:
+        query = query.where(Employee.status.in_(status))
+    plan = get_load_plan(view)
+    result = paginate(db, apply_load_plan(query, plan), EMPLOYEE_SORTS[sort], page)
+    return result.to_response(lambda employee: serialize_employee(employee, plan))
+
+
+@router.post("/import")
+def import_employees(file: UploadFile = File(...), db: Session = Depends(get_db)):
+    """Bulk import employees, contracts and salaries from .xlsx or .csv"""
+    # Rarely used, loaded on first import rather than on every worker start
+    from app.services.employee_import import import_employees_file
+
+    extension = (file.filename or "").rsplit(".", 1)[-1].lower()
+    if extension not in ("xlsx", "csv"):
+        raise HTTPException(status_code=400, detail="Only .xlsx and .csv files can be imported")
+    report = import_employees_file(db, file.file, file.filename)
+    return asdict(report)
+
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+@router.get("/export")
+def export_employees(
+    format: str = Query("xlsx", pattern="^(csv|xlsx)$"),
+    columns: Optional[str] = Query(None, description="Comma-separated column keys"),
+    department_id: Optional[uuid.UUID] = None,
+    include_sub_units: bool = True,
+    employee_type: Optional[List[EmployeeType]] = Query(None),
+    status: Optional[List[EmployeeStatus]] = Query(None),
+):
+    """Stream the personnel roster as .xlsx or .csv - Xuất danh sách nhân sự"""
+    from app.services.employee_export import resolve_columns, stream_employee_export
+
+    try:
+        selected = resolve_columns([name.strip() for name in columns.split(",") if name.strip()] if columns else None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    content = stream_employee_export(
+        ReadSessionLocal,
+        format,
+        selected,
+        department_id=department_id,
+        include_sub_units=include_sub_units,
+        employee_types=employee_type,
+        statuses=status,
+    )
+    filename = f"danh_sach_nhan_su_{date.today():%Y%m%d}.{format}"
+    return StreamingResponse(
+        content,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/search")
+def search(
+    q: str = Query(..., min_length=1, max_length=255),
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+):
+    """Accent-insensitive prefix and fuzzy search on name, code, citizen id and email"""
+    return JSONBytesResponse(search_employees(db, q, limit))
+
+
+@router.get("/changes")
+def employee_changes(
+    since: Optional[datetime] = Query(None, description="Without a cursor, changes after this time"),
+    view: str = Query("summary", pattern=VIEW_PATTERN),
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+):
+    """Employees changed since the last sync, oldest change first; deactivated ones are listed in deleted"""
+    plan = get_load_plan(view)
+
+    def load(ids):
+        employees = db.scalars(apply_load_plan(select(Employee).where(Employee.id.in_(ids)), plan)).unique()
+        return {employee.id: serialize_employee(employee, plan) for employee in employees}
+
+    return JSONBytesResponse(list_changes(db, Employee, page, load, since).to_response())
+
+
+@router.get("/{employee_id}")
+def get_employee(
+    employee_id: uuid.UUID,
+    request: Request,
+    view: str = Query("profile", pattern=VIEW_PATTERN),
+    db: Session = Depends(get_db),
+):
+    """Employee profile assembled in a fixed number of queries; 304 when the client's ETag is current"""
+    version = employee_version(db, employee_id, view)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    etag, last_modified = version
+    return conditional_json(request.headers, etag, last_modified, lambda: get_employee_profile(db, employee_id, view))
+
+
+@router.put("/{employee_id}/avatar")
+async def upload_avatar(
+    employee_id: uuid.UUID,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    db=Depends(get_session),
+):
+    """Upload an avatar photo (multipart field "file") - Ảnh đại diện; thumbnails follow in the background"""
+    found = (await execute(db, select(Employee.id).where(Employee.id == employee_id, Employee.is_active.is_(True)))).scalar()
+    # Give the connection back while the body streams in
+    await commit(db)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Employee not found")
+
+    allowed = [extension for extension in AVATAR_EXTENSIONS if extension in settings.ALLOWED_EXTENSIONS]
+    stored = await receive_upload(request, allowed_extensions=allowed)
+    await run_in_threadpool(verify_image, stored)
+    await execute(db, update(Employee).where(Employee.id == employee_id).values(avatar_url=stored.url))
+    await commit(db)
+    background_tasks.add_task(generate_thumbnails, stored.sha256, stored.extension)
+    return {
+        "avatar_url": stored.url,
+        "thumbnails": {size: thumbnail_url(stored.url, size) for size in AVATAR_THUMBNAIL_SIZES},
+        "size": stored.size,
+        "duplicate": not stored.created,
+    }
\ No newline at end of file
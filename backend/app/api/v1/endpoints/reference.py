@@ -0,0 +1,47 @@
+"""Reference data endpoints - Danh mục ngạch, bậc lương và chức vụ"""
+
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Path
+from sqlalchemy.orm import Session
+
+from app.db.database import get_db
+from app.services.reference_data import (
+    get_positions,
+    get_salary_coefficient,
+    get_salary_grades,
+    reference_cache,
+)
+
+router = APIRouter()
+
+
+@router.get("/salary-grades")
+def list_salary_grades(db: Session = Depends(get_db)):
+    """Salary grades with their levels and coefficients"""
+    return get_salary_grades(db)
+
+
+@router.get("/salary-grades/{salary_grade_id}/levels/{level}/coefficient")
+def salary_coefficient(
+    salary_grade_id: uuid.UUID,
+    level: int = Path(..., ge=1),
+    db: Session = Depends(get_db),
+):
+    """Coefficient for a grade and level"""
+    coefficient = get_salary_coefficient(db, salary_grade_id, level)
+    if coefficient is None:
+        raise HTTPException(status_code=404, detail="Salary level not found")
+    return {"salary_grade_id": salary_grade_id, "level": level, "coefficient": coefficient}
+
+
+@router.get("/positions")
+def list_positions(db: Session = Depends(get_db)):
+    """Positions"""
+    return get_positions(db)
+
+
+@router.get("/cache-stats")
+def cache_stats():
+    """Hit rate and latency counters of the reference data cache"""
+    return reference_cache.stats()
\ No newline at end of file
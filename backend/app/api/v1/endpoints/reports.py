@@ -0,0 +1,105 @@
+"""Report endpoints - Báo cáo theo mẫu
+
+Requesting a report answers 200 with its download URL when an identical
+report is already rendered, 202 while it renders in the background; poll
+/jobs/{key} until "done".
+"""
+
+from datetime import date
+from typing import Optional
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.orm import Session
+
+from app.core.file_serving import serve_file
+from app.core.serialization import JSONBytesResponse
+from app.db.database import get_read_db
+from app.services.report_rendering import MEDIA_TYPES, cached_output, parse_key
+from app.services.reports import DONE, QUEUED, ReportJob, get_report_job, request_report
+
+router = APIRouter()
+
+FORMAT_QUERY = Query("pdf", pattern="^(pdf|docx)$")
+
+
+def _job_response(request: Request, job: ReportJob) -> JSONBytesResponse:
+    content = job.to_dict()
+    content["status_url"] = str(request.url_for("get_report_status", key=job.key))
+    content["download_url"] = str(request.url_for("download_report", key=job.key)) if job.status == DONE else None
+    return JSONBytesResponse(content, status_code=202 if job.status == QUEUED else 200)
+
+
+def _find_job(key: str) -> ReportJob:
+    try:
+        job = get_report_job(key)
+    except ValueError:
+        job = None
+    if job is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return job
+
+
+@router.post("/payroll")
+def request_payroll_report(
+    request: Request,
+    year: int = Query(..., ge=1900, le=2100),
+    month: int = Query(..., ge=1, le=12),
+    department_id: Optional[uuid.UUID] = None,
+    format: str = FORMAT_QUERY,
+    db: Session = Depends(get_read_db),
+):
+    """Bảng thanh toán tiền lương of a month"""
+    job = request_report(db, "payroll", format, period=date(year, month, 1), department_id=department_id)
+    return _job_response(request, job)
+
+
+@router.post("/workforce")
+def request_workforce_report(
+    request: Request,
+    department_id: Optional[uuid.UUID] = None,
+    format: str = FORMAT_QUERY,
+    db: Session = Depends(get_read_db),
+):
+    """Báo cáo cơ cấu đội ngũ"""
+    job = request_report(db, "workforce", format, department_id=department_id)
+    return _job_response(request, job)
+
+
+@router.post("/assignments")
+def request_assignments_report(
+    request: Request,
+    on: date = Query(..., description="Date of the snapshot"),
+    department_id: Optional[uuid.UUID] = None,
+    format: str = FORMAT_QUERY,
+    db: Session = Depends(get_read_db),
+):
+    """Danh sách ngạch, bậc lương và hợp đồng on a date"""
+    job = request_report(db, "assignments", format, as_of=on, department_id=department_id)
+    return _job_response(request, job)
+
+
+@router.get("/jobs/{key}", name="get_report_status")
+def get_report_status(key: str, request: Request):
+    """State of a report render: queued, done or failed"""
+    return _job_response(request, _find_job(key))
+
+
+@router.get("/jobs/{key}/file", name="download_report")
+def download_report(key: str, request: Request):
+    """Rendered report file; a key's file never changes, so it is cached as immutable"""
+    job = _find_job(key)
+    if job.status != DONE:
+        raise HTTPException(status_code=409, detail=f"Report is {job.status}")
+    path = cached_output(key, job.format)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return serve_file(
+        str(path),
+        path.stat(),
+        request.headers,
+        etag=f'"{parse_key(key)[2]}"',
+        immutable=True,
+        media_type=MEDIA_TYPES[job.format],
+        filename=job.filename,
+    )
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""Retirement forecast endpoints - Dự báo nghỉ hưu
+
+app.services.retirement pulls in numpy, so the handlers import it on first
+use instead of every worker start paying for it.
+"""
+
+from typing import Optional
+import uuid
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.db.database import get_read_db
+
+router = APIRouter()
+
+
+@router.get("/forecast")
+def retirement_forecast(
+    years: int = Query(5, ge=1, le=20),
+    group_by: str = Query("quarter", pattern="^(month|quarter|year)$"),
+    department_id: Optional[uuid.UUID] = None,
+    include_employees: bool = True,
+    db: Session = Depends(get_read_db),
+):
+    """Retirement counts and lists per month/quarter/year and department"""
+    from app.services.retirement import get_retirement_forecast
+
+    return get_retirement_forecast(
+        db,
+        years=years,
+        group_by=group_by,
+        department_id=department_id,
+        include_employees=include_employees,
+    )
+
+
+@router.get("/warnings")
+def retirement_warnings(
+    department_id: Optional[uuid.UUID] = None,
+    db: Session = Depends(get_read_db),
+):
+    """Employees within RETIREMENT_NOTICE_MONTHS of retirement"""
+    from app.services.retirement import get_retirement_warnings
+
+    return get_retirement_warnings(db, department_id=department_id)
\ No newline at end of file
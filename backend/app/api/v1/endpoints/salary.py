@@ -0,0 +1,71 @@
+"""Salary endpoints - Quá trình lương"""
+
+from datetime import date
+from typing import Optional
+import uuid
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.core.serialization import JSONBytesResponse, serializer_for
+from app.db.database import get_read_db
+from app.models.employee import Employee
+from app.models.payroll import PayrollSnapshot
+from app.models.salary import SalaryHistory
+from app.services.as_of import as_of_query, serialize_as_of_row
+from app.utils.pagination import PageParams, page_params, paginate
+
+router = APIRouter()
+
+SALARY_HISTORY_SERIALIZER = serializer_for(SalaryHistory)
+
+
+@router.get("/histories")
+def list_salary_histories(
+    employee_id: Optional[uuid.UUID] = None,
+    salary_grade_id: Optional[uuid.UUID] = None,
+    current_only: bool = False,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_read_db),
+):
+    """Salary history entries, latest effective date first, cursor-paginated"""
+    query = SALARY_HISTORY_SERIALIZER.select().where(SalaryHistory.is_active.is_(True))
+    if employee_id is not None:
+        query = query.where(SalaryHistory.employee_id == employee_id)
+    if salary_grade_id is not None:
+        query = query.where(SalaryHistory.salary_grade_id == salary_grade_id)
+    if current_only:
+        query = query.where(SalaryHistory.is_current.is_(True))
+    order_by = (SalaryHistory.effective_date.desc(), SalaryHistory.id.desc())
+    result = paginate(db, query, order_by, page)
+    return JSONBytesResponse(result.to_response(SALARY_HISTORY_SERIALIZER.from_row))
+
+
+@router.get("/as-of")
+def salary_and_contracts_as_of(
+    on: date = Query(..., description="Date of the snapshot"),
+    department_id: Optional[uuid.UUID] = None,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_read_db),
+):
+    """Grade, level, coefficient and contract of each employee on a date, cursor-paginated by name"""
+    query = as_of_query(on, department_id=department_id)
+    result = paginate(db, query, (Employee.full_name, Employee.id), page)
+    return JSONBytesResponse(result.to_response(serialize_as_of_row))
+
+
+@router.get("/payroll")
+def list_payroll(
+    year: int = Query(..., ge=1900, le=2100),
+    month: int = Query(..., ge=1, le=12),
+    department_id: Optional[uuid.UUID] = None,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_read_db),
+):
+    """Payroll of a month, latest revision of each employee, cursor-paginated - Bảng lương tháng"""
+    # numpy is only loaded once payroll is used
+    from app.services.payroll import PAYROLL_SERIALIZER, payroll_query
+
+    query = payroll_query(date(year, month, 1), department_id=department_id)
+    result = paginate(db, query, (PayrollSnapshot.employee_id,), page)
+    return JSONBytesResponse(result.to_response(PAYROLL_SERIALIZER.from_row))
\ No newline at end of file
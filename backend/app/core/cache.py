@@ -0,0 +1,249 @@
+"""Two-tier cache: in-process LRU in front of a shared Redis tier
+
+Keys are namespaced with a version number stored in the shared tier.
+invalidate() bumps that version, so every worker stops reading the old keys
+as soon as it re-reads the version (at most CACHE_VERSION_CHECK_SECONDS
+later); the writing worker also drops its local tier immediately. Old keys
+simply expire through their TTL.
+"""
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, Tuple
+import json
+import logging
+import time
+
+from app.core.config import settings
+from app.core.metrics import CACHE_ERRORS, CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# Counters exported as hrms_cache_requests_total results
+_LOOKUP_RESULTS = {"local_hits": "local_hit", "shared_hits": "shared_hit", "misses": "miss"}
+
+
+class LocalLRU:
+    """Thread-safe in-process LRU"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is not _MISSING:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class MemoryBackend:
+    """In-memory stand-in for the Redis tier (tests, single process)"""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl if ttl else None)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = int(self._data.get(key, (b"0", None))[0]) + 1
+            self._data[key] = (str(value).encode(), None)
+            return value
+
+
+class RedisBackend:
+    """Shared tier on REDIS_URL"""
+
+    def __init__(self, url: str, db: int):
+        import redis
+
+        self._client = redis.Redis.from_url(url, db=db, socket_timeout=0.5)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        self._client.set(key, value, ex=ttl)
+
+    def incr(self, key: str) -> int:
+        return self._client.incr(key)
+
+
+class TwoTierCache:
+    """Read-through cache with versioned invalidation and hit/latency counters"""
+
+    def __init__(
+        self,
+        backend,
+        namespace: str,
+        ttl: int = 3600,
+        local_maxsize: int = 256,
+        version_check_seconds: float = 2.0,
+    ):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+        self.version_check_seconds = version_check_seconds
+        self.local = LocalLRU(local_maxsize)
+        self._version: Optional[int] = None
+        self._version_checked_at = 0.0
+        self._lock = Lock()
+        self.counters = {
+            "local_hits": 0,
+            "shared_hits": 0,
+            "misses": 0,
+            "errors": 0,
+            "invalidations": 0,
+            "load_seconds": 0.0,
+            "get_seconds": 0.0,
+            "gets": 0,
+        }
+
+    @property
+    def version_key(self) -> str:
+        return f"{self.namespace}:version"
+
+    def _current_version(self) -> int:
+        now = time.monotonic()
+        if self._version is not None and now - self._version_checked_at < self.version_check_seconds:
+            return self._version
+        try:
+            raw = self.backend.get(self.version_key)
+            version = int(raw) if raw is not None else 0
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Cache version lookup failed: {e}")
+            version = self._version or 0
+        with self._lock:
+            if version != self._version:
+                self.local.clear()
+            self._version = version
+            self._version_checked_at = now
+        return version
+
+    def _count(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self.counters[name] += amount
+        if name in _LOOKUP_RESULTS:
+            CACHE_REQUESTS.labels(self.namespace, _LOOKUP_RESULTS[name]).inc()
+        elif name == "errors":
+            CACHE_ERRORS.labels(self.namespace).inc()
+
+    def get_or_load(self, name: str, loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for name, calling loader on a miss
+
+        Args:
+            name: Entry name within the namespace
+            loader: Produces a JSON-serializable value
+
+        Returns:
+            Any: Cached or freshly loaded value
+        """
+        started = time.perf_counter()
+        key = f"{self.namespace}:v{self._current_version()}:{name}"
+        try:
+            value = self.local.get(key)
+            if value is not _MISSING:
+                self._count("local_hits")
+                return value
+
+            try:
+                raw = self.backend.get(key)
+            except Exception as e:
+                self._count("errors")
+                logger.warning(f"Cache read failed for {key}: {e}")
+                raw = None
+            if raw is not None:
+                value = json.loads(raw)
+                self.local.set(key, value)
+                self._count("shared_hits")
+                return value
+
+            self._count("misses")
+            load_started = time.perf_counter()
+            value = loader()
+            self._count("load_seconds", time.perf_counter() - load_started)
+            try:
+                self.backend.set(key, json.dumps(value, separators=(",", ":")).encode(), self.ttl)
+            except Exception as e:
+                self._count("errors")
+                logger.warning(f"Cache write failed for {key}: {e}")
+            self.local.set(key, value)
+            return value
+        finally:
+            self._count("gets")
+            self._count("get_seconds", time.perf_counter() - started)
+
+    def invalidate(self) -> None:
+        """Drop every entry of the namespace in all workers"""
+        try:
+            version = self.backend.incr(self.version_key)
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Cache invalidation failed: {e}")
+            version = (self._version or 0) + 1
+        with self._lock:
+            self.local.clear()
+            self._version = version
+            self._version_checked_at = time.monotonic()
+            self.counters["invalidations"] += 1
+
+    def stats(self) -> dict:
+        """Counters plus derived hit rate and mean latency"""
+        with self._lock:
+            stats = dict(self.counters)
+        hits = stats["local_hits"] + stats["shared_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_rate"] = hits / lookups if lookups else 0.0
+        stats["mean_get_ms"] = stats["get_seconds"] * 1000 / stats["gets"] if stats["gets"] else 0.0
+        stats["version"] = self._version
+        return stats
+
+
+def create_backend():
+    """Shared tier for the configured CACHE_BACKEND"""
+    if settings.ENVIRONMENT == "test" or settings.CACHE_BACKEND == "memory":
+        return MemoryBackend()
+    return RedisBackend(settings.REDIS_URL, settings.REDIS_DB)
+
+
+def create_cache(namespace: str) -> TwoTierCache:
+    """Cache configured from Settings"""
+    return TwoTierCache(
+        create_backend(),
+        namespace=f"{settings.APP_NAME.lower()}:{namespace}",
+        ttl=settings.CACHE_TTL_SECONDS,
+        local_maxsize=settings.CACHE_LOCAL_MAXSIZE,
+        version_check_seconds=settings.CACHE_VERSION_CHECK_SECONDS,
+    )
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""Celery application - Tác vụ nền
+
+    celery -A app.core.celery_app worker --loglevel=info
+    celery -A app.core.celery_app beat --loglevel=info
+
+Report renders are CPU-bound: run the worker with the default prefork pool,
+about one process per core. Each pool process loads the report fonts and
+templates once when it starts, not per task. Workers must share
+REPORT_CACHE_PATH with the API servers, which store the documents to render
+there and serve the results.
+"""
+
+from celery import Celery
+from celery.signals import worker_process_init
+
+from app.core.config import settings
+from app.services import report_rendering
+
+RENDER_TASK = "reports.render"
+PRUNE_TASK = "reports.prune_cache"
+
+celery_app = Celery("hrms", broker=settings.CELERY_BROKER_URL, backend=settings.CELERY_RESULT_BACKEND)
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    # Job state lives in the report cache, not in the result backend
+    task_ignore_result=True,
+    # Long renders: one task at a time per process, redelivered if the worker dies
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+    task_time_limit=settings.REPORT_JOB_TIMEOUT_SECONDS,
+    timezone="Asia/Ho_Chi_Minh",
+    beat_schedule={
+        "prune-report-cache": {"task": PRUNE_TASK, "schedule": 24 * 3600},
+    },
+)
+
+
+@worker_process_init.connect
+def preload_report_renderer(**kwargs):
+    """Load fonts and templates in each pool process"""
+    report_rendering.preload()
+
+
+@celery_app.task(name=RENDER_TASK)
+def render_report(key: str) -> str:
+    """Render a queued report into the cache"""
+    return report_rendering.render_report(key)
+
+
+@celery_app.task(name=PRUNE_TASK)
+def prune_report_cache() -> int:
+    """Delete report cache files unused for REPORT_CACHE_MAX_AGE_DAYS"""
+    return report_rendering.prune_report_cache()
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""Conditional requests - ETag / Last-Modified validators
+
+A client that kept a response sends its validators back (If-None-Match,
+If-Modified-Since); when they still match the resource, the answer is a 304
+without a body. conditional_json() does this for API resources and only
+builds the payload when it has to be sent; app.core.file_serving uses the
+same checks for files.
+"""
+
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Callable, Optional, Union
+import hashlib
+
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import NotModifiedResponse
+
+from app.core.serialization import JSONBytesResponse
+
+# API payloads are per user and change: keep them, but revalidate every time
+PRIVATE_REVALIDATE = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag (quoted) digesting the given version parts"""
+    digest = hashlib.blake2s("\x1f".join(map(str, parts)).encode(), digest_size=16)
+    return f'"{digest.hexdigest()}"'
+
+
+def to_timestamp(value: Union[datetime, float]) -> float:
+    """POSIX time of a datetime; naive ones (SQLite) are taken as UTC"""
+    if not isinstance(value, datetime):
+        return value
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def http_date(value: Union[datetime, float]) -> str:
+    """Last-Modified / Date header value"""
+    return formatdate(to_timestamp(value), usegmt=True)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison, as If-None-Match uses"""
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def is_not_modified(request_headers: Headers, etag: str, last_modified: Union[datetime, float, None]) -> bool:
+    """Whether the client's copy is current, per If-None-Match or If-Modified-Since"""
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-Modified-Since is ignored when If-None-Match is present
+        return etag_matches(if_none_match, etag)
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            # HTTP dates have whole seconds
+            return int(to_timestamp(last_modified)) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def conditional_json(
+    request_headers: Headers,
+    etag: str,
+    last_modified: Optional[datetime],
+    render: Callable[[], Any],
+) -> Response:
+    """
+    JSON response with validators, or 304 when the client's copy is current
+
+    Args:
+        request_headers: Request headers
+        etag: Strong ETag of the resource's current version
+        last_modified: Time of its last change, if known
+        render: Builds the payload; not called for a 304
+
+    Returns:
+        Response: 200 with the payload or 304
+    """
+    headers = {"etag": etag, "cache-control": PRIVATE_REVALIDATE}
+    if last_modified is not None:
+        headers["last-modified"] = http_date(last_modified)
+    if is_not_modified(request_headers, etag, last_modified):
+        return NotModifiedResponse(Headers(headers))
+    return JSONBytesResponse(render(), headers=headers)
\ No newline at end of file
@@ -1,6 +1,6 @@
 """Application configuration"""
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import validator
 import os
@@ -19,6 +19,26 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
     DATABASE_ECHO: bool = False
+    DATABASE_ASYNC: bool = False  # Route sessions through the async engine
+    DATABASE_ASYNC_URL: Optional[str] = None  # Derived from DATABASE_URL if empty
+    DATABASE_SCHEMA_CHECK: str = "strict"  # strict | warn | off - Alembic revision check on start
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a free connection
+    DATABASE_POOL_RECYCLE: int = 1800  # Seconds before a connection is reopened
+    
+    # Read replicas (reports, exports, list screens)
+    DATABASE_REPLICA_URLS: List[str] = []
+    DATABASE_REPLICA_POOL_SIZE: int = 10
+    DATABASE_REPLICA_MAX_OVERFLOW: int = 20
+    DATABASE_REPLICA_CHECK_SECONDS: float = 10.0  # Health check interval per replica
+    DATABASE_REPLICA_MAX_LAG_SECONDS: float = 30.0  # PostgreSQL replay lag allowed, 0 = unchecked
+    
+    # SQL profiler (development / staging)
+    SQL_PROFILER_ENABLED: bool = False
+    SQL_SLOW_QUERY_MS: float = 200.0  # Logged with their EXPLAIN plan
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5  # Same SELECT repeated this often in one request
+    SQL_PROFILER_HISTORY: int = 100  # Request profiles kept per worker
     
     # Security
     SECRET_KEY: str
@@ -30,6 +50,12 @@ class Settings(BaseSettings):
     REDIS_URL: str = "redis://localhost:6379"
     REDIS_DB: int = 0
     
+    # Reference data cache
+    CACHE_BACKEND: str = "redis"  # redis | memory (tests, single process)
+    CACHE_TTL_SECONDS: int = 3600
+    CACHE_LOCAL_MAXSIZE: int = 256
+    CACHE_VERSION_CHECK_SECONDS: float = 2.0  # How long a worker trusts its cached version
+    
     # CORS
     CORS_ORIGINS: List[str] = ["http://localhost:3000"]
     
@@ -55,26 +81,44 @@ class Settings(BaseSettings):
     # Pagination
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
+    SYNC_SAFETY_LAG_SECONDS: int = 30  # Delta sync re-sends changes this recent, for late commits
     
     # Celery
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
     
+    # Reports (PDF / Word)
+    REPORT_QUEUE: str = "celery"  # celery | local (tests, single server without a broker)
+    REPORT_WORKERS: int = 2  # Render processes of the local queue, 0 = render in the request
+    REPORT_CACHE_PATH: str = "./report_cache"  # Shared by API servers and workers
+    REPORT_CACHE_MAX_AGE_DAYS: int = 30  # Unused renders are pruned after this
+    REPORT_JOB_TIMEOUT_SECONDS: int = 600  # A render not done by then is queued again
+    REPORT_TEMPLATE_PATH: str = "./report_templates"  # Optional <report>.docx templates
+    REPORT_FONT_PATH: str = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+    REPORT_FONT_BOLD_PATH: str = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
+    REPORT_AGENCY_NAME: str = ""  # Tên cơ quan, printed on report headers
+    
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FILE: str = "logs/app.log"
+    LOG_FORMAT: str = "text"  # text | json
+    LOG_ENQUEUE: bool = True  # Write from a background thread
+    LOG_QUEUE_SIZE: int = 10000  # Queued records before DEBUG/INFO are dropped
+    LOG_SAMPLE_RATES: Dict[str, float] = {}  # Logger prefix -> fraction kept below WARNING
+    LOG_RATE_LIMIT: int = 0  # Records/second per logger below WARNING, 0 = unlimited
     
     # Sentry
     SENTRY_DSN: Optional[str] = None
     
     # Business Rules
-    SALARY_RAISE_REGULAR_MONTHS: int = 36  # Chuyên viên trở lên
-    SALARY_RAISE_STAFF_MONTHS: int = 24    # Nhân viên
+    SALARY_RAISE_REGULAR_MONTHS: int = 36  # Loại A0 trở lên (cao đẳng trở lên)
+    SALARY_RAISE_STAFF_MONTHS: int = 24    # Loại B, C (nhân viên)
     RETIREMENT_AGE_MALE: int = 62
     RETIREMENT_AGE_FEMALE: int = 60
     RETIREMENT_NOTICE_MONTHS: int = 6
     CONTRACT_PROBATION_WARNING_DAYS: int = 5
     CONTRACT_FIXED_TERM_WARNING_DAYS: int = 29
+    PAYROLL_BASE_WAGE: float = 2340000  # Lương cơ sở (VND/month), Nghị định 73/2024
     
     # Password Policy
     PASSWORD_MIN_LENGTH: int = 8
@@ -0,0 +1,234 @@
+"""File serving with validators, ranges and cache headers
+
+serve_file() answers a GET/HEAD for a file on disk:
+
+- strong ETag: supplied by the caller (a content hash for content-addressed
+  files), else derived from the inode's mtime and size
+- Cache-Control: "public, max-age=31536000, immutable" for content-addressed
+  files, which never change under their URL, so browsers reuse them without
+  even revalidating; "no-cache" otherwise, revalidated with a 304
+- If-None-Match / If-Modified-Since: 304 Not Modified, no body
+- Range: one byte range is answered with 206 (PDF viewers fetch the pages
+  they show); If-Range is honoured, an unsatisfiable range gets 416, and
+  multi-range requests get the whole file
+- body: sent through the ASGI http.response.pathsend or
+  http.response.zerocopy (sendfile) extensions when the server offers them;
+  uvicorn offers neither, so it is read in large chunks off the event loop
+
+UploadStaticFiles mounts UPLOAD_PATH with this behaviour; content-addressed
+paths of app.services.uploads are detected from their names.
+"""
+
+from mimetypes import guess_type
+from typing import Optional, Tuple
+from urllib.parse import quote
+import os
+import re
+import stat
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Receive, Scope, Send
+
+from app.core.conditional import http_date, is_not_modified
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+CHUNK_SIZE = 256 * 1024
+
+# objects/ab/cd/<sha256>.<ext> and thumbnails/<size>/ab/<sha256>.jpg
+_CONTENT_ADDRESSED = re.compile(
+    r"^(?:objects/[0-9a-f]{2}/[0-9a-f]{2}/|thumbnails/(\d+)/[0-9a-f]{2}/)([0-9a-f]{64})\.\w+$"
+)
+
+
+class RangeNotSatisfiable(Exception):
+    """The requested range starts past the end of the file"""
+
+
+def stat_etag(stat_result: os.stat_result) -> str:
+    """Strong validator of a file that may change in place"""
+    return f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+
+
+def content_address_etag(relative_path: str) -> Optional[str]:
+    """ETag of a content-addressed upload path, None for other paths"""
+    match = _CONTENT_ADDRESSED.match(relative_path)
+    if match is None:
+        return None
+    size, digest = match.groups()
+    return f'"{digest}-{size}"' if size else f'"{digest}"'
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Byte range of a Range header
+
+    Args:
+        header: Range header value
+        size: File size
+
+    Returns:
+        Tuple[int, int] | None: First and last byte (inclusive); None when
+            the whole file should be sent (no, malformed or multiple ranges)
+
+    Raises:
+        RangeNotSatisfiable: The range lies entirely past the end
+    """
+    unit, _, ranges = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        return None
+    first, separator, last = ranges.strip().partition("-")
+    if not separator:
+        return None
+    try:
+        if not first:
+            suffix = int(last)
+            if suffix <= 0:
+                raise RangeNotSatisfiable()
+            return max(size - suffix, 0), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    if start < 0 or end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def _range_applies(request_headers: Headers, etag: str, last_modified: str) -> bool:
+    """If-Range: send the range only if the client's copy is still current"""
+    if_range = request_headers.get("if-range")
+    if if_range is None:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith(('"', "W/")):
+        return if_range == etag
+    return if_range == last_modified
+
+
+class RangeFileResponse(Response):
+    """A file, or one byte range of it, sent zero-copy when the server allows"""
+
+    def __init__(
+        self,
+        path: str,
+        stat_result: os.stat_result,
+        headers: dict,
+        media_type: str,
+        byte_range: Optional[Tuple[int, int]] = None,
+    ):
+        self.path = path
+        self.media_type = media_type
+        self.background = None
+        size = stat_result.st_size
+        self.start, end = byte_range if byte_range is not None else (0, size - 1)
+        self.length = end - self.start + 1 if size else 0
+        self.full = byte_range is None
+        self.status_code = 200 if self.full else 206
+        self.init_headers(headers)
+        self.headers["content-length"] = str(self.length)
+        if not self.full:
+            self.headers["content-range"] = f"bytes {self.start}-{end}/{size}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope["method"].upper() == "HEAD" or self.length == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        extensions = scope.get("extensions") or {}
+        if self.full and "http.response.pathsend" in extensions:
+            await send({"type": "http.response.pathsend", "path": os.path.abspath(self.path)})
+            return
+        if "http.response.zerocopy" in extensions:
+            with open(self.path, "rb") as file:
+                await send({
+                    "type": "http.response.zerocopy",
+                    "file": file,
+                    "offset": self.start,
+                    "count": self.length,
+                    "more_body": False,
+                })
+            return
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.start)
+            remaining = self.length
+            while remaining > 0:
+                chunk = await file.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                # File shrank underneath us: end the response rather than hang
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def serve_file(
+    path: str,
+    stat_result: os.stat_result,
+    request_headers: Headers,
+    etag: Optional[str] = None,
+    immutable: bool = False,
+    media_type: Optional[str] = None,
+    filename: Optional[str] = None,
+) -> Response:
+    """
+    Response for a GET/HEAD of a file, honouring validators and ranges
+
+    Args:
+        path: File on disk
+        stat_result: os.stat() of it
+        request_headers: Request headers
+        etag: Strong ETag (quoted), default from mtime and size
+        immutable: The content under this URL never changes
+        media_type: Content-Type, guessed from the name when omitted
+        filename: Offer as a download under this name
+
+    Returns:
+        Response: 200, 206, 304 or 416
+    """
+    etag = etag or stat_etag(stat_result)
+    last_modified = http_date(stat_result.st_mtime)
+    headers = {
+        "etag": etag,
+        "last-modified": last_modified,
+        "cache-control": IMMUTABLE if immutable else REVALIDATE,
+        "accept-ranges": "bytes",
+    }
+    if filename is not None:
+        quoted = quote(filename)
+        headers["content-disposition"] = (
+            f'attachment; filename="{filename}"' if quoted == filename else f"attachment; filename*=utf-8''{quoted}"
+        )
+    if is_not_modified(request_headers, etag, stat_result.st_mtime):
+        return NotModifiedResponse(Headers(headers))
+
+    media_type = media_type or guess_type(filename or path)[0] or "application/octet-stream"
+    byte_range = None
+    range_header = request_headers.get("range")
+    if range_header and _range_applies(request_headers, etag, last_modified):
+        try:
+            byte_range = parse_range(range_header, stat_result.st_size)
+        except RangeNotSatisfiable:
+            return Response(
+                status_code=416,
+                headers={"content-range": f"bytes */{stat_result.st_size}", "accept-ranges": "bytes"},
+            )
+    return RangeFileResponse(path, stat_result, headers, media_type, byte_range)
+
+
+class UploadStaticFiles(StaticFiles):
+    """StaticFiles for UPLOAD_PATH with strong ETags, ranges and immutable caching"""
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        if status_code != 200 or not stat.S_ISREG(stat_result.st_mode):
+            return super().file_response(full_path, stat_result, scope, status_code)
+        relative = os.path.relpath(full_path, os.path.realpath(self.directory)).replace(os.sep, "/")
+        etag = content_address_etag(relative)
+        return serve_file(str(full_path), stat_result, Headers(scope=scope), etag=etag, immutable=etag is not None)
\ No newline at end of file
@@ -1,70 +1,375 @@
-"""Logging configuration"""
+"""Logging configuration
 
+Modules log through the standard logging module and InterceptHandler hands
+the records to loguru, which owns the sinks. With LOG_ENQUEUE the handler
+only puts the record on an in-process queue; a writer thread does the loguru
+work - formatting, file writes, rotation and zip compression - off the
+request thread. (loguru's own enqueue=True pickles every record through a
+multiprocessing pipe, which costs more than the synchronous write it saves.)
+LOG_FORMAT=json writes one JSON object per line, tagged with the id of the
+HTTP request that logged it (see RequestIdMiddleware).
+
+High-volume loggers can be sampled (LOG_SAMPLE_RATES) and capped per second
+(LOG_RATE_LIMIT). Both only ever drop records below WARNING, before they are
+queued.
+"""
+
+from contextvars import ContextVar
+from typing import Dict, Optional
+import json
 import logging
+import os
+import queue
+import random
+import re
 import sys
+import threading
+import traceback
+import uuid
 from pathlib import Path
 from loguru import logger
 
 from app.core.config import settings
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+NO_REQUEST = "-"
+
+# Id of the HTTP request being handled, set by RequestIdMiddleware
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+TEXT_FORMAT = "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {extra[request_id]} | {name}:{function}:{line} - {message}"
+CONSOLE_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | {extra[request_id]} | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+)
+
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._\-]{1,64}$")
+
+
+class _Caller(threading.local):
+    """Standard logging record being forwarded to loguru on this thread"""
+    record: Optional[logging.LogRecord] = None
+    request_id: Optional[str] = None
+
+
+_caller = _Caller()
+
+
+def _patch(record):
+    """Fill caller and request id on every loguru record"""
+    source = _caller.record
+    if source is None:
+        request_id = request_id_var.get()
+    else:
+        # The stdlib record already knows its caller and time, no need to
+        # walk frames, and a queued record keeps the time it was logged at
+        time = record["time"]
+        record["time"] = type(time).fromtimestamp(source.created, time.tzinfo)
+        record["name"] = source.name
+        record["module"] = source.module
+        record["function"] = source.funcName
+        record["line"] = source.lineno
+        request_id = _caller.request_id
+    if request_id is not None:
+        record["extra"]["request_id"] = request_id
+
+
+def _dumps(payload: dict) -> str:
+    if orjson is not None:
+        return orjson.dumps(payload, default=str).decode()
+    return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+def _json_format(record) -> str:
+    """loguru format function writing the record as one JSON line"""
+    extra = record["extra"]
+    # Sinks share the record, encode it once
+    if "_json" not in extra:
+        request_id = extra.get("request_id")
+        payload = {
+            "time": record["time"].isoformat(),
+            "level": record["level"].name,
+            "logger": record["name"],
+            "function": record["function"],
+            "line": record["line"],
+            "message": record["message"],
+            "request_id": None if request_id == NO_REQUEST else request_id,
+        }
+        for key, value in extra.items():
+            if key != "request_id" and not key.startswith("_"):
+                payload[key] = value
+        exception = record["exception"]
+        if exception is not None:
+            payload["exception"] = "".join(
+                traceback.format_exception(exception.type, exception.value, exception.traceback)
+            )
+        extra["_json"] = _dumps(payload)
+    return "{extra[_json]}\n"
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Drop part of the DEBUG/INFO records of high-volume loggers
+
+    Args:
+        sample_rates: Logger name prefix -> fraction of records kept, e.g.
+            {"sqlalchemy.engine": 0.1}; the longest matching prefix wins
+        rate_limit: Records per second kept per logger, 0 for no limit
+
+    Counters are per process and approximate under concurrency. Records
+    dropped by the rate limit are reported when the logger logs again in
+    a later second.
+    """
+
+    def __init__(self, sample_rates: Optional[Dict[str, float]] = None, rate_limit: int = 0):
+        super().__init__()
+        self.sample_rates = dict(sample_rates or {})
+        self.rate_limit = rate_limit
+        self._rates: Dict[str, float] = {}
+        self._windows: Dict[str, list] = {}  # logger -> [second, kept, dropped]
+
+    def _rate_for(self, name: str) -> float:
+        rate = self._rates.get(name)
+        if rate is None:
+            rate, prefix = 1.0, name
+            while prefix:
+                if prefix in self.sample_rates:
+                    rate = self.sample_rates[prefix]
+                    break
+                prefix = prefix.rpartition(".")[0]
+            self._rates[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate_for(record.name)
+        if rate < 1.0 and random.random() >= rate:
+            return False
+        if self.rate_limit:
+            second = int(record.created)
+            window = self._windows.get(record.name)
+            if window is None or window[0] != second:
+                if window is not None and window[2]:
+                    logger.warning(f"Rate limit dropped {window[2]} records of {record.name}")
+                self._windows[record.name] = [second, 1, 0]
+            elif window[1] >= self.rate_limit:
+                window[2] += 1
+                return False
+            else:
+                window[1] += 1
+        return True
+
+
+class InterceptHandler(logging.Handler):
+    """Forward standard logging records to loguru"""
+
+    def __init__(self, level: int = logging.NOTSET):
+        super().__init__(level)
+        self._levels: Dict[str, object] = {}
+
+    def _level(self, record: logging.LogRecord):
+        level = self._levels.get(record.levelname)
+        if level is None:
+            # Get corresponding Loguru level if it exists
+            try:
+                level = logger.level(record.levelname).name
+            except ValueError:
+                level = record.levelno
+            self._levels[record.levelname] = level
+        return level
+
+    def forward(self, record: logging.LogRecord, message: str, request_id: Optional[str]):
+        """Log a record with loguru on the current thread"""
+        level = self._level(record)
+        _caller.record, _caller.request_id = record, request_id
+        try:
+            if record.exc_info:
+                logger.opt(exception=record.exc_info).log(level, message)
+            else:
+                logger.log(level, message)
+        finally:
+            _caller.record = _caller.request_id = None
+
+    def emit(self, record: logging.LogRecord):
+        self.forward(record, record.getMessage(), request_id_var.get())
+
+
+class QueueInterceptHandler(InterceptHandler):
+    """
+    InterceptHandler forwarding from a writer thread
+
+    The calling thread renders the message and captures the request id, so
+    later changes to the arguments or context do not leak into the record,
+    then queues it. When the queue is full, records below WARNING are dropped
+    and counted; more severe ones are forwarded synchronously.
+
+    Args:
+        maxsize: Queued records before dropping
+    """
+
+    def __init__(self, level: int = logging.NOTSET, maxsize: int = 10000):
+        super().__init__(level)
+        self._queue: queue.Queue = queue.Queue(maxsize)
+        self._thread: Optional[threading.Thread] = None
+        self.dropped = 0
+        self.start()
+        os.register_at_fork(after_in_child=self._restart)
+
+    def start(self):
+        """Start the writer thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+            self._thread.start()
+
+    def _restart(self):
+        # Threads do not survive fork
+        if self._thread is None:
+            return
+        self._queue = queue.Queue(self._queue.maxsize)
+        self._thread = None
+        self.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            try:
+                self.forward(*item)
+            except Exception:
+                self.handleError(item[0])
+
+    def emit(self, record: logging.LogRecord):
+        item = (record, record.getMessage(), request_id_var.get())
+        if self._thread is None:
+            self.forward(*item)
+            return
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            if record.levelno >= logging.WARNING:
+                self.forward(*item)
+            else:
+                self.dropped += 1
+
+    def stop(self):
+        """Write out the queued records and forward synchronously from now on"""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+        if self.dropped:
+            logger.warning(f"Log queue was full, dropped {self.dropped} records")
+            self.dropped = 0
+
+
+# Handler installed by setup_logging when LOG_ENQUEUE is on
+_queue_handler: Optional[QueueInterceptHandler] = None
+
+
+class RequestIdMiddleware:
+    """
+    Bind a request id to the logs of each HTTP request
+
+    Reuses a well-formed incoming X-Request-ID (e.g. from the proxy) or
+    generates one, and echoes it in the response headers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        if request_id is None or not _VALID_REQUEST_ID.match(request_id):
+            request_id = uuid.uuid4().hex
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                headers = message.get("headers", [])
+                message["headers"] = [*headers, (b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
+
 
 def setup_logging():
     """Setup logging configuration"""
-    
+    global _queue_handler
+
     # Create logs directory if not exists
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
-    
-    # Remove default handler
+    log_dir = Path(settings.LOG_FILE).parent
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    json_output = settings.LOG_FORMAT.lower() == "json"
+    file_format = _json_format if json_output else TEXT_FORMAT
+
+    # Remove default handler, writing out what a previous setup still queued
+    if _queue_handler is not None:
+        _queue_handler.stop()
+        _queue_handler = None
     logger.remove()
-    
+    logger.configure(extra={"request_id": NO_REQUEST}, patcher=_patch)
+
     # Add console handler
     logger.add(
         sys.stdout,
-        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
+        format=_json_format if json_output else CONSOLE_FORMAT,
         level=settings.LOG_LEVEL,
-        colorize=True
+        colorize=not json_output
     )
-    
+
     # Add file handler
     logger.add(
         settings.LOG_FILE,
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
+        format=file_format,
         level=settings.LOG_LEVEL,
         rotation="10 MB",
         retention="30 days",
         compression="zip"
     )
-    
+
     # Add error file handler
     logger.add(
-        "logs/error.log",
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
+        log_dir / "error.log",
+        format=file_format,
         level="ERROR",
         rotation="10 MB",
         retention="30 days",
         compression="zip"
     )
-    
-    # Configure standard logging to use loguru
-    class InterceptHandler(logging.Handler):
-        def emit(self, record):
-            # Get corresponding Loguru level if it exists
-            try:
-                level = logger.level(record.levelname).name
-            except ValueError:
-                level = record.levelno
 
-            # Find caller from where originated the logged message
-            frame, depth = logging.currentframe(), 2
-            while frame.f_code.co_filename == logging.__file__:
-                frame = frame.f_back
-                depth += 1
+    # Configure standard logging to use loguru
+    if settings.LOG_ENQUEUE:
+        handler = _queue_handler = QueueInterceptHandler(maxsize=settings.LOG_QUEUE_SIZE)
+    else:
+        handler = InterceptHandler()
+    if settings.LOG_SAMPLE_RATES or settings.LOG_RATE_LIMIT:
+        handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_RATES, settings.LOG_RATE_LIMIT))
+    logging.basicConfig(handlers=[handler], level=0, force=True)
 
-            logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
-    
-    logging.basicConfig(handlers=[InterceptHandler()], level=0)
-    
     # Disable noisy loggers
     for logger_name in ["uvicorn.access", "uvicorn.error"]:
-        logging.getLogger(logger_name).handlers = []
\ No newline at end of file
+        logging.getLogger(logger_name).handlers = []
+
+
+def flush_logging():
+    """Write out queued records on shutdown; later records are logged synchronously"""
+    if _queue_handler is not None:
+        _queue_handler.stop()
\ No newline at end of file
@@ -0,0 +1,259 @@
+"""Prometheus metrics
+
+Everything is recorded when it happens (no scrape-time collectors), so the
+same metrics work with one process or several workers:
+
+- single process: /metrics serves the default registry
+- several workers: set the PROMETHEUS_MULTIPROC_DIR environment variable to
+  an empty, writable directory before starting the server (clear it on every
+  deploy). Each worker writes its samples there and /metrics aggregates all
+  of them, whichever worker serves the scrape. Gauges of a worker that shut
+  down are dropped by mark_process_dead() in the lifespan shutdown.
+
+Useful queries:
+    histogram_quantile(0.99, sum by (le, route) (rate(hrms_http_request_duration_seconds_bucket[5m])))
+    sum by (cache) (rate(hrms_cache_requests_total{result!="miss"}[5m]))
+      / sum by (cache) (rate(hrms_cache_requests_total[5m]))
+"""
+
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Optional
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+from starlette.routing import Match
+
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+# HTTP
+HTTP_REQUEST_DURATION = Histogram(
+    "hrms_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "hrms_http_requests_in_progress",
+    "HTTP requests being handled",
+    ["method", "route"],
+    multiprocess_mode="livesum",
+)
+HTTP_REQUEST_QUERIES = Histogram(
+    "hrms_http_request_queries",
+    "SQL statements executed per HTTP request",
+    ["method", "route"],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+HTTP_REQUEST_DB_DURATION = Histogram(
+    "hrms_http_request_db_seconds",
+    "Time spent in SQL statements per HTTP request",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+
+# Database
+DB_QUERY_DURATION = Histogram(
+    "hrms_db_query_duration_seconds",
+    "SQL statement execution time",
+    ["engine"],
+    buckets=QUERY_BUCKETS,
+)
+DB_POOL_CHECKOUT_DURATION = Histogram(
+    "hrms_db_pool_checkout_seconds",
+    "Time to get a connection from the pool, waiting for a free slot or opening a connection",
+    ["engine"],
+    buckets=QUERY_BUCKETS,
+)
+DB_POOL_SIZE = Gauge(
+    "hrms_db_pool_size",
+    "Configured pool size",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "hrms_db_pool_checked_out",
+    "Connections currently checked out",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "hrms_db_pool_overflow",
+    "Connections open beyond pool_size",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+
+# Cache
+CACHE_REQUESTS = Counter(
+    "hrms_cache_requests_total",
+    "Cache lookups by outcome",
+    ["cache", "result"],
+)
+CACHE_ERRORS = Counter(
+    "hrms_cache_errors_total",
+    "Shared cache tier failures",
+    ["cache"],
+)
+
+# Background jobs
+JOB_DURATION = Histogram(
+    "hrms_job_duration_seconds",
+    "Batch job run time",
+    ["job", "status"],
+    buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0),
+)
+JOB_PROCESSED_ROWS = Counter(
+    "hrms_job_processed_rows_total",
+    "Rows processed by batch jobs",
+    ["job"],
+)
+JOB_LAST_SUCCESS = Gauge(
+    "hrms_job_last_success_timestamp_seconds",
+    "Unix time of the last successful run",
+    ["job"],
+    multiprocess_mode="max",
+)
+
+# [statement count, seconds] of the HTTP request being handled
+_request_queries: ContextVar[Optional[list]] = ContextVar("request_queries", default=None)
+
+
+def instrument_engine(engine, name: str) -> None:
+    """
+    Record statement timings and pool usage of an engine
+
+    Args:
+        engine: Sync Engine (for an AsyncEngine pass engine.sync_engine)
+        name: Value of the "engine" label
+    """
+    query_duration = DB_QUERY_DURATION.labels(name)
+    checkout_duration = DB_POOL_CHECKOUT_DURATION.labels(name)
+    pool = engine.pool
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_query(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _end_query(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        query_duration.observe(elapsed)
+        totals = _request_queries.get()
+        if totals is not None:
+            totals[0] += 1
+            totals[1] += elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def _failed_query(context):
+        started = context.connection.info.get("query_started") if context.connection is not None else None
+        if started:
+            started.pop()
+
+    if isinstance(pool, QueuePool):
+        DB_POOL_SIZE.labels(name).set(pool.size())
+        checked_out = DB_POOL_CHECKED_OUT.labels(name)
+        overflow = DB_POOL_OVERFLOW.labels(name)
+
+        def _update_pool(*args):
+            checked_out.set(pool.checkedout())
+            overflow.set(max(pool.overflow(), 0))
+
+        event.listen(pool, "checkout", _update_pool)
+        event.listen(pool, "checkin", _update_pool)
+
+    # The pool has no event before a checkout starts, so time connect() itself
+    connect = pool.connect
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            checkout_duration.observe(time.perf_counter() - started)
+
+    pool.connect = timed_connect
+
+
+class MetricsMiddleware:
+    """Latency, in-flight and per-request SQL metrics by route template"""
+
+    def __init__(self, app):
+        self.app = app
+        self._routes: Optional[tuple] = None
+        self._route_template = lru_cache(maxsize=4096)(self._match_route)
+
+    def _match_route(self, method: str, path: str) -> str:
+        """Template of the route serving a path, e.g. /api/v1/employees/{employee_id}"""
+        scope = {"type": "http", "method": method, "path": path}
+        partial = None
+        for route in self._routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+            if match == Match.PARTIAL and partial is None:
+                partial = route.path
+        # Unknown paths share one label so scanners cannot blow up the series count
+        return partial or "unmatched"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self._routes is None:
+            self._routes = tuple(scope["app"].router.routes)
+        method = scope["method"]
+        route = self._route_template(method, scope["path"])
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method, route)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        totals = [0, 0.0]
+        token = _request_queries.set(totals)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUEST_DURATION.labels(method, route, str(status)).observe(time.perf_counter() - started)
+            in_progress.dec()
+            _request_queries.reset(token)
+            HTTP_REQUEST_QUERIES.labels(method, route).observe(totals[0])
+            HTTP_REQUEST_DB_DURATION.labels(method, route).observe(totals[1])
+
+
+def render_metrics() -> bytes:
+    """Exposition of every metric, aggregated across workers in multiprocess mode"""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def mark_process_dead() -> None:
+    """Drop the live gauges of this worker on shutdown"""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
\ No newline at end of file
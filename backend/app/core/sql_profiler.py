@@ -0,0 +1,280 @@
+"""Per-request SQL profiler - development and staging
+
+With SQL_PROFILER_ENABLED, engine events record every statement executed
+while an HTTP request is handled, grouped by fingerprint: the statement with
+literals, placeholders and IN lists normalized, so the same query with other
+parameters counts as one. A SELECT fingerprint repeated at least
+SQL_N_PLUS_ONE_THRESHOLD times in one request is flagged as an N+1 suspect,
+typically a lazy relationship touched in a loop.
+
+Statements slower than SQL_SLOW_QUERY_MS go to the slow-query log with their
+EXPLAIN plan. For HTTP requests the plan is fetched after the response is
+sent, on a separate connection, so profiling does not add to the request.
+
+The summary is sent as X-SQL-* response headers and the last
+SQL_PROFILER_HISTORY profiles of each worker are served by
+GET /api/v1/debug/sql-profiles. When disabled, neither the engine listeners
+nor the middleware are installed.
+"""
+
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional
+import logging
+import re
+import time
+
+from sqlalchemy import event
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.logging import request_id_var
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("app.sql.slow")
+
+_SPACES = re.compile(r"\s+")
+# String and numeric literals, then the placeholder styles of the DBAPI drivers
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%\(\w+\)s|%s|\$\d+|(?<!:):\w+|\?")
+_IN_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """
+    Normalize a statement so executions with other parameters match
+
+    Example:
+        "SELECT * FROM contracts WHERE employee_id = %(id_1)s LIMIT 10"
+        -> "SELECT * FROM contracts WHERE employee_id = ? LIMIT ?"
+    """
+    text = _LITERALS.sub("?", _SPACES.sub(" ", statement).strip())
+    return _IN_LISTS.sub("(?, ...)", text)
+
+
+@dataclass
+class StatementStats:
+    """Executions of one fingerprint within a request"""
+    fingerprint: str
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+
+@dataclass
+class SlowStatement:
+    """Statement over the slow-query threshold, explained after the response"""
+    engine: Any
+    statement: str
+    parameters: Any
+    seconds: float
+    plan: Optional[str] = None
+
+
+@dataclass
+class RequestProfile:
+    """Statements executed while handling one HTTP request"""
+    method: str
+    path: str
+    request_id: Optional[str]
+    started_at: datetime
+    status: Optional[int] = None
+    duration_seconds: float = 0.0
+    count: int = 0
+    total_seconds: float = 0.0
+    statements: Dict[str, StatementStats] = field(default_factory=dict)
+    slow: List[SlowStatement] = field(default_factory=list)
+
+    def record(self, statement: str, seconds: float) -> None:
+        key = fingerprint(statement)
+        stats = self.statements.get(key)
+        if stats is None:
+            stats = self.statements[key] = StatementStats(key)
+        stats.count += 1
+        stats.total_seconds += seconds
+        stats.max_seconds = max(stats.max_seconds, seconds)
+        self.count += 1
+        self.total_seconds += seconds
+
+    def n_plus_one(self) -> List[StatementStats]:
+        """SELECT fingerprints repeated at least SQL_N_PLUS_ONE_THRESHOLD times"""
+        return [
+            stats
+            for stats in self.statements.values()
+            if stats.count >= settings.SQL_N_PLUS_ONE_THRESHOLD and stats.fingerprint.upper().startswith("SELECT")
+        ]
+
+    def to_dict(self) -> dict:
+        statements = sorted(self.statements.values(), key=lambda stats: stats.total_seconds, reverse=True)
+        return {
+            "method": self.method,
+            "path": self.path,
+            "request_id": self.request_id,
+            "started_at": self.started_at.isoformat(),
+            "status": self.status,
+            "duration_ms": round(self.duration_seconds * 1000, 2),
+            "queries": self.count,
+            "sql_ms": round(self.total_seconds * 1000, 2),
+            "n_plus_one": [stats.fingerprint for stats in self.n_plus_one()],
+            "statements": [
+                {
+                    "fingerprint": stats.fingerprint,
+                    "count": stats.count,
+                    "total_ms": round(stats.total_seconds * 1000, 2),
+                    "max_ms": round(stats.max_seconds * 1000, 2),
+                }
+                for stats in statements
+            ],
+            "slow": [
+                {"statement": slow.statement, "ms": round(slow.seconds * 1000, 2), "plan": slow.plan}
+                for slow in self.slow
+            ],
+        }
+
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("sql_profile", default=None)
+_explaining: ContextVar[bool] = ContextVar("sql_profiler_explaining", default=False)
+recent_profiles: Deque[RequestProfile] = deque(maxlen=settings.SQL_PROFILER_HISTORY)
+
+
+def explain(engine, statement: str, parameters: Any) -> Optional[str]:
+    """
+    Query plan of a SELECT, on a separate connection
+
+    Returns:
+        str | None: Plan lines, None for statements that are not SELECTs
+    """
+    if not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        return None
+    prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    token = _explaining.set(True)
+    try:
+        with engine.connect() as connection:
+            rows = connection.exec_driver_sql(prefix + statement, parameters).all()
+    except Exception as e:
+        return f"EXPLAIN failed: {e}"
+    finally:
+        _explaining.reset(token)
+    return "\n".join(" ".join(str(value) for value in row) for row in rows)
+
+
+def _log_slow(slow: SlowStatement, where: str) -> None:
+    message = f"Slow query ({slow.seconds * 1000:.1f} ms) in {where}: {slow.statement}"
+    if slow.parameters:
+        message += f"\nParameters: {str(slow.parameters)[:500]}"
+    if slow.plan:
+        message += f"\nPlan:\n{slow.plan}"
+    slow_query_logger.warning(message)
+
+
+def profile_engine(engine, explain_slow: bool = True) -> None:
+    """
+    Attach the profiler to an engine
+
+    Args:
+        engine: Sync Engine (for an AsyncEngine pass engine.sync_engine)
+        explain_slow: Fetch plans of slow statements; off for async drivers,
+            whose statements cannot be replayed on a blocking connection
+    """
+    threshold = settings.SQL_SLOW_QUERY_MS / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("profiler_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _end(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["profiler_started"].pop()
+        if _explaining.get():
+            return
+        profile = _current.get()
+        if profile is not None:
+            profile.record(statement, elapsed)
+        if elapsed < threshold:
+            return
+        replay = explain_slow and not executemany
+        slow = SlowStatement(engine, statement, parameters if replay else None, elapsed)
+        if profile is not None:
+            profile.slow.append(slow)
+        else:
+            # Jobs and scripts: nothing waits on a response, explain right away
+            slow.plan = explain(engine, statement, parameters) if replay else None
+            _log_slow(slow, "background work")
+
+    @event.listens_for(engine, "handle_error")
+    def _failed(context):
+        started = context.connection.info.get("profiler_started") if context.connection is not None else None
+        if started:
+            started.pop()
+
+
+def _report(profile: RequestProfile) -> None:
+    """Explain and log the slow statements and N+1 suspects of a finished request"""
+    where = f"{profile.method} {profile.path}"
+    for slow in profile.slow:
+        if slow.parameters is not None:
+            slow.plan = explain(slow.engine, slow.statement, slow.parameters)
+        _log_slow(slow, where)
+    for stats in profile.n_plus_one():
+        logger.warning(f"N+1 suspect in {where}: {stats.count}x {stats.fingerprint}")
+
+
+class SQLProfilerMiddleware:
+    """Profile the statements of each HTTP request and summarize them in X-SQL-* headers"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(
+            method=scope["method"],
+            path=scope["path"],
+            request_id=request_id_var.get(),
+            started_at=datetime.utcnow(),
+        )
+
+        async def send_with_summary(message):
+            # Statements run while a streaming body is sent are only in the profile
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-sql-queries", str(profile.count).encode()),
+                    (b"x-sql-time-ms", f"{profile.total_seconds * 1000:.1f}".encode()),
+                    (b"x-sql-n-plus-one", str(len(profile.n_plus_one())).encode()),
+                ]
+            await send(message)
+
+        token = _current.set(profile)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_summary)
+        finally:
+            profile.duration_seconds = time.perf_counter() - started
+            _current.reset(token)
+            recent_profiles.append(profile)
+            if profile.slow or profile.n_plus_one():
+                await run_in_threadpool(_report, profile)
+
+
+def get_recent_profiles(limit: int = 20, n_plus_one_only: bool = False) -> List[dict]:
+    """
+    Latest request profiles of this worker, newest first
+
+    Args:
+        limit: Maximum profiles
+        n_plus_one_only: Only requests with N+1 suspects
+    """
+    profiles = [
+        profile
+        for profile in reversed(list(recent_profiles))
+        if not n_plus_one_only or profile.n_plus_one()
+    ]
+    return [profile.to_dict() for profile in profiles[:limit]]
\ No newline at end of file
@@ -1,16 +1,22 @@
 """Main FastAPI application"""
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse, Response
 from contextlib import asynccontextmanager
 import logging
 import os
 
 from app.core.config import settings
-from app.db.database import init_db
+from app.core.file_serving import UploadStaticFiles
+from app.db.database import init_db, dispose_engines
 from app.api.v1.api import api_router
-from app.core.logging import setup_logging
+from app.core.logging import RequestIdMiddleware, flush_logging, setup_logging
+from app.core.metrics import CONTENT_TYPE_LATEST, MetricsMiddleware, mark_process_dead, render_metrics
+from app.core.sql_profiler import SQLProfilerMiddleware
+from app.services.reports import shutdown_report_queue
+from app.services.uploads import UploadRejectedError, UploadTooLargeError
+from app.utils.pagination import InvalidCursorError
 
 # Setup logging
 setup_logging()
@@ -33,6 +39,10 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down application")
+    await dispose_engines()
+    shutdown_report_queue()
+    mark_process_dead()
+    flush_logging()
 
 
 # Create FastAPI app
@@ -55,9 +65,38 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount static files
-if os.path.exists(settings.UPLOAD_PATH):
-    app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_PATH), name="uploads")
+# Per-request SQL profile (development / staging)
+if settings.SQL_PROFILER_ENABLED:
+    app.add_middleware(SQLProfilerMiddleware)
+
+# Tag logs with the request id
+app.add_middleware(RequestIdMiddleware)
+
+# Request latency and SQL usage per route
+app.add_middleware(MetricsMiddleware)
+
+
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    """Stale or tampered pagination cursors are client errors"""
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+@app.exception_handler(UploadRejectedError)
+async def upload_rejected_handler(request: Request, exc: UploadRejectedError):
+    """Malformed uploads and disallowed file types"""
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+@app.exception_handler(UploadTooLargeError)
+async def upload_too_large_handler(request: Request, exc: UploadTooLargeError):
+    """Uploads over MAX_UPLOAD_SIZE, cut off while streaming"""
+    return JSONResponse(status_code=413, content={"detail": str(exc)})
+
+
+# Uploaded files, with ETags, ranges and immutable caching of content-addressed paths
+# (the directory is created on startup)
+app.mount("/uploads", UploadStaticFiles(directory=settings.UPLOAD_PATH, check_dir=False), name="uploads")
 
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
@@ -82,4 +121,10 @@ async def health_check():
         "app": settings.APP_NAME,
         "version": settings.APP_VERSION,
         "environment": settings.ENVIRONMENT
-    }
\ No newline at end of file
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus metrics"""
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
\ No newline at end of file
@@ -2,9 +2,12 @@
 
 from app.models.base import BaseModel
 from app.models.employee import Employee, Gender, EmployeeType, EmployeeStatus
-from app.models.department import Department, Position
+from app.models.department import Department, DepartmentClosure, Position
 from app.models.salary import SalaryGrade, SalaryLevel, SalaryHistory, SalaryGradeType
 from app.models.contract import Contract, ContractType, ContractStatus
+from app.models.job import JobRun, JobRunStatus
+from app.models.payroll import PayrollSnapshot
+from app.models.workforce import WorkforceAggregate, WorkforceMember
 
 __all__ = [
     "BaseModel",
@@ -13,6 +16,7 @@ __all__ = [
     "EmployeeType", 
     "EmployeeStatus",
     "Department",
+    "DepartmentClosure",
     "Position",
     "SalaryGrade",
     "SalaryLevel",
@@ -21,4 +25,9 @@ __all__ = [
     "Contract",
     "ContractType",
     "ContractStatus",
+    "JobRun",
+    "JobRunStatus",
+    "PayrollSnapshot",
+    "WorkforceAggregate",
+    "WorkforceMember",
 ]
\ No newline at end of file
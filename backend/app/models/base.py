@@ -1,10 +1,10 @@
 """Base model with common fields"""
 
-from sqlalchemy import Column, DateTime, String, Boolean
+from sqlalchemy import Column, DateTime, String, Boolean, Uuid
 from sqlalchemy.sql import func
-from sqlalchemy.dialects.postgresql import UUID
 import uuid
 
+from app.core.serialization import serializer_for
 from app.db.database import Base
 
 
@@ -13,16 +13,13 @@ class BaseModel(Base):
     
     __abstract__ = True
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_default=func.now(), nullable=False)
-    created_by = Column(UUID(as_uuid=True), nullable=True)
-    updated_by = Column(UUID(as_uuid=True), nullable=True)
+    created_by = Column(Uuid, nullable=True)
+    updated_by = Column(Uuid, nullable=True)
     is_active = Column(Boolean, default=True, nullable=False)
     
     def to_dict(self):
-        """Convert model to dictionary"""
-        return {
-            column.name: getattr(self, column.name)
-            for column in self.__table__.columns
-        }
\ No newline at end of file
+        """Convert model to a JSON-ready dictionary"""
+        return serializer_for(type(self)).from_object(self)
\ No newline at end of file
@@ -1,8 +1,7 @@
 """Contract model for labor contracts"""
 
-from sqlalchemy import Column, String, Date, ForeignKey, Text, Enum, Float, Integer, Boolean
+from sqlalchemy import Column, String, Date, ForeignKey, Text, Enum, Float, Integer, Boolean, Index, event, false, inspect, Uuid
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
 import enum
 
 from app.models.base import BaseModel
@@ -36,7 +35,7 @@ class Contract(BaseModel):
     
     # Basic information
     contract_number = Column(String(100), unique=True, nullable=False, index=True)
-    employee_id = Column(UUID(as_uuid=True), ForeignKey("employees.id"), nullable=False)
+    employee_id = Column(Uuid, ForeignKey("employees.id"), nullable=False)
     
     # Contract type and status
     contract_type = Column(Enum(ContractType), nullable=False)
@@ -49,7 +48,7 @@ class Contract(BaseModel):
     
     # Contract order
     contract_order = Column(Integer, default=1)  # Hợp đồng lần thứ mấy
-    previous_contract_id = Column(UUID(as_uuid=True), ForeignKey("contracts.id"), nullable=True)
+    previous_contract_id = Column(Uuid, ForeignKey("contracts.id"), nullable=True)
     
     # Salary information
     basic_salary = Column(Float, nullable=False)
@@ -78,12 +77,12 @@ class Contract(BaseModel):
     termination_decision_number = Column(String(100))
     
     # Extension information
-    extended_to_contract_id = Column(UUID(as_uuid=True), ForeignKey("contracts.id"), nullable=True)
+    extended_to_contract_id = Column(Uuid, ForeignKey("contracts.id"), nullable=True)
     extension_reason = Column(Text)
     
     # Warning flags
-    probation_warning_sent = Column(Boolean, default=False)
-    expiry_warning_sent = Column(Boolean, default=False)
+    probation_warning_sent = Column(Boolean, default=False, server_default=false(), nullable=False)
+    expiry_warning_sent = Column(Boolean, default=False, server_default=false(), nullable=False)
     
     # Notes
     notes = Column(Text)
@@ -93,5 +92,39 @@ class Contract(BaseModel):
     previous_contract = relationship("Contract", remote_side="Contract.id", foreign_keys=[previous_contract_id])
     extended_contract = relationship("Contract", remote_side="Contract.id", foreign_keys=[extended_to_contract_id])
     
+    __table_args__ = (
+        # Warning scans only touch contracts still waiting for a warning
+        Index(
+            "ix_contracts_status_end_date_unwarned",
+            "status",
+            "end_date",
+            postgresql_where=expiry_warning_sent.is_(False),
+            sqlite_where=expiry_warning_sent.is_(False),
+        ),
+        Index(
+            "ix_contracts_status_probation_end_date_unwarned",
+            "status",
+            "probation_end_date",
+            postgresql_where=probation_warning_sent.is_(False),
+            sqlite_where=probation_warning_sent.is_(False),
+        ),
+        # Keyset pagination key of the contract list
+        Index("ix_contracts_created_at_id", "created_at", "id"),
+        # Delta sync feed, walked in (updated_at, id) order
+        Index("ix_contracts_updated_at_id", "updated_at", "id"),
+        # As-of lookups: the employee's latest contract started by a date
+        Index("ix_contracts_employee_id_start_date", "employee_id", "start_date"),
+    )
+    
     def __repr__(self):
-        return f"<Contract {self.contract_number}: {self.employee_id}>">
\ No newline at end of file
+        return f"<Contract {self.contract_number}: {self.employee_id}>"
+
+
+@event.listens_for(Contract, "before_update")
+def reset_warning_flags(mapper, connection, target):
+    """Re-arm warnings when the end or probation end date is moved"""
+    state = inspect(target)
+    if state.attrs.end_date.history.has_changes():
+        target.expiry_warning_sent = False
+    if state.attrs.probation_end_date.history.has_changes():
+        target.probation_warning_sent = False
\ No newline at end of file
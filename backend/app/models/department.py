@@ -1,9 +1,9 @@
 """Department and Position models"""
 
-from sqlalchemy import Column, String, Text, ForeignKey, Integer, Float, Boolean
-from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Text, ForeignKey, Integer, Float, Boolean, Index, delete, event, insert, inspect, literal, select, true, Uuid
+from sqlalchemy.orm import aliased, backref, relationship
 
+from app.db.database import Base
 from app.models.base import BaseModel
 
 
@@ -15,18 +15,108 @@ class Department(BaseModel):
     code = Column(String(50), unique=True, nullable=False)
     name = Column(String(255), nullable=False)
     description = Column(Text)
-    parent_id = Column(UUID(as_uuid=True), ForeignKey("departments.id"), nullable=True)
-    manager_id = Column(UUID(as_uuid=True), ForeignKey("employees.id"), nullable=True)
+    parent_id = Column(Uuid, ForeignKey("departments.id"), nullable=True)
+    manager_id = Column(Uuid, ForeignKey("employees.id"), nullable=True)
     order = Column(Integer, default=0)
     
     # Relationships
-    employees = relationship("Employee", back_populates="department")
-    children = relationship("Department", backref="parent", remote_side="Department.id")
+    employees = relationship("Employee", back_populates="department", foreign_keys="Employee.department_id")
+    children = relationship("Department", backref=backref("parent", remote_side="Department.id"))
     
     def __repr__(self):
         return f"<Department {self.code}: {self.name}>"
 
 
+class DepartmentClosure(Base):
+    """Department closure table - every (ancestor, descendant) pair of the tree
+    
+    Each department has a depth-0 row to itself. Maintained by the Department
+    mapper events below in the same transaction as the department change.
+    """
+    
+    __tablename__ = "department_closure"
+    
+    ancestor_id = Column(Uuid, ForeignKey("departments.id", ondelete="CASCADE"), primary_key=True)
+    descendant_id = Column(Uuid, ForeignKey("departments.id", ondelete="CASCADE"), primary_key=True)
+    depth = Column(Integer, nullable=False)  # 0 = itself, 1 = direct child, ...
+    
+    __table_args__ = (
+        # Ancestors/breadcrumbs lookups; subtree lookups use the primary key
+        Index("ix_department_closure_descendant_depth", "descendant_id", "depth"),
+    )
+    
+    def __repr__(self):
+        return f"<DepartmentClosure {self.ancestor_id} -> {self.descendant_id} ({self.depth})>"
+
+
+class DepartmentCycleError(ValueError):
+    """Raised when a department would be moved under its own subtree"""
+
+
+@event.listens_for(Department, "after_insert")
+def add_department_paths(mapper, connection, target):
+    """Add the self row plus one row per ancestor of the new parent"""
+    closure = DepartmentClosure.__table__
+    paths = select(literal(target.id, closure.c.ancestor_id.type), literal(target.id, closure.c.descendant_id.type), literal(0))
+    if target.parent_id is not None:
+        paths = paths.union_all(
+            select(closure.c.ancestor_id, literal(target.id, closure.c.descendant_id.type), closure.c.depth + 1)
+            .where(closure.c.descendant_id == target.parent_id)
+        )
+    connection.execute(insert(closure).from_select(["ancestor_id", "descendant_id", "depth"], paths))
+
+
+@event.listens_for(Department, "after_update")
+def move_department_paths(mapper, connection, target):
+    """Re-link the whole subtree when parent_id changes"""
+    if not inspect(target).attrs.parent_id.history.has_changes():
+        return
+    
+    closure = DepartmentClosure.__table__
+    subtree = select(closure.c.descendant_id).where(closure.c.ancestor_id == target.id)
+    
+    if target.parent_id is not None:
+        cycle = connection.execute(
+            select(closure.c.depth).where(
+                closure.c.ancestor_id == target.id,
+                closure.c.descendant_id == target.parent_id,
+            )
+        ).first()
+        if cycle is not None:
+            raise DepartmentCycleError(f"Department {target.id} cannot be moved under its own subtree")
+    
+    # Drop paths from the old ancestors into the subtree
+    connection.execute(
+        delete(closure).where(
+            closure.c.descendant_id.in_(subtree),
+            closure.c.ancestor_id.notin_(subtree),
+        )
+    )
+    if target.parent_id is None:
+        return
+    
+    # Connect every new ancestor to every subtree node
+    above = aliased(closure)
+    below = aliased(closure)
+    connection.execute(
+        insert(closure).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(above.c.ancestor_id, below.c.descendant_id, above.c.depth + below.c.depth + 1)
+            .select_from(above.join(below, true()))
+            .where(above.c.descendant_id == target.parent_id, below.c.ancestor_id == target.id),
+        )
+    )
+
+
+@event.listens_for(Department, "before_delete")
+def remove_department_paths(mapper, connection, target):
+    """Remove paths through a deleted department (SQLite does not enforce ON DELETE)"""
+    closure = DepartmentClosure.__table__
+    connection.execute(
+        delete(closure).where((closure.c.ancestor_id == target.id) | (closure.c.descendant_id == target.id))
+    )
+
+
 class Position(BaseModel):
     """Position model - Chức vụ/Chức danh"""
     
@@ -52,4 +142,4 @@ class Position(BaseModel):
     employees = relationship("Employee", back_populates="position")
     
     def __repr__(self):
-        return f"<Position {self.code}: {self.name}>">
\ No newline at end of file
+        return f"<Position {self.code}: {self.name}>"
\ No newline at end of file
@@ -1,11 +1,15 @@
 """Employee model"""
 
-from sqlalchemy import Column, String, Date, Enum, ForeignKey, Text, Integer, Float
+from sqlalchemy import Column, DDL, String, Date, Enum, ForeignKey, Text, Integer, Float, Index, event, Uuid
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
+from dateutil.relativedelta import relativedelta
+from datetime import date
+from typing import Optional
 import enum
 
+from app.core.config import settings
 from app.models.base import BaseModel
+from app.utils.text import normalize_search_text
 
 
 class Gender(enum.Enum):
@@ -39,6 +43,10 @@ class EmployeeStatus(enum.Enum):
     ROTATED = "ROTATED"  # Luân chuyển
 
 
+# Statuses of employees who have left the organisation
+INACTIVE_STATUSES = (EmployeeStatus.RETIRED, EmployeeStatus.RESIGNED, EmployeeStatus.TRANSFERRED)
+
+
 class Employee(BaseModel):
     """Employee model"""
     
@@ -46,7 +54,7 @@ class Employee(BaseModel):
     
     # Basic Information
     employee_code = Column(String(50), unique=True, nullable=False, index=True)
-    full_name = Column(String(255), nullable=False, index=True)
+    full_name = Column(String(255), nullable=False)
     date_of_birth = Column(Date, nullable=False)
     gender = Column(Enum(Gender), nullable=False)
     
@@ -74,10 +82,11 @@ class Employee(BaseModel):
     status = Column(Enum(EmployeeStatus), default=EmployeeStatus.ACTIVE, nullable=False)
     start_date = Column(Date, nullable=False)  # Ngày bắt đầu làm việc
     social_insurance_start_date = Column(Date)  # Ngày bắt đầu đóng BHXH
+    retirement_date = Column(Date, index=True)  # Ngày đủ tuổi nghỉ hưu, derived from date_of_birth/gender
     
     # Department and Position
-    department_id = Column(UUID(as_uuid=True), ForeignKey("departments.id"))
-    position_id = Column(UUID(as_uuid=True), ForeignKey("positions.id"))
+    department_id = Column(Uuid, ForeignKey("departments.id"))
+    position_id = Column(Uuid, ForeignKey("positions.id"))
     
     # Education
     education_level = Column(String(100))  # Trình độ chuyên môn
@@ -90,22 +99,81 @@ class Employee(BaseModel):
     # Additional fields
     notes = Column(Text)
     
+    # Accent-free name, code, citizen id and email for search, derived on insert/update
+    search_text = Column(Text)
+    
     # Relationships
-    department = relationship("Department", back_populates="employees")
+    department = relationship("Department", back_populates="employees", foreign_keys=[department_id])
     position = relationship("Position", back_populates="employees")
     contracts = relationship("Contract", back_populates="employee", cascade="all, delete-orphan")
     salary_histories = relationship("SalaryHistory", back_populates="employee", cascade="all, delete-orphan")
-    educations = relationship("Education", back_populates="employee", cascade="all, delete-orphan")
-    certificates = relationship("Certificate", back_populates="employee", cascade="all, delete-orphan")
-    work_histories = relationship("WorkHistory", back_populates="employee", cascade="all, delete-orphan")
-    rewards = relationship("Reward", back_populates="employee", cascade="all, delete-orphan")
-    disciplines = relationship("Discipline", back_populates="employee", cascade="all, delete-orphan")
-    annual_reviews = relationship("AnnualReview", back_populates="employee", cascade="all, delete-orphan")
-    languages = relationship("Language", back_populates="employee", cascade="all, delete-orphan")
-    it_skills = relationship("ITSkill", back_populates="employee", cascade="all, delete-orphan")
-    trainings = relationship("Training", back_populates="employee", cascade="all, delete-orphan")
-    plannings = relationship("Planning", back_populates="employee", cascade="all, delete-orphan")
-    insurances = relationship("Insurance", back_populates="employee", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Keyset pagination keys of the employee lists
+        Index("ix_employees_full_name_id", "full_name", "id"),
+        Index("ix_employees_created_at_id", "created_at", "id"),
+        # Delta sync feed, walked in (updated_at, id) order
+        Index("ix_employees_updated_at_id", "updated_at", "id"),
+        # Trigram search (pg_trgm); other databases use the in-process index
+        Index(
+            "ix_employees_search_text_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
     
     def __repr__(self):
-        return f"<Employee {self.employee_code}: {self.full_name}>">
\ No newline at end of file
+        return f"<Employee {self.employee_code}: {self.full_name}>"
+
+
+def compute_retirement_date(date_of_birth: Optional[date], gender: Optional[Gender]) -> Optional[date]:
+    """
+    Date an employee reaches retirement age - Ngày đủ tuổi nghỉ hưu
+
+    Args:
+        date_of_birth: Date of birth
+        gender: Gender, RETIREMENT_AGE_FEMALE applies to women and
+            RETIREMENT_AGE_MALE to everyone else
+
+    Returns:
+        date | None: Retirement date, None without a date of birth
+    """
+    if date_of_birth is None:
+        return None
+    age = settings.RETIREMENT_AGE_FEMALE if gender == Gender.FEMALE else settings.RETIREMENT_AGE_MALE
+    return date_of_birth + relativedelta(years=age)
+
+
+@event.listens_for(Employee, "before_insert")
+@event.listens_for(Employee, "before_update")
+def set_retirement_date(mapper, connection, target):
+    """Keep retirement_date in step with date_of_birth and gender on ORM flushes"""
+    target.retirement_date = compute_retirement_date(target.date_of_birth, target.gender)
+
+
+# The trigram index needs pg_trgm
+event.listen(
+    Employee.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
+def compute_search_text(
+    full_name: Optional[str],
+    employee_code: Optional[str],
+    citizen_id: Optional[str],
+    email: Optional[str],
+) -> str:
+    """Value of Employee.search_text: accent-free full name, code, citizen id and email"""
+    return normalize_search_text(full_name, employee_code, citizen_id, email)
+
+
+@event.listens_for(Employee, "before_insert")
+@event.listens_for(Employee, "before_update")
+def set_search_text(mapper, connection, target):
+    """Keep search_text in step with the searchable fields on ORM flushes"""
+    target.search_text = compute_search_text(
+        target.full_name, target.employee_code, target.citizen_id, target.email
+    )
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""Batch job bookkeeping model"""
+
+from sqlalchemy import Column, String, DateTime, Integer, Text, Enum, Index
+import enum
+
+from app.models.base import BaseModel
+
+
+class JobRunStatus(enum.Enum):
+    """Job run status enum"""
+    RUNNING = "RUNNING"
+    SUCCESS = "SUCCESS"
+    FAILED = "FAILED"
+
+
+class JobRun(BaseModel):
+    """Job run model - Lịch sử chạy tác vụ nền"""
+
+    __tablename__ = "job_runs"
+
+    job_name = Column(String(100), nullable=False)
+    status = Column(Enum(JobRunStatus), default=JobRunStatus.RUNNING, nullable=False)
+
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    finished_at = Column(DateTime(timezone=True))
+
+    # Rows changed after this point are picked up by the next incremental run
+    watermark = Column(DateTime(timezone=True))
+
+    processed_count = Column(Integer, default=0)
+    error = Column(Text)
+
+    __table_args__ = (
+        Index("ix_job_runs_job_name_started_at", "job_name", "started_at"),
+    )
+
+    def __repr__(self):
+        return f"<JobRun {self.job_name}: {self.status}>"
\ No newline at end of file
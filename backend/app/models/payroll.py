@@ -0,0 +1,83 @@
+"""Payroll snapshot model - Bảng lương tháng"""
+
+from sqlalchemy import Column, DDL, Date, DateTime, Enum, Float, Integer, String, UniqueConstraint, Index, event, Uuid
+import uuid
+
+from app.db.database import Base
+from app.models.employee import EmployeeType
+
+
+class PayrollSnapshot(Base):
+    """Payroll snapshot - one employee's pay for one month, as computed
+
+    Rows are never updated or deleted: a correction run writes the employee
+    again with the next revision, and the pay of a month is the highest
+    revision of each employee. Inputs are copied next to the amounts so a
+    snapshot can be explained without the salary and contract rows it was
+    computed from, which may have changed since. Written by
+    app.services.payroll.
+    """
+
+    __tablename__ = "payroll_snapshots"
+
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    period = Column(Date, nullable=False)  # First day of the month
+    employee_id = Column(Uuid, nullable=False)
+    revision = Column(Integer, nullable=False)  # 1 = first run, +1 per correction
+    computed_at = Column(DateTime(timezone=True), nullable=False)
+
+    # Employee at computation time
+    department_id = Column(Uuid)
+    employee_type = Column(Enum(EmployeeType), nullable=False)
+
+    # Source of the pay: "salary" (SalaryHistory), "contract" (laborers) or
+    # "none" when a correction removed the employee from the month
+    source = Column(String(20), nullable=False)
+    salary_history_id = Column(Uuid)
+    contract_id = Column(Uuid)
+
+    # Inputs
+    base_wage = Column(Float, nullable=False)  # Lương cơ sở
+    salary_coefficient = Column(Float, default=0)  # Hệ số lương
+    seniority_allowance_percent = Column(Float, default=0)  # % thâm niên vượt khung
+
+    # Amounts (VND)
+    base_salary = Column(Float, nullable=False, default=0)  # Lương theo hệ số / lương hợp đồng
+    position_allowance = Column(Float, nullable=False, default=0)  # Phụ cấp chức vụ
+    responsibility_allowance = Column(Float, nullable=False, default=0)  # Phụ cấp trách nhiệm
+    hazard_allowance = Column(Float, nullable=False, default=0)  # Phụ cấp độc hại
+    seniority_allowance = Column(Float, nullable=False, default=0)  # Phụ cấp thâm niên vượt khung
+    other_allowances = Column(Float, nullable=False, default=0)  # Phụ cấp khác / phụ cấp hợp đồng
+    gross_pay = Column(Float, nullable=False, default=0)  # Tổng thu nhập
+
+    __table_args__ = (
+        UniqueConstraint("period", "employee_id", "revision", name="uq_payroll_snapshots_period_employee_revision"),
+        Index("ix_payroll_snapshots_employee_period", "employee_id", "period"),
+    )
+
+    def __repr__(self):
+        return f"<PayrollSnapshot {self.period} Employee:{self.employee_id} Rev:{self.revision} Gross:{self.gross_pay}>"
+
+
+class PayrollSnapshotImmutableError(RuntimeError):
+    """Raised when a payroll snapshot would be updated or deleted"""
+
+
+@event.listens_for(PayrollSnapshot, "before_update")
+@event.listens_for(PayrollSnapshot, "before_delete")
+def reject_snapshot_changes(mapper, connection, target):
+    """Snapshots are append-only, corrections are new revisions"""
+    raise PayrollSnapshotImmutableError(f"Payroll snapshot {target.id} is immutable, write a new revision instead")
+
+
+# Core statements bypass the mapper events, PostgreSQL enforces it in the table
+event.listen(
+    PayrollSnapshot.__table__,
+    "after_create",
+    DDL(
+        "CREATE OR REPLACE FUNCTION payroll_snapshots_immutable() RETURNS trigger AS $$ "
+        "BEGIN RAISE EXCEPTION 'payroll_snapshots rows are immutable'; END $$ LANGUAGE plpgsql; "
+        "CREATE TRIGGER payroll_snapshots_immutable BEFORE UPDATE OR DELETE ON payroll_snapshots "
+        "FOR EACH ROW EXECUTE FUNCTION payroll_snapshots_immutable()"
+    ).execute_if(dialect="postgresql"),
+)
\ No newline at end of file
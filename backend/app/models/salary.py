@@ -1,8 +1,10 @@
 """Salary related models"""
 
-from sqlalchemy import Column, String, Float, Integer, Date, ForeignKey, Text, Enum, Boolean
+from sqlalchemy import Column, String, Float, Integer, Date, ForeignKey, Text, Enum, Boolean, Index, bindparam, event, inspect, select, update, Uuid
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm.attributes import set_committed_value
+from itertools import groupby
+from typing import Dict, Iterable, Optional
 import enum
 
 from app.models.base import BaseModel
@@ -28,8 +30,8 @@ class SalaryGrade(BaseModel):
     grade_type = Column(Enum(SalaryGradeType), nullable=False)
     description = Column(Text)
     
-    # Thời gian nâng lương (tháng)
-    raise_period_months = Column(Integer, nullable=False, default=36)
+    # Thời gian nâng lương (tháng); NULL follows the Settings rule of the grade type
+    raise_period_months = Column(Integer, nullable=True)
     
     # Bậc lương tối thiểu và tối đa
     min_level = Column(Integer, default=1)
@@ -48,7 +50,7 @@ class SalaryLevel(BaseModel):
     
     __tablename__ = "salary_levels"
     
-    salary_grade_id = Column(UUID(as_uuid=True), ForeignKey("salary_grades.id"), nullable=False)
+    salary_grade_id = Column(Uuid, ForeignKey("salary_grades.id"), nullable=False)
     level = Column(Integer, nullable=False)  # Bậc (1, 2, 3, ...)
     coefficient = Column(Float, nullable=False)  # Hệ số lương
     
@@ -64,8 +66,8 @@ class SalaryHistory(BaseModel):
     
     __tablename__ = "salary_histories"
     
-    employee_id = Column(UUID(as_uuid=True), ForeignKey("employees.id"), nullable=False)
-    salary_grade_id = Column(UUID(as_uuid=True), ForeignKey("salary_grades.id"), nullable=False)
+    employee_id = Column(Uuid, ForeignKey("employees.id"), nullable=False)
+    salary_grade_id = Column(Uuid, ForeignKey("salary_grades.id"), nullable=False)
     
     # Salary information
     salary_level = Column(Integer, nullable=False)  # Bậc lương
@@ -73,7 +75,12 @@ class SalaryHistory(BaseModel):
     
     # Dates
     effective_date = Column(Date, nullable=False)  # Ngày có hiệu lực
+    # Validity range [effective_date, effective_to): effective_to is the
+    # effective_date of the employee's next row, NULL for the latest one.
+    # Derived, maintained by the events below.
+    effective_to = Column(Date)
     next_raise_date = Column(Date)  # Ngày nâng lương tiếp theo
+    is_raise_eligible = Column(Boolean, default=False)  # Chưa đạt bậc tối đa
     
     # Decision information
     decision_number = Column(String(100))  # Số quyết định
@@ -92,7 +99,7 @@ class SalaryHistory(BaseModel):
     hazard_allowance = Column(Float, default=0)  # Phụ cấp độc hại
     other_allowances = Column(Float, default=0)  # Phụ cấp khác
     
-    # Status
+    # Status - latest row of the employee (effective_to IS NULL), derived like effective_to
     is_current = Column(Boolean, default=True)  # Là mức lương hiện tại
     
     # Notes
@@ -102,5 +109,100 @@ class SalaryHistory(BaseModel):
     employee = relationship("Employee", back_populates="salary_histories")
     salary_grade = relationship("SalaryGrade", back_populates="salary_histories")
     
+    __table_args__ = (
+        # As-of lookups and the per-employee history
+        Index("ix_salary_histories_employee_effective_date", "employee_id", "effective_date"),
+        # Raise due list: current rows ordered by next raise date
+        Index("ix_salary_histories_current_next_raise", "is_current", "next_raise_date"),
+        # Keyset pagination key of the salary history list
+        Index("ix_salary_histories_effective_date_id", "effective_date", "id"),
+    )
+    
     def __repr__(self):
-        return f"<SalaryHistory Employee:{self.employee_id} Grade:{self.salary_grade_id} Level:{self.salary_level}>">
\ No newline at end of file
+        return f"<SalaryHistory Employee:{self.employee_id} Grade:{self.salary_grade_id} Level:{self.salary_level}>"
+
+
+def relink_salary_histories(connection, employee_ids: Optional[Iterable] = None) -> Dict[object, tuple]:
+    """
+    Recompute effective_to and is_current from the effective dates
+
+    Each active row of an employee is valid until the effective_date of the
+    next one (ties broken by creation), the last row is open-ended and
+    current. Soft-deleted rows are left out of the chain. Only rows whose
+    values change are written; updated_at is left alone as for the other
+    derived columns.
+
+    Args:
+        connection: Connection of the transaction writing the rows
+        employee_ids: Employees to relink, None for everyone (backfill)
+
+    Returns:
+        Dict: Row id -> (effective_to, is_current) for every row relinked
+    """
+    table = SalaryHistory.__table__
+    query = select(
+        table.c.id, table.c.employee_id, table.c.effective_date, table.c.is_active, table.c.effective_to, table.c.is_current
+    ).order_by(table.c.employee_id, table.c.effective_date, table.c.created_at, table.c.id)
+    if employee_ids is not None:
+        query = query.where(table.c.employee_id.in_(list(employee_ids)))
+    rows = connection.execute(query).all()
+
+    values, changed = {}, []
+    for _, group in groupby(rows, key=lambda row: row.employee_id):
+        group = list(group)
+        chain = [row for row in group if row.is_active is not False]
+        for row in group:
+            values[row.id] = (None, False)
+        for row, next_row in zip(chain, chain[1:] + [None]):
+            values[row.id] = (next_row.effective_date, False) if next_row is not None else (None, True)
+        for row in group:
+            if values[row.id] != (row.effective_to, bool(row.is_current)):
+                changed.append({"_id": row.id, "_effective_to": values[row.id][0], "_is_current": values[row.id][1]})
+
+    if changed:
+        connection.execute(
+            update(table)
+            .where(table.c.id == bindparam("_id"))
+            .values(
+                effective_to=bindparam("_effective_to"),
+                is_current=bindparam("_is_current"),
+                updated_at=table.c.updated_at,
+            ),
+            changed,
+        )
+    return values
+
+
+# Changes that move a row within or out of its employee's chain
+_CHAIN_ATTRIBUTES = ("employee_id", "effective_date", "is_active", "effective_to", "is_current")
+
+
+def _relink(connection, target, employee_ids) -> None:
+    values = relink_salary_histories(connection, employee_ids)
+    if target.id in values:
+        # Keep the flushed object in step without expiring it
+        effective_to, is_current = values[target.id]
+        set_committed_value(target, "effective_to", effective_to)
+        set_committed_value(target, "is_current", is_current)
+
+
+@event.listens_for(SalaryHistory, "after_insert")
+@event.listens_for(SalaryHistory, "after_delete")
+def relink_after_insert_or_delete(mapper, connection, target):
+    """Close the previous row's range (or reopen it) in the same transaction"""
+    _relink(connection, target, [target.employee_id])
+
+
+@event.listens_for(SalaryHistory, "after_update")
+def relink_after_update(mapper, connection, target):
+    """Relink the old and new employee when a row moves in the chain; hand edits of the derived columns are undone"""
+    state = inspect(target)
+    employee_ids = set()
+    for name in _CHAIN_ATTRIBUTES:
+        history = state.attrs[name].history
+        if history.has_changes():
+            employee_ids.add(target.employee_id)
+            if name == "employee_id":
+                employee_ids.update(value for value in history.deleted if value is not None)
+    if employee_ids:
+        _relink(connection, target, employee_ids)
\ No newline at end of file
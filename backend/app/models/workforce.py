@@ -0,0 +1,258 @@
+"""Workforce structure aggregates - Cơ cấu đội ngũ
+
+Headcount counters per (scope, dimension, bucket) for the dashboard, kept in
+step with employee and salary writes so reads never group over employees.
+Scope is "all" or a department id; an employee counts in both. Dimensions:
+
+- department, employee_type, gender, salary_grade_type (of the current
+  salary row, "none" without one): employees still working
+- status: every non-deleted employee, including those who have left
+- birth_month (YYYY-MM): employees still working; age bands are derived from
+  it on read, so the counters do not go stale as people age
+
+WorkforceMember remembers the buckets each employee is counted in, so a
+change only moves that employee between buckets. The mapper events below do
+it in the flush transaction; Core writers call refresh_workforce_members(),
+and app.services.dashboard reconciles everything periodically.
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+import enum
+
+from sqlalchemy import Column, DateTime, Integer, String, Uuid, and_, delete, event, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.db.database import Base
+from app.models.employee import Employee, INACTIVE_STATUSES
+from app.models.salary import SalaryGrade, SalaryHistory
+
+ALL = "all"
+NONE = "none"
+
+DEPARTMENT = "department"
+EMPLOYEE_TYPE = "employee_type"
+STATUS = "status"
+GENDER = "gender"
+BIRTH_MONTH = "birth_month"
+SALARY_GRADE_TYPE = "salary_grade_type"
+
+DIMENSIONS = (DEPARTMENT, EMPLOYEE_TYPE, STATUS, GENDER, BIRTH_MONTH, SALARY_GRADE_TYPE)
+
+
+class WorkforceAggregate(Base):
+    """Headcount of one bucket of one dimension within a scope"""
+
+    __tablename__ = "workforce_aggregates"
+
+    scope = Column(String(36), primary_key=True)  # "all" or department id
+    dimension = Column(String(30), primary_key=True)
+    bucket = Column(String(50), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<WorkforceAggregate {self.scope} {self.dimension}={self.bucket}: {self.count}>"
+
+
+class WorkforceMember(Base):
+    """Buckets an employee is currently counted in, None where not counted"""
+
+    __tablename__ = "workforce_members"
+
+    employee_id = Column(Uuid, primary_key=True)
+    scope = Column(String(36))  # Department id, None without a department
+    department = Column(String(50))
+    employee_type = Column(String(50))
+    status = Column(String(50))
+    gender = Column(String(50))
+    birth_month = Column(String(50))
+    salary_grade_type = Column(String(50))
+
+    def __repr__(self):
+        return f"<WorkforceMember {self.employee_id}>"
+
+
+def _value(member) -> Optional[str]:
+    return member.value if isinstance(member, enum.Enum) else member
+
+
+def member_buckets(
+    department_id,
+    employee_type,
+    status,
+    gender,
+    date_of_birth,
+    is_active: bool,
+    grade_type,
+) -> Dict[str, Optional[str]]:
+    """
+    Buckets of one employee, with scope
+
+    Returns:
+        Dict[str, str | None]: "scope" plus one bucket per dimension, None
+            where the employee is not counted
+    """
+    buckets = dict.fromkeys(("scope", *DIMENSIONS))
+    if not is_active:
+        return buckets
+    buckets["scope"] = str(department_id) if department_id is not None else None
+    buckets[STATUS] = _value(status)
+    if status in INACTIVE_STATUSES:
+        return buckets
+    buckets[DEPARTMENT] = str(department_id) if department_id is not None else NONE
+    buckets[EMPLOYEE_TYPE] = _value(employee_type)
+    buckets[GENDER] = _value(gender)
+    buckets[BIRTH_MONTH] = f"{date_of_birth:%Y-%m}" if date_of_birth is not None else NONE
+    buckets[SALARY_GRADE_TYPE] = _value(grade_type) or NONE
+    return buckets
+
+
+def buckets_query(employee_ids: Optional[List] = None):
+    """Inputs of member_buckets for employees (all when None), employee id first"""
+    query = (
+        select(
+            Employee.id,
+            Employee.department_id,
+            Employee.employee_type,
+            Employee.status,
+            Employee.gender,
+            Employee.date_of_birth,
+            Employee.is_active,
+            SalaryGrade.grade_type,
+        )
+        .outerjoin(
+            SalaryHistory,
+            and_(
+                SalaryHistory.employee_id == Employee.id,
+                SalaryHistory.is_current.is_(True),
+                SalaryHistory.is_active.is_(True),
+            ),
+        )
+        .outerjoin(SalaryGrade, SalaryGrade.id == SalaryHistory.salary_grade_id)
+    )
+    if employee_ids is not None:
+        query = query.where(Employee.id.in_(employee_ids))
+    return query
+
+
+def contributions(buckets: Dict[str, Optional[str]]) -> List[Tuple[str, str, str]]:
+    """(scope, dimension, bucket) counters an employee adds one to"""
+    scopes = [ALL] if buckets["scope"] is None else [ALL, buckets["scope"]]
+    return [
+        (scope, dimension, buckets[dimension])
+        for dimension in DIMENSIONS
+        if buckets[dimension] is not None
+        for scope in scopes
+    ]
+
+
+def add_to_aggregates(connection, deltas: Dict[Tuple[str, str, str], int]) -> None:
+    """Add deltas to the counters, creating missing ones (atomic upsert)"""
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    table = WorkforceAggregate.__table__
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    now = datetime.now(timezone.utc)
+    statement = dialect.insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.scope, table.c.dimension, table.c.bucket],
+        set_={"count": table.c.count + statement.excluded.count, "updated_at": statement.excluded.updated_at},
+    )
+    connection.execute(
+        statement,
+        [
+            {"scope": scope, "dimension": dimension, "bucket": bucket, "count": delta, "updated_at": now}
+            for (scope, dimension, bucket), delta in sorted(deltas.items())
+        ],
+    )
+
+
+def refresh_workforce_members(connection, employee_ids: Iterable) -> int:
+    """
+    Move employees to their current buckets
+
+    Args:
+        connection: Connection of the transaction that changed them
+        employee_ids: Employees inserted, changed or deleted
+
+    Returns:
+        int: Employees whose buckets changed
+    """
+    employee_ids = list({employee_id for employee_id in employee_ids if employee_id is not None})
+    if not employee_ids:
+        return 0
+    members = WorkforceMember.__table__
+    current = {}
+    for row in connection.execute(buckets_query(employee_ids)):
+        current[row[0]] = member_buckets(*row[1:])
+    stored = {
+        row.employee_id: {key: getattr(row, key) for key in ("scope", *DIMENSIONS)}
+        for row in connection.execute(select(members).where(members.c.employee_id.in_(employee_ids)))
+    }
+
+    deltas: Dict[Tuple[str, str, str], int] = {}
+    changed = []
+    for employee_id in employee_ids:
+        new = current.get(employee_id)
+        old = stored.get(employee_id)
+        if new == old:
+            continue
+        changed.append(employee_id)
+        for key in contributions(old) if old else ():
+            deltas[key] = deltas.get(key, 0) - 1
+        for key in contributions(new) if new else ():
+            deltas[key] = deltas.get(key, 0) + 1
+
+    if not changed:
+        return 0
+    add_to_aggregates(connection, deltas)
+    connection.execute(delete(members).where(members.c.employee_id.in_(changed)))
+    rows = [{"employee_id": employee_id, **current[employee_id]} for employee_id in changed if employee_id in current]
+    if rows:
+        connection.execute(members.insert(), rows)
+    return len(changed)
+
+
+# Employee attributes the buckets depend on
+_EMPLOYEE_ATTRIBUTES = ("department_id", "employee_type", "status", "gender", "date_of_birth", "is_active")
+# SalaryHistory attributes deciding the current grade
+_SALARY_ATTRIBUTES = ("employee_id", "salary_grade_id", "effective_date", "is_active", "is_current", "effective_to")
+
+
+def _changed(target, attributes) -> bool:
+    state = inspect(target)
+    return any(state.attrs[name].history.has_changes() for name in attributes)
+
+
+@event.listens_for(Employee, "after_insert")
+@event.listens_for(Employee, "after_delete")
+def count_employee(mapper, connection, target):
+    """Add a new employee to its buckets, or remove a deleted one"""
+    refresh_workforce_members(connection, [target.id])
+
+
+@event.listens_for(Employee, "after_update")
+def recount_employee(mapper, connection, target):
+    """Move an employee whose department, type, status, gender or birth date changed"""
+    if _changed(target, _EMPLOYEE_ATTRIBUTES):
+        refresh_workforce_members(connection, [target.id])
+
+
+# Registered after SalaryHistory's own events, so is_current is relinked first
+@event.listens_for(SalaryHistory, "after_insert")
+@event.listens_for(SalaryHistory, "after_delete")
+def recount_salary_grade(mapper, connection, target):
+    """A new or deleted salary row can change the current grade"""
+    refresh_workforce_members(connection, [target.employee_id])
+
+
+@event.listens_for(SalaryHistory, "after_update")
+def recount_salary_grade_on_update(mapper, connection, target):
+    """Re-bucket when the current grade may have moved"""
+    if not _changed(target, _SALARY_ATTRIBUTES):
+        return
+    employee_ids = {target.employee_id}
+    employee_ids.update(inspect(target).attrs.employee_id.history.deleted)
+    refresh_workforce_members(connection, employee_ids)
\ No newline at end of file
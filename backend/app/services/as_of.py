@@ -0,0 +1,148 @@
+"""Point-in-time salary and contract lookups - Tra cứu lương, hợp đồng tại một thời điểm
+
+What every employee's grade, level, coefficient and contract were on a date,
+for audits and insurance reports, in one query:
+
+- salary: the row whose validity range [effective_date, effective_to)
+  contains the date; SalaryHistory keeps the ranges linked, so it is a plain
+  join on the (employee_id, effective_date) index
+- contract: the latest contract started by the date and not yet ended or
+  terminated (drafts excluded), a correlated lookup on the
+  (employee_id, start_date) index
+
+Employees who had started by the date are listed, with null salary or
+contract columns where they had none.
+"""
+
+from datetime import date
+from typing import List, Optional
+import enum
+import uuid
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.contract import Contract, ContractStatus
+from app.models.employee import Employee
+from app.models.salary import SalaryGrade, SalaryHistory
+
+# Prepared but never signed
+UNSIGNED_CONTRACT_STATUSES = (ContractStatus.DRAFT,)
+
+SALARY_COLUMNS = (
+    SalaryHistory.id.label("salary_history_id"),
+    SalaryHistory.salary_grade_id,
+    SalaryGrade.code.label("salary_grade_code"),
+    SalaryGrade.name.label("salary_grade_name"),
+    SalaryHistory.salary_level,
+    SalaryHistory.salary_coefficient,
+    SalaryHistory.seniority_allowance_percent,
+    SalaryHistory.position_allowance,
+    SalaryHistory.responsibility_allowance,
+    SalaryHistory.hazard_allowance,
+    SalaryHistory.other_allowances,
+    SalaryHistory.effective_date.label("salary_effective_date"),
+    SalaryHistory.effective_to.label("salary_effective_to"),
+)
+
+CONTRACT_COLUMNS = (
+    Contract.id.label("contract_id"),
+    Contract.contract_number,
+    Contract.contract_type,
+    Contract.status.label("contract_status"),
+    Contract.start_date.label("contract_start_date"),
+    Contract.end_date.label("contract_end_date"),
+    Contract.termination_date.label("contract_termination_date"),
+    Contract.basic_salary,
+    Contract.allowances.label("contract_allowances"),
+)
+
+
+def contract_as_of(as_of: date):
+    """Scalar subquery: id of the contract in force on as_of for the outer Employee"""
+    return (
+        select(Contract.id)
+        .where(
+            Contract.employee_id == Employee.id,
+            Contract.is_active.is_(True),
+            Contract.status.notin_(UNSIGNED_CONTRACT_STATUSES),
+            Contract.start_date <= as_of,
+            or_(Contract.end_date.is_(None), Contract.end_date >= as_of),
+            or_(Contract.termination_date.is_(None), Contract.termination_date >= as_of),
+        )
+        .order_by(Contract.start_date.desc())
+        .limit(1)
+        .correlate(Employee)
+        .scalar_subquery()
+    )
+
+
+def salary_as_of(as_of: date):
+    """Join condition: SalaryHistory row in force on as_of for Employee"""
+    return and_(
+        SalaryHistory.employee_id == Employee.id,
+        SalaryHistory.is_active.is_(True),
+        SalaryHistory.effective_date <= as_of,
+        or_(SalaryHistory.effective_to.is_(None), SalaryHistory.effective_to > as_of),
+    )
+
+
+def as_of_query(as_of: date, department_id: Optional[uuid.UUID] = None):
+    """
+    Select of every employee with the salary row and contract in force on a date
+
+    Args:
+        as_of: Date of the snapshot
+        department_id: Restrict to one department
+
+    Returns:
+        Select: Employee columns followed by SALARY_COLUMNS and CONTRACT_COLUMNS
+    """
+    query = (
+        select(
+            Employee.id,
+            Employee.employee_code,
+            Employee.full_name,
+            Employee.employee_type,
+            Employee.department_id,
+            *SALARY_COLUMNS,
+            *CONTRACT_COLUMNS,
+        )
+        .outerjoin(SalaryHistory, salary_as_of(as_of))
+        .outerjoin(SalaryGrade, SalaryGrade.id == SalaryHistory.salary_grade_id)
+        .outerjoin(Contract, Contract.id == contract_as_of(as_of))
+        .where(Employee.is_active.is_(True), Employee.start_date <= as_of)
+    )
+    if department_id is not None:
+        query = query.where(Employee.department_id == department_id)
+    return query
+
+
+def serialize_as_of_row(row) -> dict:
+    """JSON-ready dict of an as_of_query row"""
+    item = {}
+    for key, value in row._mapping.items():
+        if isinstance(value, uuid.UUID):
+            value = str(value)
+        elif isinstance(value, date):
+            value = value.isoformat()
+        elif isinstance(value, enum.Enum):
+            value = value.value
+        item["employee_id" if key == "id" else key] = value
+    return item
+
+
+def get_assignments_as_of(db: Session, as_of: date, department_id: Optional[uuid.UUID] = None) -> List[dict]:
+    """
+    Grade, level, coefficient and contract of every employee on a date
+
+    Args:
+        db: Database session
+        as_of: Date of the snapshot
+        department_id: Restrict to one department
+
+    Returns:
+        List[dict]: One entry per employee, ordered by name
+    """
+    query = as_of_query(as_of, department_id).order_by(Employee.full_name, Employee.id)
+    return [serialize_as_of_row(row) for row in db.execute(query)]
\ No newline at end of file
@@ -0,0 +1,134 @@
+"""Contract expiry and probation warning scanner - Cảnh báo hết hạn hợp đồng
+
+Each chunk is claimed with a single UPDATE ... RETURNING that flips the
+warning flag only where it is still false, so a contract is handed to exactly
+one worker. On PostgreSQL the candidate subquery uses FOR UPDATE SKIP LOCKED
+so concurrent workers take disjoint chunks instead of queueing on row locks.
+The flags and the notification commit together: if notifying fails the
+chunk is rolled back and picked up again by the next run.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional
+import logging
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.contract import Contract, ContractStatus
+
+logger = logging.getLogger(__name__)
+
+PROBATION = "probation"
+EXPIRY = "expiry"
+
+DEFAULT_CHUNK_SIZE = 500
+
+# kind -> (date column, flag column, Settings attribute holding the warning window)
+WARNING_KINDS = {
+    PROBATION: ("probation_end_date", "probation_warning_sent", "CONTRACT_PROBATION_WARNING_DAYS"),
+    EXPIRY: ("end_date", "expiry_warning_sent", "CONTRACT_FIXED_TERM_WARNING_DAYS"),
+}
+
+Notifier = Callable[[str, List[dict]], None]
+
+
+@dataclass
+class WarningScanResult:
+    """Number of contracts warned per kind"""
+    counts: Dict[str, int] = field(default_factory=dict)
+
+
+def log_notifier(kind: str, contracts: List[dict]) -> None:
+    """Default notifier: log the warned contracts"""
+    for contract in contracts:
+        logger.info(
+            f"Contract {contract['contract_number']} {kind} warning: "
+            f"ends {contract['due_date']} (employee {contract['employee_id']})"
+        )
+
+
+def _claim_statement(kind: str, horizon: date, chunk_size: int, skip_locked: bool):
+    """UPDATE claiming up to chunk_size unwarned contracts due by horizon"""
+    table = Contract.__table__
+    date_name, flag_name, _ = WARNING_KINDS[kind]
+    due_date = table.c[date_name]
+    flag = table.c[flag_name]
+
+    candidates = (
+        select(table.c.id)
+        .where(
+            table.c.status == ContractStatus.ACTIVE,
+            due_date <= horizon,
+            flag.is_(False),
+        )
+        .order_by(due_date)
+        .limit(chunk_size)
+    )
+    if skip_locked:
+        candidates = candidates.with_for_update(skip_locked=True)
+
+    return (
+        update(table)
+        # Re-check the flag so a row claimed meanwhile by another worker is not returned twice
+        .where(table.c.id.in_(candidates), flag.is_(False))
+        # Bookkeeping only: leave updated_at alone
+        .values({flag_name: True, "updated_at": table.c.updated_at})
+        .returning(
+            table.c.id,
+            table.c.contract_number,
+            table.c.employee_id,
+            table.c.contract_type,
+            due_date.label("due_date"),
+        )
+    )
+
+
+def scan_contract_warnings(
+    db: Session,
+    notify: Optional[Notifier] = None,
+    kinds: tuple = (PROBATION, EXPIRY),
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    today: Optional[date] = None,
+) -> WarningScanResult:
+    """
+    Send probation-end and expiry warnings for contracts due within their window
+
+    Safe to run from several workers at once and to re-run: a contract is
+    only ever returned by the UPDATE that flips its flag.
+
+    Args:
+        db: Database session
+        notify: Called with (kind, contracts) for each claimed chunk before commit
+        kinds: Warning kinds to scan
+        chunk_size: Contracts claimed per UPDATE
+        today: Reference date (default: today)
+
+    Returns:
+        WarningScanResult: Contracts warned per kind
+    """
+    notify = notify or log_notifier
+    today = today or date.today()
+    skip_locked = db.get_bind().dialect.name == "postgresql"
+    result = WarningScanResult()
+
+    for kind in kinds:
+        window_days = getattr(settings, WARNING_KINDS[kind][2])
+        statement = _claim_statement(kind, today + timedelta(days=window_days), chunk_size, skip_locked)
+        result.counts[kind] = 0
+        while True:
+            claimed = [dict(row._mapping) for row in db.execute(statement)]
+            if not claimed:
+                db.rollback()
+                break
+            try:
+                notify(kind, claimed)
+            except Exception:
+                db.rollback()
+                raise
+            db.commit()
+            result.counts[kind] += len(claimed)
+
+    return result
\ No newline at end of file
@@ -0,0 +1,189 @@
+"""Workforce dashboard - Thống kê cơ cấu đội ngũ
+
+Reads the WorkforceAggregate counters (see app.models.workforce): cost grows
+with the number of buckets, not of employees. Age bands are summed from the
+birth month buckets at read time.
+
+reconcile_workforce_aggregates() recomputes every counter from the employee
+table and replaces the stored ones, repairing drift from writes that
+bypassed the events (Core bulk writes, manual SQL). Run it periodically,
+e.g. nightly; the drift it found is logged and returned.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Dict, Optional
+import logging
+import uuid
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.orm import Session
+
+from app.models.job import JobRun, JobRunStatus
+from app.models.workforce import (
+    ALL,
+    BIRTH_MONTH,
+    DEPARTMENT,
+    DIMENSIONS,
+    NONE,
+    WorkforceAggregate,
+    WorkforceMember,
+    buckets_query,
+    contributions,
+    member_buckets,
+)
+from app.services.department_tree import subtree_department_ids
+from app.services.jobs import track_job
+
+logger = logging.getLogger(__name__)
+
+JOB_NAME = "workforce_aggregates_reconcile"
+
+# (label, minimum age, maximum age inclusive), None for open-ended
+AGE_BANDS = (
+    ("under_30", None, 29),
+    ("30_39", 30, 39),
+    ("40_49", 40, 49),
+    ("50_59", 50, 59),
+    ("60_plus", 60, None),
+)
+
+INSERT_CHUNK_SIZE = 5000
+
+
+@dataclass
+class ReconcileResult:
+    """Outcome of a reconciliation"""
+    employees: int
+    buckets: int
+    drifted: int
+
+
+def reconcile_workforce_aggregates(db: Session) -> ReconcileResult:
+    """
+    Rebuild members and counters from the employee table
+
+    On PostgreSQL the counters are locked for the rebuild, so event updates
+    from concurrent transactions wait instead of being lost.
+
+    Args:
+        db: Database session
+
+    Returns:
+        ReconcileResult: Employees counted, buckets written and buckets whose
+            stored count was wrong
+    """
+    with track_job(db, JOB_NAME) as run:
+        connection = db.connection()
+        if connection.dialect.name == "postgresql":
+            connection.execute(text("LOCK TABLE workforce_members, workforce_aggregates IN EXCLUSIVE MODE"))
+
+        members, counts = [], {}
+        for row in connection.execute(buckets_query()):
+            buckets = member_buckets(*row[1:])
+            members.append({"employee_id": row[0], **buckets})
+            for key in contributions(buckets):
+                counts[key] = counts.get(key, 0) + 1
+
+        table = WorkforceAggregate.__table__
+        stored = {
+            (row.scope, row.dimension, row.bucket): row.count
+            for row in connection.execute(select(table.c.scope, table.c.dimension, table.c.bucket, table.c.count))
+        }
+        drifted = [
+            (key, stored.get(key, 0), counts.get(key, 0))
+            for key in set(stored) | set(counts)
+            if stored.get(key, 0) != counts.get(key, 0)
+        ]
+        # An empty store is the initial fill, not drift
+        if stored:
+            for key, was, actual in drifted[:20]:
+                logger.warning(f"Workforce aggregate {key} drifted: stored {was}, actual {actual}")
+
+        now = datetime.now(timezone.utc)
+        connection.execute(delete(WorkforceMember.__table__))
+        connection.execute(delete(table))
+        rows = [
+            {"scope": scope, "dimension": dimension, "bucket": bucket, "count": count, "updated_at": now}
+            for (scope, dimension, bucket), count in counts.items()
+        ]
+        for insert_table, insert_rows in ((WorkforceMember.__table__, members), (table, rows)):
+            for start in range(0, len(insert_rows), INSERT_CHUNK_SIZE):
+                connection.execute(insert_table.insert(), insert_rows[start:start + INSERT_CHUNK_SIZE])
+
+        run.processed_count = len(members)
+        return ReconcileResult(employees=len(members), buckets=len(rows), drifted=len(drifted))
+
+
+def _age_band(birth_month: str, today: date) -> Optional[str]:
+    """Age band of someone born in a YYYY-MM month, by completed years at the start of today's month"""
+    if birth_month == NONE:
+        return None
+    year, month = map(int, birth_month.split("-"))
+    age = today.year - year - (1 if today.month < month else 0)
+    for label, low, high in AGE_BANDS:
+        if (low is None or age >= low) and (high is None or age <= high):
+            return label
+    return None
+
+
+def get_workforce_dashboard(
+    db: Session,
+    department_id: Optional[uuid.UUID] = None,
+    today: Optional[date] = None,
+) -> dict:
+    """
+    Workforce structure for the dashboard - Cơ cấu đội ngũ
+
+    Args:
+        db: Database session
+        department_id: Department and its sub-units; the whole organisation
+            when omitted
+        today: Reference date of the age bands (default: today)
+
+    Returns:
+        dict: Headcount per bucket of each dimension, plus "updated_at" (last
+            counter change) and "reconciled_at" (last full reconciliation)
+    """
+    today = today or date.today()
+    query = select(
+        WorkforceAggregate.dimension,
+        WorkforceAggregate.bucket,
+        func.sum(WorkforceAggregate.count),
+        func.max(WorkforceAggregate.updated_at),
+    ).group_by(WorkforceAggregate.dimension, WorkforceAggregate.bucket)
+    if department_id is None:
+        query = query.where(WorkforceAggregate.scope == ALL)
+    else:
+        # Scopes hold the canonical string form, which SQL casts do not give on every database
+        subtree = db.execute(subtree_department_ids(department_id)).scalars()
+        query = query.where(WorkforceAggregate.scope.in_([str(unit_id) for unit_id in subtree]))
+
+    charts: Dict[str, Dict[str, int]] = {dimension: {} for dimension in DIMENSIONS if dimension != BIRTH_MONTH}
+    charts["age_band"] = {label: 0 for label, _, _ in AGE_BANDS}
+    updated_at = None
+    for dimension, bucket, count, changed_at in db.execute(query):
+        if changed_at is not None and (updated_at is None or changed_at > updated_at):
+            updated_at = changed_at
+        if not count:
+            continue
+        if dimension == BIRTH_MONTH:
+            band = _age_band(bucket, today)
+            if band is not None:
+                charts["age_band"][band] += count
+        else:
+            charts[dimension][bucket] = count
+
+    reconciled_at = db.execute(
+        select(JobRun.finished_at)
+        .where(JobRun.job_name == JOB_NAME, JobRun.status == JobRunStatus.SUCCESS)
+        .order_by(JobRun.started_at.desc())
+        .limit(1)
+    ).scalar()
+    return {
+        "department_id": department_id,
+        "total": sum(charts[DEPARTMENT].values()),
+        **{f"by_{dimension}": buckets for dimension, buckets in charts.items()},
+        "updated_at": updated_at,
+        "reconciled_at": reconciled_at,
+    }
\ No newline at end of file
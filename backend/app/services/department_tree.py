@@ -0,0 +1,198 @@
+"""Department hierarchy queries over the closure table - Cây đơn vị
+
+Every function here is a single statement regardless of tree depth. With
+`active_only`, a descendant is skipped when it or any department between it
+and the queried root has been deactivated, so deactivating a unit removes its
+whole branch from subtree listings and roll-ups without rewriting paths.
+"""
+
+from typing import List, Optional
+import uuid
+
+from sqlalchemy import and_, case, exists, func, insert, select, delete
+from sqlalchemy.orm import Session, aliased
+
+from app.models.department import Department, DepartmentClosure
+from app.models.employee import Employee, INACTIVE_STATUSES
+
+INSERT_CHUNK_SIZE = 5000
+
+
+def _on_active_path(path):
+    """No deactivated department between the root and path.descendant_id"""
+    between = aliased(DepartmentClosure)
+    return ~exists().where(
+        between.descendant_id == path.descendant_id,
+        between.depth <= path.depth,
+        Department.id == between.ancestor_id,
+        Department.is_active.is_(False),
+    )
+
+
+def _subtree(department_id: uuid.UUID, include_self: bool, active_only: bool):
+    """Closure alias and conditions selecting the subtree of department_id"""
+    path = aliased(DepartmentClosure)
+    conditions = [path.ancestor_id == department_id]
+    if not include_self:
+        conditions.append(path.depth > 0)
+    if active_only:
+        conditions.append(_on_active_path(path))
+    return path, and_(*conditions)
+
+
+def get_subtree(
+    db: Session,
+    department_id: uuid.UUID,
+    include_self: bool = True,
+    active_only: bool = True,
+) -> List[dict]:
+    """
+    All departments under a department, ordered by depth
+
+    Args:
+        db: Database session
+        department_id: Root department
+        include_self: Include the root itself
+        active_only: Skip deactivated branches
+
+    Returns:
+        List[dict]: Departments with their depth below the root
+    """
+    path, condition = _subtree(department_id, include_self, active_only)
+    query = (
+        select(Department.id, Department.code, Department.name, Department.parent_id, path.depth)
+        .join(path, path.descendant_id == Department.id)
+        .where(condition)
+        .order_by(path.depth, Department.order, Department.name)
+    )
+    return [dict(row._mapping) for row in db.execute(query)]
+
+
+def subtree_employees_query(
+    department_id: uuid.UUID,
+    include_self: bool = True,
+    active_only: bool = True,
+):
+    """
+    Query for employees of a department including its sub-units
+
+    Returned as a query so callers can add filters, ordering and paging.
+
+    Args:
+        department_id: Root department
+        include_self: Include employees attached directly to the root
+        active_only: Skip deactivated branches and employees who have left
+
+    Returns:
+        Select: Employee query
+    """
+    path, condition = _subtree(department_id, include_self, active_only)
+    query = select(Employee).join(path, path.descendant_id == Employee.department_id).where(condition)
+    if active_only:
+        query = query.where(Employee.is_active.is_(True), Employee.status.notin_(INACTIVE_STATUSES))
+    return query
+
+
+def subtree_department_ids(
+    department_id: uuid.UUID,
+    include_self: bool = True,
+    active_only: bool = True,
+):
+    """
+    Query for the ids of a department and its sub-units, usable with in_()
+
+    Args:
+        department_id: Root department
+        include_self: Include the root itself
+        active_only: Skip deactivated branches
+
+    Returns:
+        Select: Department id query
+    """
+    path, condition = _subtree(department_id, include_self, active_only)
+    return select(path.descendant_id).where(condition)
+
+
+def get_ancestors(db: Session, department_id: uuid.UUID, include_self: bool = True) -> List[dict]:
+    """
+    Breadcrumb from the top-level unit down to a department
+
+    Args:
+        db: Database session
+        department_id: Department
+        include_self: End the breadcrumb with the department itself
+
+    Returns:
+        List[dict]: Ancestors ordered root first
+    """
+    query = (
+        select(Department.id, Department.code, Department.name, DepartmentClosure.depth)
+        .join(DepartmentClosure, DepartmentClosure.ancestor_id == Department.id)
+        .where(DepartmentClosure.descendant_id == department_id)
+        .order_by(DepartmentClosure.depth.desc())
+    )
+    if not include_self:
+        query = query.where(DepartmentClosure.depth > 0)
+    return [dict(row._mapping) for row in db.execute(query)]
+
+
+def get_headcount_rollup(db: Session, root_id: Optional[uuid.UUID] = None) -> List[dict]:
+    """
+    Headcount per department, direct and including all sub-units
+
+    Employees who have left and deactivated branches are not counted.
+
+    Args:
+        db: Database session
+        root_id: Only report departments within this subtree (default: all)
+
+    Returns:
+        List[dict]: department_id, direct and total headcount
+    """
+    path = aliased(DepartmentClosure)
+    query = (
+        select(
+            path.ancestor_id.label("department_id"),
+            func.count(Employee.id).label("total"),
+            func.sum(case((path.depth == 0, 1), else_=0)).label("direct"),
+        )
+        .join(Employee, Employee.department_id == path.descendant_id)
+        .where(
+            Employee.is_active.is_(True),
+            Employee.status.notin_(INACTIVE_STATUSES),
+            _on_active_path(path),
+        )
+        .group_by(path.ancestor_id)
+    )
+    if root_id is not None:
+        scope = select(DepartmentClosure.descendant_id).where(DepartmentClosure.ancestor_id == root_id)
+        query = query.where(path.ancestor_id.in_(scope))
+    return [dict(row._mapping) for row in db.execute(query)]
+
+
+def rebuild_department_closure(db: Session) -> int:
+    """
+    Rebuild the closure table from Department.parent_id
+
+    For initial backfill or after bulk changes that bypassed the ORM events.
+
+    Args:
+        db: Database session
+
+    Returns:
+        int: Number of closure rows written
+    """
+    parents = dict(db.execute(select(Department.id, Department.parent_id)).all())
+    rows = []
+    for department_id in parents:
+        ancestor, depth, seen = department_id, 0, set()
+        while ancestor is not None and ancestor not in seen:
+            seen.add(ancestor)
+            rows.append({"ancestor_id": ancestor, "descendant_id": department_id, "depth": depth})
+            ancestor, depth = parents.get(ancestor), depth + 1
+
+    db.execute(delete(DepartmentClosure))
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        db.execute(insert(DepartmentClosure), rows[start:start + INSERT_CHUNK_SIZE])
+    db.commit()
+    return len(rows)
\ No newline at end of file
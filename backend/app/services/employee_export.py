@@ -0,0 +1,244 @@
+"""Streaming roster export - Xuất danh sách nhân sự ra Excel/CSV
+
+Rows are read with a server-side cursor (yield_per) as plain tuples, never as
+ORM objects, so memory does not grow with the size of the agency.
+
+CSV is written and sent in blocks of rows as they are fetched: the first bytes
+leave within one fetch. An .xlsx file is a zip archive that can only be
+finished once all rows are written, so the workbook is built in openpyxl
+write-only mode into a spooled temporary file (constant memory) and streamed
+from there once complete.
+"""
+
+from datetime import date
+from tempfile import SpooledTemporaryFile
+from typing import Callable, Iterator, List, Optional, Sequence
+import csv
+import enum
+import io
+import logging
+import uuid
+
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
+
+from app.models.department import Department, Position
+from app.models.employee import Employee, EmployeeStatus, EmployeeType, INACTIVE_STATUSES
+from app.models.salary import SalaryGrade, SalaryHistory
+from app.services.department_tree import subtree_department_ids
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("csv", "xlsx")
+FETCH_SIZE = 1000
+STREAM_BLOCK_SIZE = 64 * 1024
+
+# key -> (header, column)
+EXPORT_COLUMNS = {
+    "employee_code": ("Mã nhân viên", Employee.employee_code),
+    "full_name": ("Họ và tên", Employee.full_name),
+    "date_of_birth": ("Ngày sinh", Employee.date_of_birth),
+    "gender": ("Giới tính", Employee.gender),
+    "citizen_id": ("Số CCCD", Employee.citizen_id),
+    "phone_number": ("Số điện thoại", Employee.phone_number),
+    "email": ("Email", Employee.email),
+    "hometown": ("Quê quán", Employee.hometown),
+    "ethnicity": ("Dân tộc", Employee.ethnicity),
+    "employee_type": ("Đối tượng", Employee.employee_type),
+    "status": ("Trạng thái", Employee.status),
+    "start_date": ("Ngày bắt đầu làm việc", Employee.start_date),
+    "retirement_date": ("Ngày nghỉ hưu", Employee.retirement_date),
+    "education_level": ("Trình độ chuyên môn", Employee.education_level),
+    "department_code": ("Mã đơn vị", Department.code),
+    "department_name": ("Đơn vị", Department.name),
+    "position_name": ("Chức vụ", Position.name),
+    "salary_grade_code": ("Mã ngạch", SalaryGrade.code),
+    "salary_level": ("Bậc lương", SalaryHistory.salary_level),
+    "salary_coefficient": ("Hệ số lương", SalaryHistory.salary_coefficient),
+    "next_raise_date": ("Ngày nâng lương tiếp theo", SalaryHistory.next_raise_date),
+}
+
+DEFAULT_COLUMNS = (
+    "employee_code", "full_name", "date_of_birth", "gender", "employee_type",
+    "status", "department_name", "position_name", "salary_grade_code",
+    "salary_level", "salary_coefficient",
+)
+
+SALARY_COLUMNS = {"salary_grade_code", "salary_level", "salary_coefficient", "next_raise_date"}
+
+
+def resolve_columns(columns: Optional[Sequence[str]]) -> List[str]:
+    """
+    Validate requested column keys
+
+    Args:
+        columns: Column keys, DEFAULT_COLUMNS when empty
+
+    Returns:
+        List[str]: Column keys in requested order
+
+    Raises:
+        ValueError: If a key is unknown
+    """
+    if not columns:
+        return list(DEFAULT_COLUMNS)
+    unknown = [name for name in columns if name not in EXPORT_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown export columns: {', '.join(unknown)}")
+    return list(dict.fromkeys(columns))
+
+
+def build_export_query(
+    columns: Sequence[str],
+    department_id: Optional[uuid.UUID] = None,
+    include_sub_units: bool = True,
+    employee_types: Optional[Sequence[EmployeeType]] = None,
+    statuses: Optional[Sequence[EmployeeStatus]] = None,
+):
+    """
+    Column query for the roster, joining only what the columns need
+
+    Args:
+        columns: Column keys from EXPORT_COLUMNS
+        department_id: Restrict to a department
+        include_sub_units: Also include the department's sub-units
+        employee_types: Restrict to these employee types
+        statuses: Restrict to these statuses; defaults to everyone who has not left
+
+    Returns:
+        Select: Query ordered by department and name
+    """
+    query = select(*(EXPORT_COLUMNS[name][1].label(name) for name in columns)).select_from(Employee)
+
+    if any(name.startswith("department_") for name in columns):
+        query = query.outerjoin(Department, Department.id == Employee.department_id)
+    if "position_name" in columns:
+        query = query.outerjoin(Position, Position.id == Employee.position_id)
+    if SALARY_COLUMNS.intersection(columns):
+        query = query.outerjoin(
+            SalaryHistory,
+            and_(
+                SalaryHistory.employee_id == Employee.id,
+                SalaryHistory.is_current.is_(True),
+                SalaryHistory.is_active.is_(True),
+            ),
+        )
+        if "salary_grade_code" in columns:
+            query = query.outerjoin(SalaryGrade, SalaryGrade.id == SalaryHistory.salary_grade_id)
+
+    if department_id is not None:
+        if include_sub_units:
+            query = query.where(
+                Employee.department_id.in_(subtree_department_ids(department_id, active_only=False))
+            )
+        else:
+            query = query.where(Employee.department_id == department_id)
+    if employee_types:
+        query = query.where(Employee.employee_type.in_(employee_types))
+    if statuses:
+        query = query.where(Employee.status.in_(statuses))
+    else:
+        query = query.where(Employee.is_active.is_(True), Employee.status.notin_(INACTIVE_STATUSES))
+
+    return query.order_by(Employee.department_id, Employee.full_name, Employee.id)
+
+
+def _cell(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _iter_rows(db: Session, query) -> Iterator[tuple]:
+    result = db.execute(query.execution_options(yield_per=FETCH_SIZE))
+    for partition in result.partitions():
+        for row in partition:
+            yield tuple(_cell(value) for value in row)
+
+
+def iter_csv(db: Session, query, columns: Sequence[str]) -> Iterator[bytes]:
+    """CSV bytes, UTF-8 with BOM so Excel shows Vietnamese text correctly"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([EXPORT_COLUMNS[name][0] for name in columns])
+    yield buffer.getvalue().encode("utf-8-sig")
+    buffer.seek(0)
+    buffer.truncate()
+
+    for count, row in enumerate(_iter_rows(db, query), start=1):
+        writer.writerow([value.isoformat() if isinstance(value, date) else value for value in row])
+        if count % FETCH_SIZE == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def iter_xlsx(db: Session, query, columns: Sequence[str]) -> Iterator[bytes]:
+    """.xlsx bytes built in openpyxl write-only mode"""
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Danh sách nhân sự")
+    header_font = Font(bold=True)
+    header = []
+    for name in columns:
+        cell = WriteOnlyCell(sheet, value=EXPORT_COLUMNS[name][0])
+        cell.font = header_font
+        header.append(cell)
+    sheet.append(header)
+    for row in _iter_rows(db, query):
+        sheet.append(row)
+
+    with SpooledTemporaryFile(max_size=STREAM_BLOCK_SIZE * 16) as output:
+        workbook.save(output)
+        output.seek(0)
+        while True:
+            block = output.read(STREAM_BLOCK_SIZE)
+            if not block:
+                break
+            yield block
+
+
+def stream_employee_export(
+    session_factory: Callable[[], Session],
+    export_format: str,
+    columns: Sequence[str],
+    **filters,
+) -> Iterator[bytes]:
+    """
+    Roster export as a byte stream - Xuất danh sách nhân sự
+
+    The stream owns its session: it is iterated after the request's
+    dependencies have been torn down.
+
+    Args:
+        session_factory: Creates the session used while streaming
+        export_format: "csv" or "xlsx"
+        columns: Column keys from EXPORT_COLUMNS
+        **filters: Passed to build_export_query
+
+    Returns:
+        Iterator[bytes]: File content
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {export_format}")
+    query = build_export_query(columns, **filters)
+    writer = iter_csv if export_format == "csv" else iter_xlsx
+
+    def generate() -> Iterator[bytes]:
+        db = session_factory()
+        try:
+            yield from writer(db, query, columns)
+        except Exception:
+            logger.exception("Roster export failed")
+            raise
+        finally:
+            db.close()
+
+    return generate()
\ No newline at end of file
@@ -0,0 +1,414 @@
+"""Streaming bulk import of employees - Nhập hồ sơ nhân sự từ Excel/CSV
+
+One spreadsheet row per employee, optionally carrying the employee's current
+contract and salary. Rows are streamed (openpyxl read-only mode or the csv
+module), validated and written chunk by chunk, so memory stays flat however
+large the file is. Each chunk is written in its own transaction with COPY on
+PostgreSQL and executemany elsewhere; a failing chunk is rolled back and
+reported without stopping the import.
+
+Core inserts bypass the ORM events, so derived columns (retirement_date,
+search_text) are filled in here and the workforce aggregates are updated
+per chunk; next_raise_date is left to the next incremental run of the
+salary raise engine.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Union
+import csv
+import enum
+import io
+import logging
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.contract import Contract, ContractStatus, ContractType
+from app.models.department import Department, Position
+from app.models.employee import (
+    Employee,
+    EmployeeStatus,
+    EmployeeType,
+    Gender,
+    compute_retirement_date,
+    compute_search_text,
+)
+from app.models.salary import SalaryGrade, SalaryHistory
+from app.models.workforce import refresh_workforce_members
+from app.services.employee_search import invalidate_search_index
+from app.utils.bulk import bulk_insert
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 2000
+MAX_REPORTED_ERRORS = 1000
+
+# Vietnamese headers accepted next to the field names
+HEADER_ALIASES = {
+    "mã nhân viên": "employee_code",
+    "mã cán bộ": "employee_code",
+    "họ và tên": "full_name",
+    "họ tên": "full_name",
+    "ngày sinh": "date_of_birth",
+    "giới tính": "gender",
+    "số cccd": "citizen_id",
+    "cccd": "citizen_id",
+    "số điện thoại": "phone_number",
+    "đối tượng": "employee_type",
+    "trạng thái": "status",
+    "ngày bắt đầu làm việc": "start_date",
+    "mã đơn vị": "department_code",
+    "mã chức vụ": "position_code",
+    "số hợp đồng": "contract_number",
+    "loại hợp đồng": "contract_type",
+    "mã ngạch": "salary_grade_code",
+    "bậc lương": "salary_level",
+    "hệ số lương": "salary_coefficient",
+}
+
+ENUM_ALIASES = {
+    Gender: {"nam": Gender.MALE, "nữ": Gender.FEMALE, "nu": Gender.FEMALE, "khác": Gender.OTHER},
+    EmployeeType: {
+        "cán bộ": EmployeeType.CADRE,
+        "công chức": EmployeeType.CIVIL_SERVANT,
+        "viên chức": EmployeeType.PUBLIC_EMPLOYEE,
+        "người lao động": EmployeeType.LABORER,
+    },
+}
+
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y")
+
+EMPLOYEE_FIELDS = (
+    "employee_code", "full_name", "date_of_birth", "gender", "citizen_id",
+    "citizen_id_issue_date", "citizen_id_issue_place", "phone_number", "email",
+    "permanent_address", "temporary_address", "hometown", "ethnicity", "religion",
+    "employee_type", "status", "start_date", "social_insurance_start_date",
+    "education_level", "notes",
+)
+DATE_FIELDS = {
+    "date_of_birth", "citizen_id_issue_date", "start_date", "social_insurance_start_date",
+    "contract_start_date", "contract_end_date", "probation_end_date", "salary_effective_date",
+}
+REQUIRED_FIELDS = ("employee_code", "full_name", "date_of_birth", "gender", "citizen_id", "employee_type", "start_date")
+# Unique across the file and the database
+UNIQUE_KEYS = ("employee_code", "citizen_id", "email", "contract_number")
+
+
+class RowError(ValueError):
+    """Validation error for one field of one row"""
+
+    def __init__(self, field_name: str, message: str):
+        super().__init__(message)
+        self.field_name = field_name
+
+
+@dataclass
+class ImportIssue:
+    """Error reported for a row or a whole chunk"""
+    row: Optional[int]
+    field: Optional[str]
+    message: str
+
+
+@dataclass
+class ImportReport:
+    """Outcome of an import"""
+    total_rows: int = 0
+    imported: int = 0
+    failed: int = 0
+    chunks: int = 0
+    errors: List[ImportIssue] = field(default_factory=list)
+
+    def add_error(self, row: Optional[int], field_name: Optional[str], message: str) -> None:
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(ImportIssue(row=row, field=field_name, message=message))
+
+
+def _normalize_header(value) -> str:
+    name = str(value or "").strip().lower()
+    return HEADER_ALIASES.get(name, name.replace(" ", "_"))
+
+
+def iter_xlsx_rows(source: Union[str, IO[bytes]], sheet: Optional[str] = None) -> Iterator[dict]:
+    """Stream rows of a workbook as dicts keyed by the header row"""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.active
+        rows = worksheet.iter_rows(values_only=True)
+        headers = [_normalize_header(h) for h in next(rows, ())]
+        for values in rows:
+            if values is None or all(v is None or v == "" for v in values):
+                continue
+            yield dict(zip(headers, values))
+    finally:
+        workbook.close()
+
+
+def iter_csv_rows(source: IO[bytes], encoding: str = "utf-8-sig") -> Iterator[dict]:
+    """Stream rows of a CSV file as dicts keyed by the header row"""
+    reader = csv.reader(io.TextIOWrapper(source, encoding=encoding, newline=""))
+    headers = [_normalize_header(h) for h in next(reader, [])]
+    for values in reader:
+        if not any(values):
+            continue
+        yield dict(zip(headers, values))
+
+
+def _clean(value):
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+def _parse_date(name: str, value) -> Optional[date]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(str(value), fmt).date()
+        except ValueError:
+            continue
+    raise RowError(name, f"Invalid date: {value}")
+
+
+def _parse_enum(name: str, enum_cls, value) -> Optional[enum.Enum]:
+    if value is None:
+        return None
+    text = str(value).strip()
+    alias = ENUM_ALIASES.get(enum_cls, {}).get(text.lower())
+    if alias is not None:
+        return alias
+    try:
+        return enum_cls(text.upper())
+    except ValueError:
+        raise RowError(name, f"Invalid value: {value}")
+
+
+def _parse_number(name: str, value, kind=float):
+    if value is None:
+        return None
+    try:
+        return kind(str(value).replace(",", "")) if isinstance(value, str) else kind(value)
+    except ValueError:
+        raise RowError(name, f"Invalid number: {value}")
+
+
+class _Lookups:
+    """Code -> id maps preloaded once per import"""
+
+    def __init__(self, db: Session):
+        self.departments = dict(db.execute(select(Department.code, Department.id)).all())
+        self.positions = dict(db.execute(select(Position.code, Position.id)).all())
+        self.grades = dict(db.execute(select(SalaryGrade.code, SalaryGrade.id)).all())
+
+    def resolve(self, mapping: Dict[str, uuid.UUID], name: str, code) -> Optional[uuid.UUID]:
+        if code is None:
+            return None
+        resolved = mapping.get(str(code))
+        if resolved is None:
+            raise RowError(name, f"Unknown code: {code}")
+        return resolved
+
+
+def _build_rows(raw: dict, lookups: _Lookups) -> tuple:
+    """Validate one spreadsheet row into employee, contract and salary rows"""
+    values = {k: _clean(v) for k, v in raw.items() if k}
+    for name in REQUIRED_FIELDS:
+        if values.get(name) is None:
+            raise RowError(name, "Required")
+    for name in DATE_FIELDS:
+        values[name] = _parse_date(name, values.get(name))
+
+    employee_id = uuid.uuid4()
+    employee = {name: values.get(name) for name in EMPLOYEE_FIELDS}
+    for name in ("employee_code", "citizen_id", "phone_number"):
+        if employee[name] is not None:
+            employee[name] = str(employee[name])
+    employee.update(
+        id=employee_id,
+        gender=_parse_enum("gender", Gender, values["gender"]),
+        employee_type=_parse_enum("employee_type", EmployeeType, values["employee_type"]),
+        status=_parse_enum("status", EmployeeStatus, values.get("status")) or EmployeeStatus.ACTIVE,
+        department_id=lookups.resolve(lookups.departments, "department_code", values.get("department_code")),
+        position_id=lookups.resolve(lookups.positions, "position_code", values.get("position_code")),
+    )
+    employee["retirement_date"] = compute_retirement_date(employee["date_of_birth"], employee["gender"])
+    employee["search_text"] = compute_search_text(
+        employee["full_name"], employee["employee_code"], employee["citizen_id"], employee["email"]
+    )
+
+    contract = None
+    if values.get("contract_number") is not None:
+        contract = {
+            "id": uuid.uuid4(),
+            "employee_id": employee_id,
+            "contract_number": str(values["contract_number"]),
+            "contract_type": _parse_enum("contract_type", ContractType, values.get("contract_type")),
+            "status": _parse_enum("contract_status", ContractStatus, values.get("contract_status")) or ContractStatus.ACTIVE,
+            "start_date": values.get("contract_start_date") or employee["start_date"],
+            "end_date": values.get("contract_end_date"),
+            "probation_end_date": values.get("probation_end_date"),
+            "basic_salary": _parse_number("basic_salary", values.get("basic_salary")),
+            "allowances": _parse_number("allowances", values.get("allowances")) or 0,
+        }
+        if contract["contract_type"] is None:
+            raise RowError("contract_type", "Required with contract_number")
+        if contract["basic_salary"] is None:
+            raise RowError("basic_salary", "Required with contract_number")
+
+    salary = None
+    if values.get("salary_grade_code") is not None:
+        salary = {
+            "id": uuid.uuid4(),
+            "employee_id": employee_id,
+            "salary_grade_id": lookups.resolve(lookups.grades, "salary_grade_code", values["salary_grade_code"]),
+            "salary_level": _parse_number("salary_level", values.get("salary_level"), int),
+            "salary_coefficient": _parse_number("salary_coefficient", values.get("salary_coefficient")),
+            "effective_date": values.get("salary_effective_date") or employee["start_date"],
+            "is_current": True,
+        }
+        if salary["salary_level"] is None or salary["salary_coefficient"] is None:
+            raise RowError("salary_level", "Level and coefficient are required with salary_grade_code")
+
+    return employee, contract, salary
+
+
+def _unique_keys(employee: dict, contract: Optional[dict]) -> dict:
+    """UNIQUE_KEYS values of a row, None where absent"""
+    return {
+        "employee_code": employee["employee_code"],
+        "citizen_id": employee["citizen_id"],
+        "email": employee["email"],
+        "contract_number": contract["contract_number"] if contract else None,
+    }
+
+
+def _existing(db: Session, column, values: Iterable) -> set:
+    values = [v for v in values if v is not None]
+    if not values:
+        return set()
+    return set(db.execute(select(column).where(column.in_(values))).scalars())
+
+
+def _write_chunk(db: Session, chunk: List[tuple], report: ImportReport) -> None:
+    """Drop rows clashing with existing data, then insert the chunk in one transaction"""
+    taken_codes = _existing(db, Employee.employee_code, (e["employee_code"] for _, e, _, _ in chunk))
+    taken_ids = _existing(db, Employee.citizen_id, (e["citizen_id"] for _, e, _, _ in chunk))
+    taken_emails = _existing(db, Employee.email, (e["email"] for _, e, _, _ in chunk))
+    taken_contracts = _existing(db, Contract.contract_number, (c["contract_number"] for _, _, c, _ in chunk if c))
+
+    employees, contracts, salaries = [], [], []
+    for row_number, employee, contract, salary in chunk:
+        clash = (
+            ("employee_code", employee["employee_code"] in taken_codes),
+            ("citizen_id", employee["citizen_id"] in taken_ids),
+            ("email", employee["email"] is not None and employee["email"] in taken_emails),
+            ("contract_number", contract is not None and contract["contract_number"] in taken_contracts),
+        )
+        duplicate = next((name for name, taken in clash if taken), None)
+        if duplicate:
+            report.failed += 1
+            report.add_error(row_number, duplicate, "Already exists")
+            continue
+        employees.append(employee)
+        if contract:
+            contracts.append(contract)
+        if salary:
+            salaries.append(salary)
+
+    try:
+        bulk_insert(db, Employee.__table__, employees)
+        bulk_insert(db, Contract.__table__, contracts)
+        bulk_insert(db, SalaryHistory.__table__, salaries)
+        refresh_workforce_members(db.connection(), [employee["id"] for employee in employees])
+        db.commit()
+        report.imported += len(employees)
+    except Exception as e:
+        db.rollback()
+        report.failed += len(employees)
+        first, last = chunk[0][0], chunk[-1][0]
+        report.add_error(None, None, f"Rows {first}-{last} not imported: {e}")
+        logger.error(f"Employee import chunk {first}-{last} failed: {e}")
+    report.chunks += 1
+
+
+def import_employees(
+    db: Session,
+    rows: Iterable[dict],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> ImportReport:
+    """
+    Validate and bulk insert employees with their contract and salary
+
+    Args:
+        db: Database session
+        rows: Row dicts, e.g. from iter_xlsx_rows() or iter_csv_rows()
+        chunk_size: Rows per transaction
+
+    Returns:
+        ImportReport: Counts and per-row/per-chunk errors
+    """
+    report = ImportReport()
+    lookups = _Lookups(db)
+    chunk: List[tuple] = []
+    # Unique keys seen earlier in the file; the database is checked per chunk
+    seen = {name: set() for name in UNIQUE_KEYS}
+
+    # Header is row 1
+    for row_number, raw in enumerate(rows, start=2):
+        report.total_rows += 1
+        try:
+            employee, contract, salary = _build_rows(raw, lookups)
+            keys = _unique_keys(employee, contract)
+            for name, value in keys.items():
+                if value is not None and value in seen[name]:
+                    raise RowError(name, "Duplicated in file")
+        except RowError as e:
+            report.failed += 1
+            report.add_error(row_number, e.field_name, str(e))
+            continue
+        for name, value in keys.items():
+            if value is not None:
+                seen[name].add(value)
+        chunk.append((row_number, employee, contract, salary))
+        if len(chunk) >= chunk_size:
+            _write_chunk(db, chunk, report)
+            chunk = []
+
+    if chunk:
+        _write_chunk(db, chunk, report)
+    if report.imported:
+        invalidate_search_index()
+    logger.info(f"Employee import: {report.imported} imported, {report.failed} failed")
+    return report
+
+
+def import_employees_file(db: Session, source: IO[bytes], filename: str, **kwargs) -> ImportReport:
+    """
+    Import from an uploaded .xlsx or .csv file
+
+    Args:
+        db: Database session
+        source: Binary file object
+        filename: Original name, used to pick the reader
+
+    Returns:
+        ImportReport: Counts and errors
+    """
+    extension = filename.rsplit(".", 1)[-1].lower()
+    if extension == "xlsx":
+        rows = iter_xlsx_rows(source)
+    elif extension == "csv":
+        rows = iter_csv_rows(source)
+    else:
+        raise ValueError(f"Unsupported file type: .{extension}")
+    return import_employees(db, rows, **kwargs)
\ No newline at end of file
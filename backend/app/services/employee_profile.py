@@ -0,0 +1,305 @@
+"""Employee profile assembly with named load plans - Hồ sơ nhân sự
+
+Every relationship on Employee is lazy, so touching them one by one while
+rendering a profile issues one query per relationship per employee. A load
+plan names the columns and relationships a view needs and loads them eagerly:
+many-to-one references are joined into the main query, collections are
+fetched with one SELECT ... IN per relationship for the whole page. A view
+therefore costs a fixed number of queries whatever the page size.
+
+Plans end with raiseload, so a serializer reaching for something its plan
+did not load fails loudly instead of quietly falling back to a lazy query.
+
+employee_version() tells whether a client's copy of a view is still current
+with one aggregate query over the rows the plan would load, so conditional
+GETs answer 304 without assembling the profile.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+import uuid
+
+from sqlalchemy import func, inspect, literal, select, union_all
+from sqlalchemy.orm import RelationshipDirection, Session, joinedload, load_only, raiseload, selectinload
+
+from app.core.conditional import make_etag
+
+from app.models.contract import Contract
+from app.models.department import Department, Position
+from app.models.employee import Employee
+from app.models.salary import SalaryGrade, SalaryHistory
+from app.services.uploads import thumbnail_url
+
+# Columns of list rows and profile headers
+SUMMARY_COLUMNS = (
+    Employee.employee_code,
+    Employee.full_name,
+    Employee.date_of_birth,
+    Employee.gender,
+    Employee.employee_type,
+    Employee.status,
+    Employee.start_date,
+    Employee.retirement_date,
+    Employee.department_id,
+    Employee.position_id,
+    Employee.avatar_url,
+    Employee.created_at,
+    Employee.updated_at,
+)
+
+# Columns of the full profile; search_text and the audit ids stay unloaded
+PROFILE_COLUMNS = SUMMARY_COLUMNS + (
+    Employee.citizen_id,
+    Employee.citizen_id_issue_date,
+    Employee.citizen_id_issue_place,
+    Employee.phone_number,
+    Employee.email,
+    Employee.permanent_address,
+    Employee.temporary_address,
+    Employee.hometown,
+    Employee.ethnicity,
+    Employee.religion,
+    Employee.party_member,
+    Employee.social_insurance_start_date,
+    Employee.education_level,
+    Employee.political_theory_level,
+    Employee.state_management_level,
+    Employee.notes,
+)
+
+# Contract rows of the profile
+PROFILE_CONTRACT_COLUMNS = (
+    Contract.contract_number,
+    Contract.contract_type,
+    Contract.status,
+    Contract.start_date,
+    Contract.end_date,
+    Contract.probation_end_date,
+    Contract.contract_order,
+    Contract.basic_salary,
+    Contract.salary_coefficient,
+    Contract.allowances,
+    Contract.position,
+    Contract.department,
+    Contract.signed_date,
+    Contract.contract_file_url,
+    Contract.termination_date,
+)
+
+# Salary history rows of the profile and salary views
+SALARY_HISTORY_COLUMNS = (
+    SalaryHistory.salary_grade_id,
+    SalaryHistory.salary_level,
+    SalaryHistory.salary_coefficient,
+    SalaryHistory.effective_date,
+    SalaryHistory.effective_to,
+    SalaryHistory.next_raise_date,
+    SalaryHistory.is_raise_eligible,
+    SalaryHistory.decision_number,
+    SalaryHistory.decision_date,
+    SalaryHistory.is_early_raise,
+    SalaryHistory.seniority_allowance_percent,
+    SalaryHistory.position_allowance,
+    SalaryHistory.responsibility_allowance,
+    SalaryHistory.hazard_allowance,
+    SalaryHistory.other_allowances,
+    SalaryHistory.is_current,
+)
+
+# Views with a load plan; the plans are built on first use
+VIEWS = ("summary", "profile", "salary")
+
+
+@dataclass(frozen=True)
+class LoadPlan:
+    """Loader options of a view and the relationships it serializes"""
+    name: str
+    options: Tuple
+    relationships: Tuple[str, ...]
+
+
+def _references():
+    return (
+        joinedload(Employee.department).load_only(Department.code, Department.name, raiseload=True),
+        joinedload(Employee.position).load_only(Position.code, Position.name, raiseload=True),
+    )
+
+
+def _salary_histories(*grade_columns):
+    """Salary histories with the code and name (plus grade_columns) of their grade"""
+    return (
+        selectinload(Employee.salary_histories)
+        .load_only(*SALARY_HISTORY_COLUMNS, raiseload=True)
+        .joinedload(SalaryHistory.salary_grade)
+        .load_only(SalaryGrade.code, SalaryGrade.name, *grade_columns, raiseload=True)
+    )
+
+
+def _summary_plan() -> LoadPlan:
+    return LoadPlan(
+        name="summary",
+        options=(load_only(*SUMMARY_COLUMNS, raiseload=True), *_references(), raiseload("*")),
+        relationships=("department", "position"),
+    )
+
+
+def _profile_plan() -> LoadPlan:
+    return LoadPlan(
+        name="profile",
+        options=(
+            load_only(*PROFILE_COLUMNS, raiseload=True),
+            *_references(),
+            selectinload(Employee.contracts).load_only(*PROFILE_CONTRACT_COLUMNS, raiseload=True),
+            _salary_histories(),
+            raiseload("*"),
+        ),
+        relationships=("department", "position", "contracts", "salary_histories", "salary_histories.salary_grade"),
+    )
+
+
+def _salary_plan() -> LoadPlan:
+    return LoadPlan(
+        name="salary",
+        options=(
+            load_only(*SUMMARY_COLUMNS, raiseload=True),
+            *_references(),
+            _salary_histories(SalaryGrade.grade_type),
+            raiseload("*"),
+        ),
+        relationships=("department", "position", "salary_histories", "salary_histories.salary_grade"),
+    )
+
+
+_PLAN_BUILDERS = {"summary": _summary_plan, "profile": _profile_plan, "salary": _salary_plan}
+
+
+@lru_cache(maxsize=None)
+def get_load_plan(name: str) -> LoadPlan:
+    """
+    Look up a load plan by name, building it on first use
+
+    Building the loader options configures the mappers, so it waits for the
+    first request instead of running when the module is imported.
+
+    Raises:
+        ValueError: If there is no such plan
+    """
+    try:
+        builder = _PLAN_BUILDERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown view: {name}. Available: {', '.join(VIEWS)}")
+    return builder()
+
+
+def apply_load_plan(query, plan: LoadPlan):
+    """Add a plan's loader options to an Employee select"""
+    return query.options(*plan.options)
+
+
+def _columns(instance) -> dict:
+    """Loaded column values, skipping deferred ones"""
+    state = inspect(instance)
+    return {
+        attr.key: getattr(instance, attr.key)
+        for attr in state.mapper.column_attrs
+        if attr.key not in state.unloaded
+    }
+
+
+def _serialize(instance, relationships: List[str]) -> Optional[dict]:
+    if instance is None:
+        return None
+    data = _columns(instance)
+    nested = {}
+    for path in relationships:
+        name, _, rest = path.partition(".")
+        nested.setdefault(name, [])
+        if rest:
+            nested[name].append(rest)
+    for name, children in nested.items():
+        value = getattr(instance, name)
+        if isinstance(value, list):
+            data[name] = [_serialize(item, children) for item in value]
+        else:
+            data[name] = _serialize(value, children)
+    return data
+
+
+def serialize_employee(employee: Employee, plan: LoadPlan) -> dict:
+    """Columns and relationships loaded by plan as a dict, with the avatar thumbnail for lists"""
+    data = _serialize(employee, list(plan.relationships))
+    if "avatar_url" in data:
+        data["avatar_thumbnail_url"] = thumbnail_url(data["avatar_url"])
+    return data
+
+
+def get_employee_profile(db: Session, employee_id: uuid.UUID, view: str = "profile") -> Optional[dict]:
+    """
+    One employee assembled with a load plan
+
+    Args:
+        db: Database session
+        employee_id: Employee
+        view: Load plan name ("summary", "profile", "salary")
+
+    Returns:
+        dict | None: Serialized employee, None if not found
+    """
+    plan = get_load_plan(view)
+    query = apply_load_plan(select(Employee).where(Employee.id == employee_id), plan)
+    employee = db.scalars(query).unique().one_or_none()
+    return serialize_employee(employee, plan) if employee is not None else None
+
+
+def serialize_employees(employees: Iterable[Employee], plan: LoadPlan) -> List[dict]:
+    """serialize_employee over a page of employees"""
+    return [serialize_employee(employee, plan) for employee in employees]
+
+
+def _version_query(plan: LoadPlan, employee_id: uuid.UUID):
+    """(part, latest updated_at, row count) of the employee and of each relationship of the plan"""
+    id_queries = {"": select(Employee.id).where(Employee.id == employee_id)}
+    classes = {"": Employee}
+    parts = [select(literal(0), func.max(Employee.updated_at), func.count()).where(Employee.id == employee_id)]
+    # Parents before their nested relationships
+    for path in sorted(plan.relationships, key=lambda path: path.count(".")):
+        parent, _, name = path.rpartition(".")
+        parent_class = classes[parent]
+        relationship = inspect(parent_class).relationships[name]
+        target = relationship.mapper.class_
+        if relationship.direction is RelationshipDirection.MANYTOONE:
+            (local,) = relationship.local_columns
+            condition = target.id.in_(select(local).where(parent_class.id.in_(id_queries[parent])))
+        else:
+            (remote,) = relationship.remote_side
+            condition = remote.in_(id_queries[parent])
+        id_queries[path] = select(target.id).where(condition)
+        classes[path] = target
+        parts.append(select(literal(len(parts)), func.max(target.updated_at), func.count()).where(condition))
+    return union_all(*parts)
+
+
+def employee_version(db: Session, employee_id: uuid.UUID, view: str = "profile") -> Optional[Tuple[str, datetime]]:
+    """
+    Validators of an employee view, without loading it
+
+    A change to any row the view shows moves its latest updated_at; a
+    deleted row changes its table's count. Bulk writers of served derived
+    columns (retirement_date, the raise schedule) set updated_at as well.
+
+    Args:
+        db: Database session
+        employee_id: Employee
+        view: Load plan name
+
+    Returns:
+        Tuple[str, datetime] | None: (ETag, last modified), None if not found
+    """
+    plan = get_load_plan(view)
+    versions = [(updated, count) for _, updated, count in sorted(db.execute(_version_query(plan, employee_id)))]
+    if versions[0][1] == 0:
+        return None
+    last_modified = max(updated for updated, _ in versions if updated is not None)
+    return make_etag(view, employee_id, *(f"{updated}/{count}" for updated, count in versions)), last_modified
\ No newline at end of file
@@ -0,0 +1,395 @@
+"""Accent-insensitive employee search - Tìm kiếm nhân sự
+
+Queries are matched against Employee.search_text, the lowercase accent-free
+form of name, employee code, citizen id and email, so "nguyen van a",
+"Nguyễn Văn A" and "nguyen van" all find "Nguyễn Văn An".
+
+On PostgreSQL the pg_trgm GIN index answers word-similarity (<%) matches,
+ranked by name prefix first and similarity second. Other databases (SQLite,
+test mode) use an in-process WordIndex: every distinct word maps to the
+employees using it, and query words are resolved against the vocabulary by
+exact match, by prefix (last word) and by trigram similarity. Names reuse a
+small vocabulary, so a query only touches a few posting sets, and ranking
+works in tiers (see WordIndex.search) rather than scoring every match. The
+in-process index is built on the first search, follows ORM commits made in
+this process, and is rebuilt after invalidate_search_index() (called by Core
+bulk writes such as the employee import).
+"""
+
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+from threading import Lock
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import heapq
+import logging
+import time
+import uuid
+
+from sqlalchemy import bindparam, event, func, literal, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.serialization import serializer_for
+from app.models.employee import Employee, compute_search_text
+from app.utils.text import normalize_search_text
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMIT = 20
+WORD_SIMILARITY_THRESHOLD = 0.4
+EXACT_WEIGHT = 1.0
+PREFIX_WEIGHT = 0.8
+FUZZY_WEIGHT = 0.6
+BACKFILL_CHUNK_SIZE = 5000
+
+RESULT_SERIALIZER = serializer_for(
+    Employee,
+    ("id", "employee_code", "full_name", "date_of_birth", "department_id", "position_id", "status"),
+)
+
+
+def _trigrams(word: str, prefix: bool = False) -> Set[str]:
+    """pg_trgm-style trigrams; a prefix leaves the end of the word open"""
+    padded = f"  {word}" if prefix else f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class WordIndex:
+    """In-process word index over search_text with fuzzy word lookup"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.built = False
+        self.documents: Dict[uuid.UUID, Tuple[str, Tuple[str, ...]]] = {}
+        self.postings: Dict[str, Set[uuid.UUID]] = defaultdict(set)
+        # Alphabetic words only: codes and citizen ids are matched exactly or by prefix
+        self.word_trigrams: Dict[str, Set[str]] = defaultdict(set)
+        # (search_text, id) in text order, for "starts with the query" ranges
+        self.sorted_texts: List[Tuple[str, uuid.UUID]] = []
+        self._vocabulary: Optional[List[str]] = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self.built = False
+            self._reset()
+
+    def _reset(self) -> None:
+        self.documents.clear()
+        self.postings.clear()
+        self.word_trigrams.clear()
+        self.sorted_texts = []
+        self._vocabulary = None
+
+    def _remove(self, document_id: uuid.UUID) -> None:
+        previous = self.documents.pop(document_id, None)
+        if previous is None:
+            return
+        text, words = previous
+        position = bisect_left(self.sorted_texts, (text, document_id))
+        if position < len(self.sorted_texts) and self.sorted_texts[position][1] == document_id:
+            del self.sorted_texts[position]
+        for word in set(words):
+            posting = self.postings.get(word)
+            if posting is not None:
+                posting.discard(document_id)
+                if not posting:
+                    del self.postings[word]
+                    for trigram in _trigrams(word):
+                        self.word_trigrams.get(trigram, set()).discard(word)
+                    self._vocabulary = None
+
+    def _add(self, document_id: uuid.UUID, text: str, keep_sorted: bool = True) -> None:
+        words = tuple(text.split())
+        self.documents[document_id] = (text, words)
+        if keep_sorted:
+            insort(self.sorted_texts, (text, document_id))
+        else:
+            self.sorted_texts.append((text, document_id))
+        for word in set(words):
+            if word not in self.postings:
+                if word.isalpha():
+                    for trigram in _trigrams(word):
+                        self.word_trigrams[trigram].add(word)
+                self._vocabulary = None
+            self.postings[word].add(document_id)
+
+    def load(self, rows: Iterable[Tuple[uuid.UUID, str]]) -> None:
+        """Replace the index content with (id, search_text) rows"""
+        with self._lock:
+            self._reset()
+            for document_id, text in rows:
+                self._add(document_id, text, keep_sorted=False)
+            self.sorted_texts.sort()
+            self.built = True
+
+    def apply(self, changes: Dict[uuid.UUID, Optional[str]]) -> None:
+        """Upsert (text) or remove (None) documents"""
+        with self._lock:
+            for document_id, text in changes.items():
+                self._remove(document_id)
+                if text:
+                    self._add(document_id, text)
+
+    def _words_with_prefix(self, prefix: str) -> List[str]:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        vocabulary = self._vocabulary
+        words = []
+        for position in range(bisect_left(vocabulary, prefix), len(vocabulary)):
+            if not vocabulary[position].startswith(prefix):
+                break
+            words.append(vocabulary[position])
+        return words
+
+    def _texts_with_prefix(self, prefix: str) -> Iterator[Tuple[str, uuid.UUID]]:
+        for position in range(bisect_left(self.sorted_texts, (prefix,)), len(self.sorted_texts)):
+            entry = self.sorted_texts[position]
+            if not entry[0].startswith(prefix):
+                return
+            yield entry
+
+    def _similar_words(self, token: str) -> Dict[str, float]:
+        grams = _trigrams(token)
+        shared = Counter()
+        for trigram in grams:
+            shared.update(self.word_trigrams.get(trigram, ()))
+        similar = {}
+        for word, count in shared.items():
+            similarity = count / (len(grams) + len(word) + 1 - count)
+            if similarity >= WORD_SIMILARITY_THRESHOLD:
+                similar[word] = similarity * FUZZY_WEIGHT
+        return similar
+
+    def _matches(self, token: str, is_last: bool) -> Dict[str, float]:
+        """Vocabulary words a query word can stand for, with their weight"""
+        matches = self._similar_words(token) if len(token) >= 3 and token.isalpha() else {}
+        if is_last:
+            for word in self._words_with_prefix(token):
+                matches[word] = max(matches.get(word, 0.0), PREFIX_WEIGHT)
+        if token in self.postings:
+            matches[token] = EXACT_WEIGHT
+        return matches
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> List[Tuple[uuid.UUID, float]]:
+        """
+        Best matching documents; every query word must match some word
+
+        A document scores the mean weight of its best match for each query
+        word, plus 1 when its text starts with the query. Results are taken
+        tier by tier so broad queries never score every candidate:
+        text-prefix matches (from the sorted texts), then documents matching
+        every word exactly (set intersections), then the fuzzy remainder.
+        Ties are ordered by text.
+
+        Args:
+            query: Normalized query
+            limit: Maximum number of results
+
+        Returns:
+            List[Tuple[uuid.UUID, float]]: (id, score) by descending score
+        """
+        tokens = query.split()
+        if not tokens:
+            return []
+        with self._lock:
+            token_matches = [self._matches(token, i == len(tokens) - 1) for i, token in enumerate(tokens)]
+            if not all(token_matches):
+                return []
+
+            # Tier 1: text starts with the query, last word complete or a prefix
+            last, position = tokens[-1], len(tokens) - 1
+            complete, partial = [], []
+            for text, document_id in self._texts_with_prefix(query):
+                words = self.documents[document_id][1]
+                if len(words) > position and words[position] == last:
+                    complete.append(document_id)
+                    if len(complete) >= limit:
+                        break
+                elif len(partial) < limit:
+                    partial.append(document_id)
+            partial_score = 1.0 + (position + PREFIX_WEIGHT) / len(tokens)
+            ranked = [(document_id, 2.0) for document_id in complete]
+            ranked += [(document_id, partial_score) for document_id in partial]
+            ranked = ranked[:limit]
+            if len(ranked) == limit:
+                return [(document_id, round(score, 3)) for document_id, score in ranked]
+            taken = {document_id for document_id, _ in ranked}
+
+            candidate_sets = sorted(
+                (set().union(*(self.postings[word] for word in matches)) for matches in token_matches),
+                key=len,
+            )
+            candidates = candidate_sets[0].intersection(*candidate_sets[1:]) - taken
+
+            # Tier 2: every word matches exactly
+            exact_sets = [self.postings.get(token, set()) for token in tokens]
+            perfect = candidates.intersection(*exact_sets)
+            for _, document_id in heapq.nsmallest(
+                limit - len(ranked), ((self.documents[document_id][0], document_id) for document_id in perfect)
+            ):
+                ranked.append((document_id, 1.0))
+
+            # Tier 3: prefix and fuzzy matches
+            if len(ranked) < limit and len(tokens) == 1:
+                # One word: a document scores its best word, so go weight level by level
+                levels = defaultdict(set)
+                for word, weight in token_matches[0].items():
+                    levels[weight] |= self.postings[word]
+                assigned = set(taken) | perfect
+                for weight in sorted(levels, reverse=True):
+                    documents = levels[weight] - assigned
+                    assigned |= documents
+                    for _, document_id in heapq.nsmallest(
+                        limit - len(ranked),
+                        ((self.documents[document_id][0], document_id) for document_id in documents),
+                    ):
+                        ranked.append((document_id, weight))
+                    if len(ranked) >= limit:
+                        break
+            elif len(ranked) < limit:
+                scored = []
+                for document_id in candidates - perfect:
+                    text, words = self.documents[document_id]
+                    score = sum(max(matches.get(word, 0.0) for word in words) for matches in token_matches)
+                    scored.append((-score / len(tokens), text, document_id))
+                for negative_score, _, document_id in heapq.nsmallest(limit - len(ranked), scored):
+                    ranked.append((document_id, -negative_score))
+        return [(document_id, round(score, 3)) for document_id, score in ranked]
+
+
+search_index = WordIndex()
+
+
+def invalidate_search_index() -> None:
+    """Rebuild the in-process index on the next search"""
+    search_index.clear()
+
+
+def _ensure_index(db: Session) -> None:
+    if search_index.built:
+        return
+    started = time.perf_counter()
+    rows = db.execute(
+        select(
+            Employee.id,
+            Employee.search_text,
+            Employee.full_name,
+            Employee.employee_code,
+            Employee.citizen_id,
+            Employee.email,
+        )
+        .where(Employee.is_active.is_(True))
+        .execution_options(yield_per=BACKFILL_CHUNK_SIZE)
+    )
+    search_index.load(
+        (row.id, row.search_text or compute_search_text(row.full_name, row.employee_code, row.citizen_id, row.email))
+        for row in rows
+    )
+    logger.info(
+        f"Employee search index built: {len(search_index.documents)} employees, "
+        f"{len(search_index.postings)} words in {time.perf_counter() - started:.2f}s"
+    )
+
+
+def _rank_postgresql(db: Session, query: str, limit: int) -> List[Tuple[uuid.UUID, float]]:
+    similarity = func.word_similarity(query, Employee.search_text)
+    is_prefix = Employee.search_text.startswith(query)
+    rows = db.execute(
+        select(Employee.id, similarity.label("score"))
+        .where(
+            Employee.is_active.is_(True),
+            or_(literal(query).op("<%")(Employee.search_text), is_prefix),
+        )
+        .order_by(is_prefix.desc(), similarity.desc(), Employee.search_text)
+        .limit(limit)
+    )
+    return [(row.id, round(float(row.score), 3)) for row in rows]
+
+
+def search_employees(db: Session, query: str, limit: int = DEFAULT_LIMIT) -> List[dict]:
+    """
+    Ranked prefix and fuzzy employee search - Tìm kiếm nhân sự
+
+    Args:
+        db: Database session
+        query: Name, code, citizen id or email, with or without diacritics
+        limit: Maximum number of results
+
+    Returns:
+        List[dict]: Employees with a relevance score, best first
+    """
+    normalized = normalize_search_text(query)
+    if not normalized:
+        return []
+    if db.get_bind().dialect.name == "postgresql":
+        ranked = _rank_postgresql(db, normalized, limit)
+    else:
+        _ensure_index(db)
+        ranked = search_index.search(normalized, limit)
+    if not ranked:
+        return []
+
+    rows = db.execute(RESULT_SERIALIZER.select().where(Employee.id.in_([employee_id for employee_id, _ in ranked])))
+    found = {row.id: RESULT_SERIALIZER.from_row(row) for row in rows}
+    return [{**found[employee_id], "score": score} for employee_id, score in ranked if employee_id in found]
+
+
+def backfill_search_text(db: Session) -> int:
+    """
+    Fill search_text for rows written before it existed or by raw SQL
+
+    Args:
+        db: Database session
+
+    Returns:
+        int: Rows updated
+    """
+    table = Employee.__table__
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("_id"))
+        .values(search_text=bindparam("search_text"), updated_at=table.c.updated_at)
+    )
+    rows = db.execute(
+        select(Employee.id, Employee.full_name, Employee.employee_code, Employee.citizen_id, Employee.email)
+        .where(Employee.search_text.is_(None))
+    ).all()
+    for start in range(0, len(rows), BACKFILL_CHUNK_SIZE):
+        db.execute(
+            statement,
+            [
+                {
+                    "_id": row.id,
+                    "search_text": compute_search_text(row.full_name, row.employee_code, row.citizen_id, row.email),
+                }
+                for row in rows[start:start + BACKFILL_CHUNK_SIZE]
+            ],
+        )
+    db.commit()
+    invalidate_search_index()
+    logger.info(f"search_text backfilled for {len(rows)} employees")
+    return len(rows)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_employee_writes(session, flush_context):
+    changes = {}
+    for instance in (*session.new, *session.dirty):
+        if isinstance(instance, Employee):
+            changes[instance.id] = instance.search_text if instance.is_active else None
+    for instance in session.deleted:
+        if isinstance(instance, Employee):
+            changes[instance.id] = None
+    if changes:
+        session.info.setdefault("employee_search_changes", {}).update(changes)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_after_commit(session):
+    changes = session.info.pop("employee_search_changes", None)
+    if changes and search_index.built:
+        search_index.apply(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop("employee_search_changes", None)
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""Batch job run tracking"""
+
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Generator, Optional
+import logging
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.metrics import JOB_DURATION, JOB_LAST_SUCCESS, JOB_PROCESSED_ROWS
+from app.models.job import JobRun, JobRunStatus
+
+logger = logging.getLogger(__name__)
+
+
+def get_last_watermark(db: Session, job_name: str) -> Optional[datetime]:
+    """
+    Get the watermark of the last successful run of a job
+
+    Args:
+        db: Database session
+        job_name: Job identifier
+
+    Returns:
+        datetime | None: Watermark, None if the job never succeeded
+    """
+    return db.execute(
+        select(JobRun.watermark)
+        .where(JobRun.job_name == job_name, JobRun.status == JobRunStatus.SUCCESS)
+        .order_by(JobRun.started_at.desc())
+        .limit(1)
+    ).scalar()
+
+
+@contextmanager
+def track_job(db: Session, job_name: str) -> Generator[JobRun, None, None]:
+    """
+    Record a job run around a block of work
+
+    The watermark is the database clock at start, so rows written while the
+    job runs are picked up again by the next incremental run. The block sets
+    `processed_count` on the yielded run; the run is committed with the work.
+
+    Args:
+        db: Database session
+        job_name: Job identifier
+
+    Yields:
+        JobRun: Run being recorded
+    """
+    started_at = db.execute(select(func.now())).scalar()
+    run = JobRun(job_name=job_name, started_at=started_at, watermark=started_at)
+    started = time.perf_counter()
+    try:
+        yield run
+    except Exception as e:
+        JOB_DURATION.labels(job_name, "failed").observe(time.perf_counter() - started)
+        db.rollback()
+        run.status = JobRunStatus.FAILED
+        run.error = str(e)
+        run.finished_at = db.execute(select(func.now())).scalar()
+        db.add(run)
+        db.commit()
+        logger.error(f"Job {job_name} failed: {e}")
+        raise
+    JOB_DURATION.labels(job_name, "success").observe(time.perf_counter() - started)
+    JOB_PROCESSED_ROWS.labels(job_name).inc(run.processed_count or 0)
+    run.status = JobRunStatus.SUCCESS
+    run.finished_at = db.execute(select(func.now())).scalar()
+    db.add(run)
+    db.commit()
+    JOB_LAST_SUCCESS.labels(job_name).set_to_current_time()
+    logger.info(f"Job {job_name} processed {run.processed_count} rows")
\ No newline at end of file
@@ -0,0 +1,476 @@
+"""Monthly payroll engine - Tính lương tháng
+
+Computes the pay of every employee for a month in one column-wise pass and
+appends it to the immutable payroll_snapshots table:
+
+    cadres, civil servants, public employees (SalaryHistory in force at the
+    end of the month, allowance columns holding coefficients):
+        base_salary = salary_coefficient x PAYROLL_BASE_WAGE
+        allowance   = allowance coefficient x PAYROLL_BASE_WAGE, for the
+                      position, responsibility, hazard and other allowances
+        seniority   = (salary_coefficient + position coefficient)
+                      x seniority_allowance_percent / 100 x PAYROLL_BASE_WAGE
+    laborers (Contract covering the month, latest start date first):
+        base_salary = basic_salary, other_allowances = allowances
+        (laborers without a contract are paid from their SalaryHistory)
+
+    gross_pay = base_salary + every allowance, amounts rounded to the đồng
+
+The first run of a month writes revision 1 for everyone. Later runs are
+corrections: they recompute only the employees whose employee, salary or
+contract rows changed since the last successful run of that month (or the
+ids given), and append a new revision only where the pay differs. Deleted
+salary/contract rows leave no trace to detect, pass their employees
+explicitly; after a change of PAYROLL_BASE_WAGE re-run the month with full.
+recompute_retirement_dates() bumps updated_at of the employees it moves, so
+a change of RETIREMENT_AGE_* reaches the corrections without full.
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+import uuid
+
+import numpy as np
+from sqlalchemy import and_, func, or_, select, union
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.serialization import serializer_for
+from app.models.contract import Contract, ContractStatus
+from app.models.employee import Employee, EmployeeStatus, EmployeeType, INACTIVE_STATUSES
+from app.models.payroll import PayrollSnapshot
+from app.models.salary import SalaryHistory
+from app.services.jobs import get_last_watermark, track_job
+from app.utils.bulk import bulk_insert
+
+SALARY = "salary"
+CONTRACT = "contract"
+NO_PAY = "none"
+
+# Contracts that never ran do not pay
+UNPAID_CONTRACT_STATUSES = (ContractStatus.DRAFT, ContractStatus.SUSPENDED)
+
+# Snapshot columns compared to decide whether a correction changes anything
+AMOUNT_COLUMNS = (
+    "base_salary",
+    "position_allowance",
+    "responsibility_allowance",
+    "hazard_allowance",
+    "seniority_allowance",
+    "other_allowances",
+    "gross_pay",
+)
+
+INSERT_CHUNK_SIZE = 10000
+
+PAYROLL_SERIALIZER = serializer_for(PayrollSnapshot)
+
+
+@dataclass
+class PayrollRunResult:
+    """Outcome of a payroll run"""
+    period: date
+    scanned: int
+    written: int
+    full: bool
+
+
+def month_bounds(period: date) -> Tuple[date, date]:
+    """First and last day of the month containing period"""
+    start = period.replace(day=1)
+    end = (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    return start, end
+
+
+def job_name(period: date) -> str:
+    """JobRun name of a month's payroll, e.g. payroll_2026_10"""
+    return f"payroll_{period:%Y_%m}"
+
+
+def compute_pay(
+    base_wage: float,
+    coefficients: np.ndarray,
+    seniority_percents: np.ndarray,
+    position: np.ndarray,
+    responsibility: np.ndarray,
+    hazard: np.ndarray,
+    other: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized coefficient-based pay
+
+    Args:
+        base_wage: Lương cơ sở
+        coefficients: Salary coefficients
+        seniority_percents: Seniority allowance percents
+        position: Position allowance coefficients
+        responsibility: Responsibility allowance coefficients
+        hazard: Hazard allowance coefficients
+        other: Other allowance coefficients
+
+    Returns:
+        Dict[str, np.ndarray]: Amount arrays keyed by snapshot column
+    """
+    amounts = {
+        "base_salary": np.rint(coefficients * base_wage),
+        "position_allowance": np.rint(position * base_wage),
+        "responsibility_allowance": np.rint(responsibility * base_wage),
+        "hazard_allowance": np.rint(hazard * base_wage),
+        "seniority_allowance": np.rint((coefficients + position) * seniority_percents / 100 * base_wage),
+        "other_allowances": np.rint(other * base_wage),
+    }
+    amounts["gross_pay"] = sum(amounts.values())
+    return amounts
+
+
+def _floats(values: Iterable) -> np.ndarray:
+    """Float array, None becomes 0"""
+    return np.nan_to_num(np.array(list(values), dtype="float64"))
+
+
+def _latest_per_employee(
+    employee_index: Dict[uuid.UUID, int],
+    employee_ids: Iterable[uuid.UUID],
+    dates: Iterable[date],
+) -> np.ndarray:
+    """
+    Row holding the latest date of each employee
+
+    Returns:
+        np.ndarray: Row index per employee position, -1 where the employee
+            has no row
+    """
+    positions = np.fromiter((employee_index.get(e, -1) for e in employee_ids), dtype="int64")
+    chosen = np.full(len(employee_index), -1, dtype="int64")
+    if not len(positions):
+        return chosen
+    days = np.fromiter((d.toordinal() for d in dates), dtype="int64", count=len(positions))
+    order = np.lexsort((days, positions))
+    order = order[positions[order] >= 0]
+    sorted_positions = positions[order]
+    last = np.append(sorted_positions[1:] != sorted_positions[:-1], True) if len(order) else np.array([], dtype=bool)
+    chosen[sorted_positions[last]] = order[last]
+    return chosen
+
+
+def _changed_employees(db: Session, since) -> List[uuid.UUID]:
+    """Employees whose employee, salary or contract rows changed after since"""
+    changed = union(
+        select(Employee.id).where(Employee.updated_at > since),
+        select(SalaryHistory.employee_id).where(SalaryHistory.updated_at > since),
+        select(Contract.employee_id).where(Contract.updated_at > since),
+    )
+    return list(db.execute(changed).scalars())
+
+
+def _compute(
+    db: Session,
+    period: date,
+    employee_ids: Optional[List[uuid.UUID]],
+) -> Tuple[List[tuple], Dict[str, object]]:
+    """
+    Load a month's inputs column-wise and compute the pay of every employee
+
+    Args:
+        db: Database session
+        period: First day of the month
+        employee_ids: Restrict to these employees, None for everyone
+
+    Returns:
+        tuple: (employee rows, columns) - columns maps snapshot column names
+            to arrays/lists aligned with the employee rows; employees without
+            a salary row or contract are left out
+    """
+    start, end = month_bounds(period)
+
+    # Retirement and the termination of the latest contract end the pay from
+    # the month after. Employees whose status says they left are only paid
+    # when such a date, one that has passed, shows they were still employed
+    # in the month: a correction run still pays it, while someone who left
+    # without a recorded date (or retired early, before retirement_date) is
+    # not paid indefinitely.
+    termination_date = (
+        select(Contract.termination_date)
+        .where(Contract.employee_id == Employee.id, Contract.is_active.is_(True))
+        .order_by(Contract.start_date.desc(), Contract.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    today = date.today()
+    employee_query = select(Employee.id, Employee.department_id, Employee.employee_type).where(
+        Employee.is_active.is_(True),
+        Employee.start_date <= end,
+        or_(Employee.retirement_date.is_(None), Employee.retirement_date >= start),
+        or_(termination_date.is_(None), termination_date >= start),
+        or_(
+            Employee.status.notin_(INACTIVE_STATUSES),
+            and_(
+                Employee.status == EmployeeStatus.RETIRED,
+                Employee.retirement_date >= start,
+                Employee.retirement_date <= today,
+            ),
+            and_(termination_date >= start, termination_date <= today),
+        ),
+    )
+    salary_query = select(
+        SalaryHistory.employee_id,
+        SalaryHistory.effective_date,
+        SalaryHistory.id,
+        SalaryHistory.salary_coefficient,
+        SalaryHistory.seniority_allowance_percent,
+        SalaryHistory.position_allowance,
+        SalaryHistory.responsibility_allowance,
+        SalaryHistory.hazard_allowance,
+        SalaryHistory.other_allowances,
+    ).where(
+        SalaryHistory.is_active.is_(True),
+        SalaryHistory.effective_date <= end,
+        or_(SalaryHistory.effective_to.is_(None), SalaryHistory.effective_to > end),
+    )
+    contract_query = select(
+        Contract.employee_id,
+        Contract.start_date,
+        Contract.id,
+        Contract.basic_salary,
+        Contract.salary_coefficient,
+        Contract.allowances,
+    ).where(
+        Contract.is_active.is_(True),
+        Contract.status.notin_(UNPAID_CONTRACT_STATUSES),
+        Contract.start_date <= end,
+        or_(Contract.end_date.is_(None), Contract.end_date >= start),
+        or_(Contract.termination_date.is_(None), Contract.termination_date >= start),
+    )
+    if employee_ids is not None:
+        employee_query = employee_query.where(Employee.id.in_(employee_ids))
+        salary_query = salary_query.where(SalaryHistory.employee_id.in_(employee_ids))
+        contract_query = contract_query.where(Contract.employee_id.in_(employee_ids))
+
+    # Plain Core rows: the ORM result layer costs more than the pay arithmetic
+    connection = db.connection()
+    employees = connection.execute(employee_query).all()
+    if not employees:
+        return [], {}
+    employee_index = {row[0]: i for i, row in enumerate(employees)}
+    salaries = connection.execute(salary_query).all()
+    contracts = connection.execute(contract_query).all()
+
+    salary_emp, salary_dates, salary_ids, coefficients, percents, position, responsibility, hazard, other = (
+        zip(*salaries) if salaries else ([],) * 9
+    )
+    contract_emp, contract_dates, contract_ids, basic, contract_coefficients, contract_allowances = (
+        zip(*contracts) if contracts else ([],) * 6
+    )
+    salary_row = _latest_per_employee(employee_index, salary_emp, salary_dates)
+    contract_row = _latest_per_employee(employee_index, contract_emp, contract_dates)
+
+    is_laborer = np.array([row[2] == EmployeeType.LABORER for row in employees])
+    use_contract = is_laborer & (contract_row >= 0)
+    use_salary = ~use_contract & (salary_row >= 0)
+
+    def pick(values, rows, mask) -> np.ndarray:
+        """Values of the chosen rows, 0 where mask is off"""
+        array = _floats(values)
+        return np.where(mask, array[np.where(mask, rows, 0)] if len(array) else 0.0, 0.0)
+
+    base_wage = settings.PAYROLL_BASE_WAGE
+    coefficient = pick(coefficients, salary_row, use_salary)
+    percent = pick(percents, salary_row, use_salary)
+    amounts = compute_pay(
+        base_wage,
+        coefficient,
+        percent,
+        pick(position, salary_row, use_salary),
+        pick(responsibility, salary_row, use_salary),
+        pick(hazard, salary_row, use_salary),
+        pick(other, salary_row, use_salary),
+    )
+
+    # Laborers on contract
+    contract_pay = np.rint(pick(basic, contract_row, use_contract))
+    contract_extra = np.rint(pick(contract_allowances, contract_row, use_contract))
+    amounts["base_salary"] += contract_pay
+    amounts["other_allowances"] += contract_extra
+    amounts["gross_pay"] += contract_pay + contract_extra
+    coefficient = np.where(use_contract, pick(contract_coefficients, contract_row, use_contract), coefficient)
+
+    paid = np.flatnonzero(use_contract | use_salary)
+    paid_by_contract = use_contract[paid]
+    columns: Dict[str, object] = {key: values[paid] for key, values in amounts.items()}
+    columns["salary_coefficient"] = coefficient[paid]
+    columns["seniority_allowance_percent"] = percent[paid]
+    columns["source"] = [CONTRACT if c else SALARY for c in paid_by_contract.tolist()]
+    columns["salary_history_id"] = [
+        None if c else salary_ids[r] for c, r in zip(paid_by_contract.tolist(), salary_row[paid].tolist())
+    ]
+    columns["contract_id"] = [
+        contract_ids[r] if c else None for c, r in zip(paid_by_contract.tolist(), contract_row[paid].tolist())
+    ]
+    return [employees[i] for i in paid.tolist()], columns
+
+
+def _latest_snapshots(db: Session, period: date, employee_ids: Optional[List[uuid.UUID]]) -> Dict[uuid.UUID, tuple]:
+    """Employee -> (revision, employee_type, source, *AMOUNT_COLUMNS) of the latest revision"""
+    latest = _latest_revisions(period)
+    query = (
+        select(
+            PayrollSnapshot.employee_id,
+            PayrollSnapshot.revision,
+            PayrollSnapshot.employee_type,
+            PayrollSnapshot.source,
+            PayrollSnapshot.base_wage,
+            *(getattr(PayrollSnapshot, key) for key in AMOUNT_COLUMNS),
+        )
+        .join(
+            latest,
+            and_(PayrollSnapshot.employee_id == latest.c.employee_id, PayrollSnapshot.revision == latest.c.revision),
+        )
+        .where(PayrollSnapshot.period == period)
+    )
+    if employee_ids is not None:
+        query = query.where(PayrollSnapshot.employee_id.in_(employee_ids))
+    return {row[0]: tuple(row[1:]) for row in db.connection().execute(query)}
+
+
+def _latest_revisions(period: date):
+    """Subquery: highest revision per employee of a month"""
+    return (
+        select(PayrollSnapshot.employee_id, func.max(PayrollSnapshot.revision).label("revision"))
+        .where(PayrollSnapshot.period == period)
+        .group_by(PayrollSnapshot.employee_id)
+        .subquery()
+    )
+
+
+def run_payroll(
+    db: Session,
+    period: date,
+    employee_ids: Optional[Iterable[uuid.UUID]] = None,
+    full: bool = False,
+) -> PayrollRunResult:
+    """
+    Compute a month's payroll and append the snapshots that changed
+
+    Args:
+        db: Database session
+        period: Any day of the month
+        employee_ids: Recompute only these employees
+        full: Recompute everyone even if the month was computed before
+
+    Returns:
+        PayrollRunResult: Employees computed and snapshots written
+    """
+    period = month_bounds(period)[0]
+    name = job_name(period)
+    with track_job(db, name) as run:
+        since = None if full else get_last_watermark(db, name)
+        if employee_ids is not None:
+            scope = list(set(employee_ids))
+        elif since is None:
+            scope = None
+        else:
+            scope = _changed_employees(db, since)
+            if not scope:
+                return PayrollRunResult(period=period, scanned=0, written=0, full=False)
+
+        employees, columns = _compute(db, period, scope)
+        previous = _latest_snapshots(db, period, scope)
+        base_wage = settings.PAYROLL_BASE_WAGE
+        amounts = [columns[key].tolist() for key in AMOUNT_COLUMNS] if employees else []
+        amount_rows = list(zip(*amounts))
+
+        rows = []
+        computed = set()
+        for i, (employee_id, department_id, employee_type) in enumerate(employees):
+            computed.add(employee_id)
+            values = amount_rows[i]
+            source = columns["source"][i]
+            last = previous.get(employee_id)
+            if last is not None and (last[2], last[3], *last[4:]) == (source, base_wage, *values):
+                continue
+            rows.append({
+                "id": uuid.uuid4(),
+                "period": period,
+                "employee_id": employee_id,
+                "revision": last[0] + 1 if last is not None else 1,
+                "computed_at": run.started_at,
+                "department_id": department_id,
+                "employee_type": employee_type,
+                "source": source,
+                "salary_history_id": columns["salary_history_id"][i],
+                "contract_id": columns["contract_id"][i],
+                "base_wage": base_wage,
+                "salary_coefficient": float(columns["salary_coefficient"][i]),
+                "seniority_allowance_percent": float(columns["seniority_allowance_percent"][i]),
+                **dict(zip(AMOUNT_COLUMNS, values)),
+            })
+
+        # Employees paid before who no longer are (left, contract ended, ...)
+        for employee_id, last in previous.items():
+            if employee_id in computed or last[2] == NO_PAY:
+                continue
+            rows.append({
+                "id": uuid.uuid4(),
+                "period": period,
+                "employee_id": employee_id,
+                "revision": last[0] + 1,
+                "computed_at": run.started_at,
+                "department_id": None,
+                "employee_type": last[1],
+                "source": NO_PAY,
+                "salary_history_id": None,
+                "contract_id": None,
+                "base_wage": base_wage,
+                "salary_coefficient": 0.0,
+                "seniority_allowance_percent": 0.0,
+                **dict.fromkeys(AMOUNT_COLUMNS, 0.0),
+            })
+
+        for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+            bulk_insert(db, PayrollSnapshot.__table__, rows[start:start + INSERT_CHUNK_SIZE])
+
+        run.processed_count = len(rows)
+        return PayrollRunResult(period=period, scanned=len(employees), written=len(rows), full=scope is None)
+
+
+def payroll_query(period: date, department_id: Optional[uuid.UUID] = None):
+    """
+    Select of the latest snapshot of every employee paid in a month
+
+    Args:
+        period: Any day of the month
+        department_id: Restrict to one department (as recorded in the snapshot)
+
+    Returns:
+        Select: PAYROLL_SERIALIZER columns, for from_row
+    """
+    period = month_bounds(period)[0]
+    latest = _latest_revisions(period)
+    query = (
+        PAYROLL_SERIALIZER.select()
+        .join(
+            latest,
+            and_(PayrollSnapshot.employee_id == latest.c.employee_id, PayrollSnapshot.revision == latest.c.revision),
+        )
+        .where(PayrollSnapshot.period == period, PayrollSnapshot.source != NO_PAY)
+    )
+    if department_id is not None:
+        query = query.where(PayrollSnapshot.department_id == department_id)
+    return query
+
+
+def get_payroll(db: Session, period: date, department_id: Optional[uuid.UUID] = None) -> List[dict]:
+    """
+    Payroll of a month - Bảng lương tháng
+
+    Args:
+        db: Database session
+        period: Any day of the month
+        department_id: Restrict to one department
+
+    Returns:
+        List[dict]: Latest snapshots ordered by department and employee
+    """
+    query = payroll_query(period, department_id).order_by(PayrollSnapshot.department_id, PayrollSnapshot.employee_id)
+    return [PAYROLL_SERIALIZER.from_row(row) for row in db.execute(query)]
\ No newline at end of file
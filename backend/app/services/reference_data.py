@@ -0,0 +1,143 @@
+"""Cached reference data: salary grades, levels and positions
+
+These tables change a few times a year but are read by almost every salary,
+contract and profile request. Values are cached as JSON-safe dicts (ids as
+strings). Any committed ORM write to SalaryGrade, SalaryLevel or Position
+bumps the cache version; Core bulk writes to those tables must call
+invalidate_reference_data() themselves.
+"""
+
+from collections import defaultdict
+from typing import List, Optional, Union
+import uuid
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import create_cache
+from app.models.department import Position
+from app.models.salary import SalaryGrade, SalaryLevel
+
+REFERENCE_MODELS = (SalaryGrade, SalaryLevel, Position)
+
+reference_cache = create_cache("reference")
+
+
+def _load_salary_grades(db: Session) -> List[dict]:
+    levels = defaultdict(list)
+    for row in db.execute(
+        select(SalaryLevel.salary_grade_id, SalaryLevel.id, SalaryLevel.level, SalaryLevel.coefficient)
+        .where(SalaryLevel.is_active.is_(True))
+        .order_by(SalaryLevel.salary_grade_id, SalaryLevel.level)
+    ):
+        levels[row.salary_grade_id].append(
+            {"id": str(row.id), "level": row.level, "coefficient": row.coefficient}
+        )
+
+    grades = db.execute(
+        select(
+            SalaryGrade.id,
+            SalaryGrade.code,
+            SalaryGrade.name,
+            SalaryGrade.grade_type,
+            SalaryGrade.raise_period_months,
+            SalaryGrade.min_level,
+            SalaryGrade.max_level,
+        )
+        .where(SalaryGrade.is_active.is_(True))
+        .order_by(SalaryGrade.code)
+    )
+    return [
+        {
+            "id": str(row.id),
+            "code": row.code,
+            "name": row.name,
+            "grade_type": row.grade_type.value,
+            "raise_period_months": row.raise_period_months,
+            "min_level": row.min_level,
+            "max_level": row.max_level,
+            "levels": levels.get(row.id, []),
+        }
+        for row in grades
+    ]
+
+
+def _load_positions(db: Session) -> List[dict]:
+    columns = (
+        Position.code,
+        Position.name,
+        Position.level,
+        Position.order,
+        Position.position_allowance,
+        Position.responsibility_allowance,
+        Position.is_leadership,
+        Position.is_management,
+    )
+    rows = db.execute(
+        select(Position.id, *columns)
+        .where(Position.is_active.is_(True))
+        .order_by(Position.order, Position.name)
+    )
+    return [{"id": str(row.id), **{c.key: getattr(row, c.key) for c in columns}} for row in rows]
+
+
+def get_salary_grades(db: Session) -> List[dict]:
+    """Active salary grades with their levels - Ngạch, bậc lương"""
+    return reference_cache.get_or_load("salary_grades", lambda: _load_salary_grades(db))
+
+
+def get_positions(db: Session) -> List[dict]:
+    """Active positions - Chức vụ"""
+    return reference_cache.get_or_load("positions", lambda: _load_positions(db))
+
+
+def get_coefficient_table(db: Session) -> dict:
+    """grade id -> level -> coefficient, with string keys"""
+    return reference_cache.get_or_load(
+        "coefficients",
+        lambda: {
+            grade["id"]: {str(level["level"]): level["coefficient"] for level in grade["levels"]}
+            for grade in get_salary_grades(db)
+        },
+    )
+
+
+def get_salary_coefficient(
+    db: Session, salary_grade_id: Union[str, uuid.UUID], level: int
+) -> Optional[float]:
+    """
+    Coefficient of a grade level - Hệ số lương theo ngạch, bậc
+
+    Args:
+        db: Database session
+        salary_grade_id: Salary grade id
+        level: Salary level (bậc)
+
+    Returns:
+        float | None: Coefficient, None if the grade or level does not exist
+    """
+    return get_coefficient_table(db).get(str(salary_grade_id), {}).get(str(level))
+
+
+def invalidate_reference_data() -> None:
+    """Drop cached reference data in every worker"""
+    reference_cache.invalidate()
+
+
+@event.listens_for(Session, "after_flush")
+def _track_reference_writes(session, flush_context):
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, REFERENCE_MODELS):
+            session.info["reference_data_changed"] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    if session.info.pop("reference_data_changed", False):
+        invalidate_reference_data()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop("reference_data_changed", None)
\ No newline at end of file
@@ -0,0 +1,482 @@
+"""Report rendering and disk cache - Kết xuất báo cáo
+
+Renders the tabular government-format documents built by app.services.reports
+to PDF (reportlab) or Word (python-docx). A document is a JSON-ready dict:
+
+    {"title", "subtitle", "agency", "landscape",
+     "columns": [{"header", "kind"}], "rows": [[...]], "totals": [...] | None}
+
+where kind is one of COLUMN_KINDS and decides formatting and alignment.
+
+Renders are CPU-bound and run in worker processes (Celery workers, or the
+local pool of app.services.reports). preload() registers the fonts and reads
+the .docx templates once per process; render_report() then only lays out.
+
+Outputs are cached on disk under REPORT_CACHE_PATH, named by report_key():
+a SHA-256 of the renderer and template versions, the format and the document
+itself. An unchanged report therefore maps to a file that already exists.
+Per key the cache holds:
+
+- <key>.json: the document, written by the requester, removed once rendered
+- <key>.pdf / <key>.docx: the output, written atomically
+- <key>.error: the message of a failed render
+"""
+
+from copy import deepcopy
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+
+from app.core.config import settings
+from app.core.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout code changes, so cached outputs are not reused
+RENDERER_VERSION = "1"
+
+REPORT_FORMATS = ("pdf", "docx")
+MEDIA_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+COLUMN_KINDS = ("text", "integer", "money", "coefficient", "date")
+
+# Rows per reportlab Table: one huge table is laid out quadratically slower
+PDF_TABLE_ROWS = 500
+
+KEY_PATTERN = re.compile(r"^([a-z_]+)-(pdf|docx)-([0-9a-f]{64})$")
+
+NATIONAL_TITLE = "CỘNG HÒA XÃ HỘI CHỦ NGHĨA VIỆT NAM"
+NATIONAL_MOTTO = "Độc lập - Tự do - Hạnh phúc"
+PLACE_AND_DATE = "……………, ngày …… tháng …… năm ………"
+SIGNATURES = ("NGƯỜI LẬP BIỂU", "THỦ TRƯỞNG ĐƠN VỊ")
+
+
+class ReportRenderError(RuntimeError):
+    """A render failed; the message is kept in the cache for status checks"""
+
+
+# ---------------------------------------------------------------------------
+# Cache layout
+# ---------------------------------------------------------------------------
+
+def cache_root() -> Path:
+    return Path(settings.REPORT_CACHE_PATH)
+
+
+def parse_key(key: str) -> Tuple[str, str, str]:
+    """
+    Split a report key
+
+    Returns:
+        Tuple[str, str, str]: Report name, format and digest
+
+    Raises:
+        ValueError: Malformed key
+    """
+    match = KEY_PATTERN.match(key)
+    if match is None:
+        raise ValueError(f"Invalid report key: {key}")
+    return match.groups()
+
+
+def cache_path(key: str, suffix: str) -> Path:
+    """File of a report key, sharded by the first digest characters"""
+    digest = parse_key(key)[2]
+    return cache_root() / digest[:2] / f"{key}.{suffix}"
+
+
+def _write_atomic(path: Path, content: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temporary = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(content)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+@lru_cache(maxsize=64)
+def _file_digest(path: str, mtime_ns: int, size: int) -> str:
+    with open(path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def template_path(report: str) -> Path:
+    """Optional .docx template (letterhead, styles) of a report"""
+    return Path(settings.REPORT_TEMPLATE_PATH) / f"{report}.docx"
+
+
+def template_digest(report: str, format: str) -> str:
+    """Digest of the template a render would use, "" for the built-in layout"""
+    if format != "docx":
+        return ""
+    path = template_path(report)
+    try:
+        stat = path.stat()
+    except OSError:
+        return ""
+    return _file_digest(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def report_key(report: str, version: str, format: str, document: dict) -> Tuple[str, bytes]:
+    """
+    Cache key of a document
+
+    Args:
+        report: Report name
+        version: Version of the report definition
+        format: One of REPORT_FORMATS
+        document: Document to render
+
+    Returns:
+        Tuple[str, bytes]: "<report>-<format>-<sha256>" and the encoded document
+    """
+    content = dumps(document)
+    header = f"{RENDERER_VERSION}:{version}:{format}:{template_digest(report, format)}\n".encode()
+    return f"{report}-{format}-{hashlib.sha256(header + content).hexdigest()}", content
+
+
+def store_document(key: str, content: bytes) -> None:
+    """Write the document of a pending render, clearing a previous failure"""
+    cache_path(key, "error").unlink(missing_ok=True)
+    _write_atomic(cache_path(key, "json"), content)
+
+
+def cached_output(key: str, format: str) -> Optional[Path]:
+    """Rendered file of a key, None if not rendered yet"""
+    path = cache_path(key, format)
+    try:
+        # Refresh the age checked by prune_report_cache
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    return path
+
+
+def prune_report_cache(max_age_days: Optional[int] = None) -> int:
+    """
+    Delete cache files not used for a while
+
+    Args:
+        max_age_days: Age limit (default: REPORT_CACHE_MAX_AGE_DAYS)
+
+    Returns:
+        int: Files deleted
+    """
+    max_age_days = settings.REPORT_CACHE_MAX_AGE_DAYS if max_age_days is None else max_age_days
+    cutoff = time.time() - max_age_days * 86400
+    deleted = 0
+    root = cache_root()
+    if not root.exists():
+        return 0
+    for path in root.glob("*/*"):
+        try:
+            if path.is_file() and path.stat().st_mtime < cutoff:
+                path.unlink()
+                deleted += 1
+        except FileNotFoundError:
+            continue
+    logger.info(f"Pruned {deleted} report cache files older than {max_age_days} days")
+    return deleted
+
+
+# ---------------------------------------------------------------------------
+# Per-process resources
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _Resources:
+    font: str
+    bold_font: str
+    styles: Dict[str, Any]
+    templates: Dict[str, Optional[bytes]]
+
+
+_resources: Optional[_Resources] = None
+
+
+def _register_font(name: str, path: str, fallback: str) -> str:
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    try:
+        pdfmetrics.registerFont(TTFont(name, path))
+    except Exception as e:
+        logger.warning(f"Report font {path} unavailable ({e}), Vietnamese text may not render in PDFs")
+        return fallback
+    return name
+
+
+def preload() -> None:
+    """
+    Load fonts, paragraph styles and .docx templates of this process
+
+    Called once per worker process at start; render_report() calls it on
+    first use otherwise. Restart the workers after changing a template.
+    """
+    global _resources
+    if _resources is not None:
+        return
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.lib.styles import ParagraphStyle
+
+    started = time.perf_counter()
+    font = _register_font("ReportFont", settings.REPORT_FONT_PATH, "Helvetica")
+    bold_font = _register_font("ReportFont-Bold", settings.REPORT_FONT_BOLD_PATH, "Helvetica-Bold")
+    styles = {
+        "cell": ParagraphStyle("cell", fontName=font, fontSize=8, leading=10),
+        "center": ParagraphStyle("center", fontName=font, fontSize=11, leading=14, alignment=TA_CENTER),
+        "heading": ParagraphStyle("heading", fontName=bold_font, fontSize=11, leading=14, alignment=TA_CENTER),
+        "title": ParagraphStyle("title", fontName=bold_font, fontSize=14, leading=18, alignment=TA_CENTER),
+    }
+    templates = {}
+    template_dir = Path(settings.REPORT_TEMPLATE_PATH)
+    if template_dir.is_dir():
+        for path in template_dir.glob("*.docx"):
+            templates[path.stem] = path.read_bytes()
+    _resources = _Resources(font=font, bold_font=bold_font, styles=styles, templates=templates)
+    logger.info(f"Report renderer loaded {len(templates)} templates in {time.perf_counter() - started:.2f}s")
+
+
+# ---------------------------------------------------------------------------
+# Formatting
+# ---------------------------------------------------------------------------
+
+def format_cell(value, kind: str) -> str:
+    """Vietnamese formatting: 1.234.567 for amounts, 2,34 for coefficients, dd/mm/yyyy dates"""
+    if value is None or value == "":
+        return ""
+    if kind == "money":
+        return f"{float(value):,.0f}".replace(",", ".")
+    if kind == "integer":
+        return f"{int(value):,}".replace(",", ".")
+    if kind == "coefficient":
+        return f"{float(value):.2f}".replace(".", ",")
+    if kind == "date":
+        if isinstance(value, str):
+            value = date.fromisoformat(value[:10])
+        return f"{value:%d/%m/%Y}"
+    return str(value)
+
+
+def _is_numeric(kind: str) -> bool:
+    return kind in ("integer", "money", "coefficient")
+
+
+# ---------------------------------------------------------------------------
+# Renderers
+# ---------------------------------------------------------------------------
+
+def render_pdf(document: dict) -> bytes:
+    """Render a document to PDF bytes"""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.lib.units import mm
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    resources = _resources
+    styles = resources.styles
+    pagesize = landscape(A4) if document.get("landscape") else A4
+    buffer = BytesIO()
+    template = SimpleDocTemplate(
+        buffer,
+        pagesize=pagesize,
+        leftMargin=15 * mm,
+        rightMargin=15 * mm,
+        topMargin=15 * mm,
+        bottomMargin=15 * mm,
+        title=document["title"],
+    )
+    width = pagesize[0] - 30 * mm
+
+    story = [
+        Table(
+            [[Paragraph((document.get("agency") or "").upper(), styles["heading"]),
+              Paragraph(NATIONAL_TITLE, styles["heading"])],
+             ["", Paragraph(NATIONAL_MOTTO, styles["heading"])]],
+            colWidths=[width * 0.4, width * 0.6],
+        ),
+        Spacer(1, 8 * mm),
+        Paragraph(document["title"], styles["title"]),
+    ]
+    if document.get("subtitle"):
+        story.append(Paragraph(document["subtitle"], styles["center"]))
+    story.append(Spacer(1, 5 * mm))
+
+    columns = document["columns"]
+    kinds = [column["kind"] for column in columns]
+    header = [Paragraph(column["header"], styles["cell"]) for column in columns]
+    table_style = [
+        ("FONTNAME", (0, 0), (-1, -1), resources.font),
+        ("FONTSIZE", (0, 0), (-1, -1), 8),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#EEEEEE")),
+    ]
+    table_style += [("ALIGN", (index, 1), (index, -1), "RIGHT") for index, kind in enumerate(kinds) if _is_numeric(kind)]
+
+    rows = [[format_cell(value, kind) for value, kind in zip(row, kinds)] for row in document["rows"]]
+    totals = document.get("totals")
+    if totals:
+        rows.append([format_cell(value, kind) for value, kind in zip(totals, kinds)])
+    for start in range(0, max(len(rows), 1), PDF_TABLE_ROWS):
+        chunk = rows[start:start + PDF_TABLE_ROWS]
+        style = list(table_style)
+        if totals and start + PDF_TABLE_ROWS >= len(rows):
+            style.append(("FONTNAME", (0, -1), (-1, -1), resources.bold_font))
+        story.append(Table([header, *chunk], repeatRows=1, style=TableStyle(style)))
+
+    story += [
+        Spacer(1, 8 * mm),
+        Table(
+            [["", Paragraph(PLACE_AND_DATE, styles["center"])],
+             [Paragraph(SIGNATURES[0], styles["heading"]), Paragraph(SIGNATURES[1], styles["heading"])]],
+            colWidths=[width * 0.5, width * 0.5],
+        ),
+    ]
+    template.build(story)
+    return buffer.getvalue()
+
+
+def render_docx(report: str, document: dict) -> bytes:
+    """Render a document to .docx bytes, on the report's template when there is one"""
+    from docx import Document
+    from docx.enum.section import WD_ORIENT
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.oxml.ns import qn
+    from docx.shared import Pt
+    from docx.table import _Cell
+
+    template = _resources.templates.get(report)
+    word = Document(BytesIO(template)) if template is not None else Document()
+    if document.get("landscape"):
+        section = word.sections[0]
+        section.orientation = WD_ORIENT.LANDSCAPE
+        section.page_width, section.page_height = section.page_height, section.page_width
+
+    def centered(text: str, bold: bool = False, size: Optional[int] = None, cell=None):
+        paragraph = cell.paragraphs[0] if cell is not None else word.add_paragraph()
+        paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        run = paragraph.add_run(text)
+        if bold:
+            run.bold = True
+        if size is not None:
+            run.font.size = Pt(size)
+        return paragraph
+
+    letterhead = word.add_table(rows=2, cols=2)
+    centered((document.get("agency") or "").upper(), bold=True, cell=letterhead.cell(0, 0))
+    centered(NATIONAL_TITLE, bold=True, cell=letterhead.cell(0, 1))
+    centered(NATIONAL_MOTTO, bold=True, cell=letterhead.cell(1, 1))
+    centered(document["title"], bold=True, size=14)
+    if document.get("subtitle"):
+        centered(document["subtitle"])
+
+    columns = document["columns"]
+    kinds = [column["kind"] for column in columns]
+    table = word.add_table(rows=1, cols=len(columns))
+    try:
+        table.style = "Table Grid"
+    except (KeyError, ValueError):
+        pass
+    for cell, column in zip(table.rows[0].cells, columns):
+        cell.text = column["header"]
+        cell.paragraphs[0].runs[0].bold = True
+
+    # One row is built through python-docx, then its XML is copied for every
+    # data row and only the texts are set: per-cell API calls cost ~1 ms each
+    prototype = table.add_row()
+    for tc, kind in zip(prototype._tr.tc_lst, kinds):
+        paragraph = _Cell(tc, table).paragraphs[0]
+        paragraph.add_run(" ")  # Creates the w:t element to fill
+        if _is_numeric(kind):
+            paragraph.alignment = WD_ALIGN_PARAGRAPH.RIGHT
+    prototype_row = prototype._tr
+    text_tag = qn("w:t")
+
+    def add_row(values) -> list:
+        row = deepcopy(prototype_row)
+        table._tbl.append(row)
+        texts = list(row.iter(text_tag))
+        for text, value, kind in zip(texts, values, kinds):
+            text.text = format_cell(value, kind)
+        return row
+
+    for values in document["rows"]:
+        add_row(values)
+    table._tbl.remove(prototype_row)
+    if document.get("totals"):
+        for tc in add_row(document["totals"]).tc_lst:
+            for run in _Cell(tc, table).paragraphs[0].runs:
+                run.bold = True
+
+    signatures = word.add_table(rows=2, cols=2)
+    centered(PLACE_AND_DATE, cell=signatures.cell(0, 1))
+    centered(SIGNATURES[0], bold=True, cell=signatures.cell(1, 0))
+    centered(SIGNATURES[1], bold=True, cell=signatures.cell(1, 1))
+
+    buffer = BytesIO()
+    word.save(buffer)
+    return buffer.getvalue()
+
+
+def render_report(key: str) -> str:
+    """
+    Render the pending document of a key into the cache
+
+    Runs in a worker process. A failure is recorded in <key>.error for
+    status checks before being re-raised.
+
+    Args:
+        key: Report key, see report_key()
+
+    Returns:
+        str: Path of the rendered file
+
+    Raises:
+        ReportRenderError: No pending document for the key, or rendering failed
+    """
+    preload()
+    report, format, _ = parse_key(key)
+    source = cache_path(key, "json")
+    try:
+        document = json.loads(source.read_bytes())
+    except FileNotFoundError:
+        raise ReportRenderError(f"No pending document for report {key}")
+
+    started = time.perf_counter()
+    try:
+        content = render_pdf(document) if format == "pdf" else render_docx(report, document)
+    except Exception as e:
+        _write_atomic(cache_path(key, "error"), f"{type(e).__name__}: {e}".encode())
+        logger.error(f"Rendering report {key} failed: {e}")
+        raise ReportRenderError(str(e)) from e
+
+    output = cache_path(key, format)
+    _write_atomic(output, content)
+    source.unlink(missing_ok=True)
+    logger.info(
+        f"Rendered report {key} ({len(document['rows'])} rows, {len(content)} bytes) "
+        f"in {time.perf_counter() - started:.2f}s"
+    )
+    return str(output)
+
+
+def report_age(path: Path) -> float:
+    """Seconds since a cache file was written"""
+    return time.time() - path.stat().st_mtime
\ No newline at end of file
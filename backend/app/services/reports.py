@@ -0,0 +1,362 @@
+"""Report jobs - Báo cáo theo mẫu
+
+Government-format reports are rendered outside the request: the handler
+loads the report data (one query), and looks up its content hash in the disk
+cache of app.services.report_rendering. An unchanged report is returned at
+once; otherwise the document is stored and its key queued for rendering.
+Clients poll get_report_job() and download the file once it is done.
+
+The queue is Celery (app.core.celery_app) by default. REPORT_QUEUE=local, or
+ENVIRONMENT=test, renders in a process pool of the serving process instead
+(REPORT_WORKERS processes; 0 renders in the calling thread, for tests). Job
+state lives in the cache directory, so any server sharing REPORT_CACHE_PATH
+with the workers can answer status requests.
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from multiprocessing import get_context
+from threading import Lock
+from typing import Callable, Dict, Optional
+import logging
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.department import Department
+from app.models.employee import Employee
+from app.services import report_rendering
+from app.services.as_of import as_of_query
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class ReportDefinition:
+    """A report: loader(db, **params) returns the document to render"""
+    name: str
+    version: str  # Bump when the loader output changes meaning
+    loader: Callable[..., dict]
+
+
+@dataclass
+class ReportJob:
+    """State of a report render"""
+    key: str
+    report: str
+    format: str
+    status: str
+    error: Optional[str] = None
+
+    @property
+    def filename(self) -> str:
+        return f"{self.report}_{self.key.rsplit('-', 1)[1][:12]}.{self.format}"
+
+    def to_dict(self) -> dict:
+        return {"key": self.key, "report": self.report, "format": self.format, "status": self.status, "error": self.error}
+
+
+# ---------------------------------------------------------------------------
+# Report definitions
+# ---------------------------------------------------------------------------
+
+def _column(header: str, kind: str = "text") -> dict:
+    return {"header": header, "kind": kind}
+
+
+def _document(title: str, subtitle: str, columns: list, rows: list, totals: Optional[list] = None, landscape=False) -> dict:
+    return {
+        "title": title,
+        "subtitle": subtitle,
+        "agency": settings.REPORT_AGENCY_NAME,
+        "landscape": landscape,
+        "columns": columns,
+        "rows": rows,
+        "totals": totals,
+    }
+
+
+def _department_label(db: Session, department_id: Optional[uuid.UUID]) -> str:
+    if department_id is None:
+        return "Toàn cơ quan"
+    name = db.execute(select(Department.name).where(Department.id == department_id)).scalar()
+    return name or str(department_id)
+
+
+def load_payroll(db: Session, period: date, department_id: Optional[uuid.UUID] = None) -> dict:
+    """Bảng thanh toán tiền lương: latest payroll snapshots of a month"""
+    from app.models.payroll import PayrollSnapshot
+    from app.services.payroll import AMOUNT_COLUMNS, month_bounds, payroll_query
+
+    period = month_bounds(period)[0]
+    query = (
+        payroll_query(period, department_id)
+        .add_columns(Employee.employee_code, Employee.full_name)
+        .join(Employee, Employee.id == PayrollSnapshot.employee_id)
+        .order_by(Employee.employee_code, Employee.id)
+    )
+    rows = []
+    totals = [0.0] * len(AMOUNT_COLUMNS)
+    for number, row in enumerate(db.execute(query), start=1):
+        amounts = [float(getattr(row, name) or 0) for name in AMOUNT_COLUMNS]
+        totals = [total + amount for total, amount in zip(totals, amounts)]
+        rows.append([number, row.employee_code, row.full_name, row.salary_coefficient, *amounts])
+    columns = [
+        _column("STT", "integer"),
+        _column("Mã nhân viên"),
+        _column("Họ và tên"),
+        _column("Hệ số lương", "coefficient"),
+        _column("Lương theo hệ số", "money"),
+        _column("PC chức vụ", "money"),
+        _column("PC trách nhiệm", "money"),
+        _column("PC độc hại", "money"),
+        _column("PC thâm niên", "money"),
+        _column("PC khác", "money"),
+        _column("Tổng cộng", "money"),
+    ]
+    return _document(
+        "BẢNG THANH TOÁN TIỀN LƯƠNG",
+        f"Tháng {period:%m/%Y} - {_department_label(db, department_id)}",
+        columns,
+        rows,
+        totals=["", "", "Cộng", "", *totals],
+        landscape=True,
+    )
+
+
+WORKFORCE_DIMENSIONS = (
+    ("by_department", "Đơn vị"),
+    ("by_employee_type", "Đối tượng"),
+    ("by_status", "Trạng thái"),
+    ("by_gender", "Giới tính"),
+    ("by_age_band", "Độ tuổi"),
+    ("by_salary_grade_type", "Loại ngạch"),
+)
+
+AGE_BAND_LABELS = {
+    "under_30": "Dưới 30",
+    "30_39": "Từ 30 đến 39",
+    "40_49": "Từ 40 đến 49",
+    "50_59": "Từ 50 đến 59",
+    "60_plus": "Từ 60 trở lên",
+}
+
+
+def load_workforce(db: Session, department_id: Optional[uuid.UUID] = None) -> dict:
+    """Báo cáo cơ cấu đội ngũ: the dashboard counters as a table"""
+    from app.models.workforce import NONE
+    from app.services.dashboard import get_workforce_dashboard
+
+    dashboard = get_workforce_dashboard(db, department_id=department_id)
+    department_ids = [uuid.UUID(bucket) for bucket in dashboard["by_department"] if bucket != NONE]
+    department_names = {
+        str(unit_id): name
+        for unit_id, name in db.execute(select(Department.id, Department.name).where(Department.id.in_(department_ids)))
+    }
+    rows = []
+    for key, label in WORKFORCE_DIMENSIONS:
+        for bucket, count in dashboard[key].items():
+            if key == "by_department":
+                bucket = "Chưa phân đơn vị" if bucket == NONE else department_names.get(bucket, bucket)
+            elif key == "by_age_band":
+                bucket = AGE_BAND_LABELS.get(bucket, bucket)
+            rows.append([label, bucket, count])
+    return _document(
+        "BÁO CÁO CƠ CẤU ĐỘI NGŨ",
+        _department_label(db, department_id),
+        [_column("Chỉ tiêu"), _column("Nhóm"), _column("Số lượng", "integer")],
+        rows,
+        totals=["Tổng số", "", dashboard["total"]],
+    )
+
+
+def load_assignments(db: Session, as_of: date, department_id: Optional[uuid.UUID] = None) -> dict:
+    """Danh sách ngạch, bậc lương và hợp đồng tại một ngày"""
+    query = as_of_query(as_of, department_id).order_by(Employee.full_name, Employee.id)
+    rows = [
+        [
+            number,
+            row.employee_code,
+            row.full_name,
+            row.salary_grade_code,
+            row.salary_level,
+            row.salary_coefficient,
+            row.salary_effective_date,
+            row.contract_number,
+            row.contract_type,
+        ]
+        for number, row in enumerate(db.execute(query), start=1)
+    ]
+    columns = [
+        _column("STT", "integer"),
+        _column("Mã nhân viên"),
+        _column("Họ và tên"),
+        _column("Mã ngạch"),
+        _column("Bậc", "integer"),
+        _column("Hệ số lương", "coefficient"),
+        _column("Ngày hưởng", "date"),
+        _column("Số hợp đồng"),
+        _column("Loại hợp đồng"),
+    ]
+    return _document(
+        "DANH SÁCH NGẠCH, BẬC LƯƠNG VÀ HỢP ĐỒNG",
+        f"Tại ngày {as_of:%d/%m/%Y} - {_department_label(db, department_id)}",
+        columns,
+        rows,
+        landscape=True,
+    )
+
+
+REPORTS: Dict[str, ReportDefinition] = {
+    definition.name: definition
+    for definition in (
+        ReportDefinition("payroll", "1", load_payroll),
+        ReportDefinition("workforce", "1", load_workforce),
+        ReportDefinition("assignments", "1", load_assignments),
+    )
+}
+
+
+# ---------------------------------------------------------------------------
+# Queues
+# ---------------------------------------------------------------------------
+
+class CeleryQueue:
+    """Render on the Celery workers"""
+
+    def submit(self, key: str) -> None:
+        from app.core.celery_app import RENDER_TASK, celery_app
+
+        celery_app.send_task(RENDER_TASK, args=[key])
+
+    def shutdown(self) -> None:
+        pass
+
+
+class LocalQueue:
+    """Render in a process pool of this process, or inline without workers"""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Spawned, not forked: the server process has threads and open connections
+                self._executor = ProcessPoolExecutor(
+                    self.workers, mp_context=get_context("spawn"), initializer=report_rendering.preload
+                )
+            return self._executor
+
+    def submit(self, key: str) -> None:
+        if self.workers <= 0:
+            try:
+                report_rendering.render_report(key)
+            except report_rendering.ReportRenderError:
+                pass  # Recorded in the cache, reported by get_report_job
+            return
+        future = self._pool().submit(report_rendering.render_report, key)
+        future.add_done_callback(_log_failure)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+def _log_failure(future: Future) -> None:
+    error = future.exception()
+    if error is not None and not isinstance(error, report_rendering.ReportRenderError):
+        logger.error(f"Report render worker failed: {error}")
+
+
+@lru_cache()
+def get_report_queue():
+    """Queue selected by REPORT_QUEUE, local in tests"""
+    if settings.ENVIRONMENT == "test" or settings.REPORT_QUEUE == "local":
+        return LocalQueue(settings.REPORT_WORKERS)
+    return CeleryQueue()
+
+
+def shutdown_report_queue() -> None:
+    """Stop the local render pool, if one was started"""
+    if get_report_queue.cache_info().currsize:
+        get_report_queue().shutdown()
+
+
+# ---------------------------------------------------------------------------
+# Jobs
+# ---------------------------------------------------------------------------
+
+def request_report(db: Session, report: str, format: str, **params) -> ReportJob:
+    """
+    Get a rendered report, or queue its rendering
+
+    Args:
+        db: Database session (read replica is fine)
+        report: Name in REPORTS
+        format: One of REPORT_FORMATS
+        **params: Arguments of the report's loader
+
+    Returns:
+        ReportJob: "done" when an identical report is cached, else "queued"
+            (or "failed" when rendered inline and it failed)
+
+    Raises:
+        ValueError: Unknown report or format
+    """
+    definition = REPORTS.get(report)
+    if definition is None:
+        raise ValueError(f"Unknown report: {report}")
+    if format not in report_rendering.REPORT_FORMATS:
+        raise ValueError(f"Unknown report format: {format}")
+
+    document = definition.loader(db, **params)
+    key, content = report_rendering.report_key(report, definition.version, format, document)
+    if report_rendering.cached_output(key, format) is not None:
+        return ReportJob(key, report, format, DONE)
+
+    pending = report_rendering.cache_path(key, "json")
+    # Already queued and not overdue: do not render twice
+    if pending.exists() and report_rendering.report_age(pending) < settings.REPORT_JOB_TIMEOUT_SECONDS:
+        return ReportJob(key, report, format, QUEUED)
+
+    report_rendering.store_document(key, content)
+    logger.info(f"Queued report {key} ({len(document['rows'])} rows)")
+    get_report_queue().submit(key)
+    return get_report_job(key) or ReportJob(key, report, format, QUEUED)
+
+
+def get_report_job(key: str) -> Optional[ReportJob]:
+    """
+    State of a report render
+
+    Args:
+        key: Key returned by request_report
+
+    Returns:
+        ReportJob | None: None for an unknown (or pruned) key
+
+    Raises:
+        ValueError: Malformed key
+    """
+    report, format, _ = report_rendering.parse_key(key)
+    if report_rendering.cache_path(key, format).exists():
+        return ReportJob(key, report, format, DONE)
+    error = report_rendering.cache_path(key, "error")
+    if error.exists():
+        return ReportJob(key, report, format, FAILED, error=error.read_text())
+    if report_rendering.cache_path(key, "json").exists():
+        return ReportJob(key, report, format, QUEUED)
+    return None
\ No newline at end of file
@@ -0,0 +1,179 @@
+"""Retirement forecast - Dự báo nghỉ hưu
+
+Employee.retirement_date is stored and indexed, maintained by ORM events on
+insert/update and recomputed in bulk by recompute_retirement_dates() when the
+RETIREMENT_AGE_* rules change. Forecasts and warnings are a single range scan
+over that index.
+"""
+
+from collections import defaultdict
+from datetime import date
+from typing import List, Optional
+import uuid
+
+import numpy as np
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.employee import Employee, Gender, INACTIVE_STATUSES
+from app.utils.dates import add_months, to_dates, to_day_array
+
+GROUP_BY_OPTIONS = ("month", "quarter", "year")
+
+WRITE_CHUNK_SIZE = 5000
+
+
+def recompute_retirement_dates(db: Session) -> int:
+    """
+    Recompute retirement_date for the whole workforce
+
+    Needed after RETIREMENT_AGE_* changes or Core bulk inserts that bypass
+    the ORM events. Only rows whose value changes are written, with a new
+    updated_at.
+
+    Args:
+        db: Database session
+
+    Returns:
+        int: Number of employees updated
+    """
+    rows = db.execute(
+        select(Employee.id, Employee.date_of_birth, Employee.gender, Employee.retirement_date)
+    ).all()
+    if not rows:
+        return 0
+
+    ids, births, genders, current = zip(*rows)
+    ages = np.where(
+        np.array([g == Gender.FEMALE for g in genders]),
+        settings.RETIREMENT_AGE_FEMALE,
+        settings.RETIREMENT_AGE_MALE,
+    )
+    retirement = add_months(to_day_array(births), ages * 12)
+    current_days = to_day_array(current)
+    unchanged = (retirement == current_days) | (np.isnat(retirement) & np.isnat(current_days))
+    changed = np.flatnonzero(~unchanged)
+
+    params = [
+        {"_id": ids[i], "_retirement_date": d}
+        for i, d in zip(changed.tolist(), to_dates(retirement[changed]))
+    ]
+    table = Employee.__table__
+    # retirement_date is served: the changed rows get a new version for caches and delta sync
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("_id"))
+        .values(retirement_date=bindparam("_retirement_date"), updated_at=func.now())
+    )
+    for start in range(0, len(params), WRITE_CHUNK_SIZE):
+        db.execute(statement, params[start:start + WRITE_CHUNK_SIZE])
+    db.commit()
+    return len(params)
+
+
+def _retiring_between(db: Session, start: date, end: date, department_id: Optional[uuid.UUID] = None):
+    """Range scan over the retirement_date index"""
+    query = (
+        select(
+            Employee.id,
+            Employee.employee_code,
+            Employee.full_name,
+            Employee.gender,
+            Employee.date_of_birth,
+            Employee.department_id,
+            Employee.position_id,
+            Employee.retirement_date,
+        )
+        .where(
+            Employee.retirement_date >= start,
+            Employee.retirement_date < end,
+            Employee.status.notin_(INACTIVE_STATUSES),
+        )
+        .order_by(Employee.retirement_date)
+    )
+    if department_id is not None:
+        query = query.where(Employee.department_id == department_id)
+    return [dict(row._mapping) for row in db.execute(query)]
+
+
+def _period_key(day: date, group_by: str) -> str:
+    if group_by == "month":
+        return f"{day.year}-{day.month:02d}"
+    if group_by == "quarter":
+        return f"{day.year}-Q{(day.month - 1) // 3 + 1}"
+    return str(day.year)
+
+
+def get_retirement_forecast(
+    db: Session,
+    years: int = 5,
+    group_by: str = "quarter",
+    department_id: Optional[uuid.UUID] = None,
+    start: Optional[date] = None,
+    include_employees: bool = True,
+) -> dict:
+    """
+    Retirement forecast for the next N years - Dự báo nghỉ hưu
+
+    Args:
+        db: Database session
+        years: Forecast horizon in years
+        group_by: month, quarter or year
+        department_id: Restrict to one department
+        start: First day of the forecast (default: today)
+        include_employees: Include the employee list of each period
+
+    Returns:
+        dict: Totals per period and per department within each period
+    """
+    if group_by not in GROUP_BY_OPTIONS:
+        raise ValueError(f"group_by must be one of {GROUP_BY_OPTIONS}")
+
+    start = start or date.today()
+    end = start + relativedelta(years=years)
+    rows = _retiring_between(db, start, end, department_id)
+
+    periods = {}
+    by_department = defaultdict(int)
+    for row in rows:
+        key = _period_key(row["retirement_date"], group_by)
+        period = periods.get(key)
+        if period is None:
+            period = periods[key] = {"period": key, "count": 0, "by_department": defaultdict(int)}
+            if include_employees:
+                period["employees"] = []
+        period["count"] += 1
+        period["by_department"][row["department_id"]] += 1
+        by_department[row["department_id"]] += 1
+        if include_employees:
+            period["employees"].append(row)
+
+    for period in periods.values():
+        period["by_department"] = dict(period["by_department"])
+
+    return {
+        "start": start,
+        "end": end,
+        "group_by": group_by,
+        "total": len(rows),
+        "by_department": dict(by_department),
+        "periods": list(periods.values()),
+    }
+
+
+def get_retirement_warnings(db: Session, department_id: Optional[uuid.UUID] = None) -> List[dict]:
+    """
+    Employees reaching retirement age within RETIREMENT_NOTICE_MONTHS
+
+    Args:
+        db: Database session
+        department_id: Restrict to one department
+
+    Returns:
+        List[dict]: Employees ordered by retirement date
+    """
+    today = date.today()
+    until = today + relativedelta(months=settings.RETIREMENT_NOTICE_MONTHS)
+    return _retiring_between(db, today, until, department_id)
\ No newline at end of file
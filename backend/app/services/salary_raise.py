@@ -0,0 +1,193 @@
+"""Salary raise eligibility engine - Tính thời hạn nâng lương định kỳ
+
+Computes `next_raise_date` and `is_raise_eligible` for every current
+SalaryHistory row in one column-wise pass:
+
+    period = SalaryGrade.raise_period_months when the grade sets one, else
+             the Settings rule for the grade type (SALARY_RAISE_REGULAR_MONTHS
+             for loại A0 and above, which require a cao đẳng degree or
+             higher, SALARY_RAISE_STAFF_MONTHS for loại B/C)
+    eligible = salary_level < SalaryGrade.max_level
+    next_raise_date = effective_date + period months, NULL when not eligible
+
+Incremental runs only revisit employees whose salary rows (or grade) changed
+since the last successful run.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import List, Optional
+import uuid
+
+import numpy as np
+from sqlalchemy import bindparam, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.employee import Employee, INACTIVE_STATUSES
+from app.models.salary import SalaryGrade, SalaryGradeType, SalaryHistory
+from app.services.jobs import get_last_watermark, track_job
+from app.utils.dates import add_months, to_dates, to_day_array
+
+JOB_NAME = "salary_raise_schedule"
+
+# Grades from cán sự (A0) upwards follow the regular rule
+REGULAR_GRADE_TYPES = {SalaryGradeType.A3_1, SalaryGradeType.A2_1, SalaryGradeType.A1, SalaryGradeType.A0}
+
+WRITE_CHUNK_SIZE = 5000
+
+
+@dataclass
+class RaiseScheduleResult:
+    """Outcome of a raise schedule run"""
+    scanned: int
+    updated: int
+    full: bool
+
+
+def _schedule_query(since: Optional[datetime]):
+    """Current salary rows with their grade rules, optionally only changed ones"""
+    query = (
+        select(
+            SalaryHistory.id,
+            SalaryHistory.effective_date,
+            SalaryHistory.salary_level,
+            SalaryHistory.next_raise_date,
+            SalaryHistory.is_raise_eligible,
+            SalaryGrade.grade_type,
+            SalaryGrade.raise_period_months,
+            SalaryGrade.max_level,
+        )
+        .join(SalaryGrade, SalaryGrade.id == SalaryHistory.salary_grade_id)
+        .where(SalaryHistory.is_current.is_(True))
+    )
+    if since is not None:
+        query = query.where(or_(SalaryHistory.updated_at > since, SalaryGrade.updated_at > since))
+    return query
+
+
+def compute_schedule(
+    effective_dates: np.ndarray,
+    levels: np.ndarray,
+    max_levels: np.ndarray,
+    period_months: np.ndarray,
+    is_regular: np.ndarray,
+):
+    """
+    Vectorized raise schedule
+
+    Args:
+        effective_dates: datetime64[D] effective dates
+        levels: Current salary levels
+        max_levels: Grade max levels
+        period_months: Grade raise periods, 0 where the grade sets none
+        is_regular: True for loại A0 and above
+
+    Returns:
+        tuple: (next_raise_dates datetime64[D], eligible bool array)
+    """
+    default_period = np.where(
+        is_regular, settings.SALARY_RAISE_REGULAR_MONTHS, settings.SALARY_RAISE_STAFF_MONTHS
+    )
+    period = np.where(period_months > 0, period_months, default_period)
+    eligible = levels < max_levels
+    next_raise = np.where(eligible, add_months(effective_dates, period), np.datetime64("NaT"))
+    return next_raise, eligible
+
+
+def recompute_raise_schedule(db: Session, full: bool = False) -> RaiseScheduleResult:
+    """
+    Recompute next raise dates and eligibility and write changes in bulk
+
+    Args:
+        db: Database session
+        full: Recompute the whole workforce, e.g. after the Settings rules
+            changed; otherwise only rows changed since the last run
+
+    Returns:
+        RaiseScheduleResult: Scanned and updated row counts
+    """
+    with track_job(db, JOB_NAME) as run:
+        since = None if full else get_last_watermark(db, JOB_NAME)
+        rows = db.execute(_schedule_query(since)).all()
+        if not rows:
+            return RaiseScheduleResult(scanned=0, updated=0, full=since is None)
+
+        ids, effective, levels, old_next, old_eligible, grade_types, periods, max_levels = zip(*rows)
+        next_raise, eligible = compute_schedule(
+            to_day_array(effective),
+            np.array(levels, dtype="int64"),
+            np.array(max_levels, dtype="int64"),
+            np.array([p or 0 for p in periods], dtype="int64"),
+            np.array([t in REGULAR_GRADE_TYPES for t in grade_types]),
+        )
+
+        # Only write rows whose stored values differ
+        old_next_days = to_day_array(old_next)
+        same_date = (next_raise == old_next_days) | (np.isnat(next_raise) & np.isnat(old_next_days))
+        same_flag = eligible == np.array([bool(e) for e in old_eligible])
+        changed = np.flatnonzero(~(same_date & same_flag))
+
+        next_dates = to_dates(next_raise[changed])
+        params = [
+            {"_id": ids[i], "_next_raise_date": d, "_eligible": bool(eligible[i])}
+            for i, d in zip(changed.tolist(), next_dates)
+        ]
+        table = SalaryHistory.__table__
+        # Served columns: the rows get a new version, stamped with the run's
+        # watermark so the next incremental run (updated after it) skips them
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("_id"))
+            .values(
+                next_raise_date=bindparam("_next_raise_date"),
+                is_raise_eligible=bindparam("_eligible"),
+                updated_at=run.watermark,
+            )
+        )
+        for start in range(0, len(params), WRITE_CHUNK_SIZE):
+            db.execute(statement, params[start:start + WRITE_CHUNK_SIZE])
+
+        run.processed_count = len(params)
+        return RaiseScheduleResult(scanned=len(rows), updated=len(params), full=since is None)
+
+
+def get_due_raises(
+    db: Session,
+    until: Optional[date] = None,
+    department_id: Optional[uuid.UUID] = None,
+) -> List[dict]:
+    """
+    List employees due for a regular raise - Danh sách đến kỳ nâng lương
+
+    Args:
+        db: Database session
+        until: Include raises due on or before this date (default: today)
+        department_id: Restrict to one department
+
+    Returns:
+        List[dict]: Due rows ordered by next raise date
+    """
+    query = (
+        select(
+            Employee.id.label("employee_id"),
+            Employee.employee_code,
+            Employee.full_name,
+            Employee.department_id,
+            SalaryHistory.id.label("salary_history_id"),
+            SalaryHistory.salary_grade_id,
+            SalaryHistory.salary_level,
+            SalaryHistory.salary_coefficient,
+            SalaryHistory.next_raise_date,
+        )
+        .join(Employee, Employee.id == SalaryHistory.employee_id)
+        .where(
+            SalaryHistory.is_current.is_(True),
+            SalaryHistory.next_raise_date <= (until or date.today()),
+            Employee.status.notin_(INACTIVE_STATUSES),
+        )
+        .order_by(SalaryHistory.next_raise_date)
+    )
+    if department_id is not None:
+        query = query.where(Employee.department_id == department_id)
+    return [dict(row._mapping) for row in db.execute(query)]
\ No newline at end of file
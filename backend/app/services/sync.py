@@ -0,0 +1,112 @@
+"""Delta sync - Đồng bộ thay đổi
+
+Clients that keep a local copy of a table ask for the rows changed since
+their last sync instead of refetching everything. Rows are walked in
+(updated_at, id) order with the keyset cursors of app.utils.pagination, over
+the (updated_at, id) index. Soft-deleted rows (is_active = False) come back
+as tombstones: just their ids, to drop from the local copy.
+
+A transaction stamps updated_at when it starts but its rows only become
+visible when it commits, so a row can appear behind a watermark already
+handed out. The cursor returned once caught up therefore stops
+SYNC_SAFETY_LAG_SECONDS before the database clock: the most recent changes
+are sent again on the next sync (clients upsert, so that is harmless), and
+a late commit is still picked up.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import uuid
+
+from sqlalchemy import DateTime, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.utils.pagination import PageParams, encode_cursor, paginate
+
+
+@dataclass
+class ChangeSet:
+    """Rows changed after a sync cursor"""
+    items: List[Any] = field(default_factory=list)
+    deleted: List[uuid.UUID] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+
+    def to_response(self) -> dict:
+        """JSON-ready dict; store next_cursor and sync again with it"""
+        return {
+            "items": self.items,
+            "deleted": [str(row_id) for row_id in self.deleted],
+            "next_cursor": self.next_cursor,
+            "has_more": self.has_more,
+        }
+
+
+# Sorts after every id: a cursor at (t, LAST_ID) resumes strictly after t
+LAST_ID = uuid.UUID(int=(1 << 128) - 1)
+
+
+def list_changes(
+    db: Session,
+    model,
+    params: PageParams,
+    load: Callable[[Sequence[uuid.UUID]], Dict[uuid.UUID, Any]],
+    since: Optional[datetime] = None,
+) -> ChangeSet:
+    """
+    One page of the rows of model changed after a cursor or a time
+
+    Args:
+        db: Database session (the primary: a lagging replica would skip rows)
+        model: BaseModel subclass with an (updated_at, id) index
+        params: Cursor (next_cursor of the previous sync) and limit
+        load: Serializes the active rows of a page by id
+        since: Without a cursor, only rows updated after this time
+
+    Returns:
+        ChangeSet: Changed rows, tombstones and the cursor to continue from
+
+    Raises:
+        InvalidCursorError: If the cursor is not a sync cursor of this feed
+    """
+    order_by = (model.updated_at, model.id)
+    keys = [(column, False) for column in order_by]
+    if params.cursor is None and since is not None:
+        if since.tzinfo is not None:
+            since = since.astimezone(timezone.utc)
+        params = PageParams(cursor=encode_cursor(keys, [since, LAST_ID]), limit=params.limit)
+    page = paginate(db, select(model.id, model.updated_at, model.is_active), order_by, params)
+
+    active = [row.id for row in page.items if row.is_active]
+    loaded = load(active) if active else {}
+    changes = ChangeSet(
+        items=[loaded[row_id] for row_id in active if row_id in loaded],
+        deleted=[row.id for row in page.items if not row.is_active],
+        next_cursor=page.next_cursor,
+        has_more=page.has_more,
+    )
+    if not page.has_more:
+        changes.next_cursor = _caught_up_cursor(db, keys, page.items, params.cursor)
+    return changes
+
+
+def _caught_up_cursor(db: Session, keys: list, rows: list, cursor: Optional[str]) -> str:
+    """Cursor to resume from once caught up, held back by the safety lag"""
+    now = db.execute(select(func.now(type_=DateTime(timezone=True)))).scalar_one()
+    horizon = now - timedelta(seconds=settings.SYNC_SAFETY_LAG_SECONDS)
+    if rows:
+        last = rows[-1]
+        if _utc(last.updated_at) < _utc(horizon):
+            return encode_cursor(keys, [last.updated_at, last.id])
+    elif cursor is not None:
+        # Nothing new: the client's cursor still stands
+        return cursor
+    # Resume at the horizon: rows stamped at it sort after the nil id
+    return encode_cursor(keys, [horizon, uuid.UUID(int=0)])
+
+
+def _utc(value: datetime) -> datetime:
+    """SQLite returns naive UTC timestamps, PostgreSQL aware ones"""
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
\ No newline at end of file
@@ -0,0 +1,384 @@
+"""File uploads - Tệp đính kèm (ảnh đại diện, bản scan hợp đồng)
+
+Uploads are read from the request body as it arrives: the multipart stream
+is parsed chunk by chunk, each chunk hashed and appended to a temporary file,
+and the request is rejected as soon as it passes MAX_UPLOAD_SIZE. Memory use
+does not depend on the file size, and oversized bodies are not read to the
+end (nor at all when Content-Length already exceeds the limit).
+
+Files are stored under their content hash:
+
+    UPLOAD_PATH/objects/ab/cd/<sha256>.<ext>
+
+so uploading the same scan or photo again stores nothing new, and a stored
+path never changes content (which 023's cache headers rely on). Avatars get
+square JPEG thumbnails (AVATAR_THUMBNAIL_SIZES) under
+
+    UPLOAD_PATH/thumbnails/<size>/ab/<sha256>.jpg
+
+generated after the response by generate_thumbnails(); list views link to
+thumbnail_url() instead of the original.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import time
+
+from multipart.multipart import MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_URL_PREFIX = "/uploads"
+OBJECTS_DIR = "objects"
+THUMBNAILS_DIR = "thumbnails"
+TEMPORARY_DIR = "tmp"
+
+AVATAR_EXTENSIONS = ("jpg", "jpeg", "png")
+AVATAR_THUMBNAIL_SIZES = (64, 256)
+LIST_THUMBNAIL_SIZE = 64
+THUMBNAIL_QUALITY = 85
+
+# Allowance for the multipart boundaries and part headers around the file
+MULTIPART_OVERHEAD = 16 * 1024
+
+EXTENSION_ALIASES = {"jpeg": "jpg"}
+
+# Leading bytes of each type, so a renamed executable is not stored as a .pdf
+SIGNATURES = {
+    "jpg": (b"\xff\xd8\xff",),
+    "png": (b"\x89PNG\r\n\x1a\n",),
+    "pdf": (b"%PDF-",),
+    "docx": (b"PK\x03\x04",),
+    "xlsx": (b"PK\x03\x04",),
+    "doc": (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1",),
+    "xls": (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1",),
+}
+SIGNATURE_LENGTH = max(len(signature) for signatures in SIGNATURES.values() for signature in signatures)
+
+_OBJECT_URL = re.compile(rf"^{UPLOAD_URL_PREFIX}/{OBJECTS_DIR}/[0-9a-f]{{2}}/[0-9a-f]{{2}}/([0-9a-f]{{64}})\.\w+$")
+
+
+class UploadRejectedError(ValueError):
+    """The upload is malformed or of a type that is not accepted"""
+
+
+class UploadTooLargeError(ValueError):
+    """The upload is larger than the allowed size"""
+
+
+@dataclass
+class StoredFile:
+    """A file in content-addressed storage"""
+    sha256: str
+    size: int
+    extension: str
+    filename: str  # Name given by the client
+    created: bool  # False when identical content was already stored
+
+    @property
+    def path(self) -> str:
+        """Path relative to UPLOAD_PATH"""
+        return object_path(self.sha256, self.extension)
+
+    @property
+    def url(self) -> str:
+        return f"{UPLOAD_URL_PREFIX}/{self.path}"
+
+
+def object_path(sha256: str, extension: str) -> str:
+    return f"{OBJECTS_DIR}/{sha256[:2]}/{sha256[2:4]}/{sha256}.{extension}"
+
+
+def thumbnail_path(sha256: str, size: int) -> str:
+    return f"{THUMBNAILS_DIR}/{size}/{sha256[:2]}/{sha256}.jpg"
+
+
+def thumbnail_url(url: Optional[str], size: int = LIST_THUMBNAIL_SIZE) -> Optional[str]:
+    """
+    Thumbnail of an uploaded avatar
+
+    Args:
+        url: avatar_url as stored on the employee
+        size: One of AVATAR_THUMBNAIL_SIZES
+
+    Returns:
+        str | None: Thumbnail URL; the URL itself for avatars stored before
+            content addressing, which have no thumbnails
+    """
+    if not url:
+        return url
+    match = _OBJECT_URL.match(url)
+    if match is None:
+        return url
+    return f"{UPLOAD_URL_PREFIX}/{thumbnail_path(match.group(1), size)}"
+
+
+def normalize_extension(filename: str, allowed: Sequence[str]) -> str:
+    """
+    Extension of a client file name, checked against the allowed ones
+
+    Raises:
+        UploadRejectedError: No extension or not allowed
+    """
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    if extension not in allowed:
+        raise UploadRejectedError(f"File type not allowed: .{extension or '?'} (allowed: {', '.join(allowed)})")
+    return EXTENSION_ALIASES.get(extension, extension)
+
+
+class UploadWriter:
+    """Hash and spool one file to disk, then move it to its content address"""
+
+    def __init__(self, filename: str, allowed_extensions: Sequence[str], max_size: int):
+        self.filename = filename
+        self.extension = normalize_extension(filename, allowed_extensions)
+        self.max_size = max_size
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._head = b""
+        root = Path(settings.UPLOAD_PATH)
+        (root / TEMPORARY_DIR).mkdir(parents=True, exist_ok=True)
+        fd, self._temporary = tempfile.mkstemp(dir=root / TEMPORARY_DIR, prefix="upload-")
+        self._file = os.fdopen(fd, "wb")
+
+    def write(self, chunks: Iterable[bytes]) -> None:
+        """
+        Append chunks of the file
+
+        Raises:
+            UploadTooLargeError: The file passed max_size
+        """
+        for chunk in chunks:
+            self.size += len(chunk)
+            if self.size > self.max_size:
+                raise UploadTooLargeError(f"File is larger than {self.max_size} bytes")
+            if len(self._head) < SIGNATURE_LENGTH:
+                self._head += chunk[:SIGNATURE_LENGTH - len(self._head)]
+            self._hash.update(chunk)
+            self._file.write(chunk)
+
+    def finish(self) -> StoredFile:
+        """
+        Move the complete file to its content address
+
+        Raises:
+            UploadRejectedError: Empty file, or content not of its extension's type
+        """
+        self._file.close()
+        try:
+            if self.size == 0:
+                raise UploadRejectedError("File is empty")
+            signatures = SIGNATURES.get(self.extension)
+            if signatures and not self._head.startswith(signatures):
+                raise UploadRejectedError(f"File content is not a valid .{self.extension} file")
+            sha256 = self._hash.hexdigest()
+            target = Path(settings.UPLOAD_PATH) / object_path(sha256, self.extension)
+            created = not target.exists()
+            if created:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.chmod(self._temporary, 0o644)
+                # Identical content racing in from another request lands on the same bytes
+                os.replace(self._temporary, target)
+        finally:
+            self.abort()
+        logger.info(f"Stored upload {self.filename} as {sha256} ({self.size} bytes, {'new' if created else 'duplicate'})")
+        return StoredFile(sha256, self.size, self.extension, self.filename, created)
+
+    def abort(self) -> None:
+        """Drop the temporary file (no-op once moved)"""
+        self._file.close()
+        try:
+            os.unlink(self._temporary)
+        except FileNotFoundError:
+            pass
+
+
+class _MultipartReceiver:
+    """Parser callbacks routing one file field to an UploadWriter"""
+
+    def __init__(self, field: str, allowed_extensions: Sequence[str], max_size: int):
+        self.field = field
+        self.allowed_extensions = allowed_extensions
+        self.max_size = max_size
+        self.writer: Optional[UploadWriter] = None
+        self.pending: List[bytes] = []
+        self.complete = False
+        self._receiving = False
+        self._header_name = b""
+        self._header_value = b""
+        self._disposition = b""
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+        }
+
+    def on_part_begin(self) -> None:
+        self._disposition = b""
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        if self._header_name.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_name = self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._disposition)
+        name = options.get(b"name", b"").decode("utf-8", "replace")
+        filename = options.get(b"filename")
+        self._receiving = name == self.field and filename is not None and self.writer is None
+        if self._receiving:
+            # Only the base name: some clients send the full local path
+            filename = filename.decode("utf-8", "replace").replace("\\", "/").rsplit("/", 1)[-1]
+            self.writer = UploadWriter(filename, self.allowed_extensions, self.max_size)
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        # Other fields are skipped, not kept
+        if self._receiving:
+            self.pending.append(data[start:end])
+
+    def on_part_end(self) -> None:
+        if self._receiving:
+            self._receiving = False
+            self.complete = True
+
+
+async def receive_upload(
+    request: Request,
+    field: str = "file",
+    allowed_extensions: Optional[Sequence[str]] = None,
+    max_size: Optional[int] = None,
+) -> StoredFile:
+    """
+    Stream the file of a multipart/form-data request into storage
+
+    Args:
+        request: Incoming request, body not yet read
+        field: Form field carrying the file
+        allowed_extensions: Accepted extensions (default: ALLOWED_EXTENSIONS)
+        max_size: Size limit in bytes (default: MAX_UPLOAD_SIZE)
+
+    Returns:
+        StoredFile: The stored (or already present) file
+
+    Raises:
+        UploadRejectedError: Not multipart, no file in the field, bad type
+        UploadTooLargeError: Over the size limit
+    """
+    allowed_extensions = allowed_extensions or settings.ALLOWED_EXTENSIONS
+    max_size = max_size or settings.MAX_UPLOAD_SIZE
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in options:
+        raise UploadRejectedError("Expected a multipart/form-data body")
+    length = request.headers.get("content-length")
+    if length is not None and length.isdigit() and int(length) > max_size + MULTIPART_OVERHEAD:
+        raise UploadTooLargeError(f"File is larger than {max_size} bytes")
+
+    receiver = _MultipartReceiver(field, allowed_extensions, max_size)
+    parser = MultipartParser(options[b"boundary"], receiver.callbacks())
+    started = time.perf_counter()
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            if receiver.pending:
+                # Disk writes off the event loop, as Starlette's own form parser does
+                await run_in_threadpool(receiver.writer.write, receiver.pending)
+                receiver.pending = []
+        parser.finalize()
+        if receiver.writer is None or not receiver.complete:
+            raise UploadRejectedError(f"No file in form field '{field}'")
+        stored = await run_in_threadpool(receiver.writer.finish)
+    except BaseException:
+        if receiver.writer is not None:
+            receiver.writer.abort()
+        raise
+    logger.debug(f"Received {stored.size} bytes in {time.perf_counter() - started:.3f}s")
+    return stored
+
+
+def verify_image(stored: StoredFile) -> None:
+    """
+    Check that a stored file decodes as an image (header only)
+
+    Raises:
+        UploadRejectedError: Not an image Pillow can read
+    """
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        with Image.open(Path(settings.UPLOAD_PATH) / stored.path) as image:
+            image.verify()
+    except (UnidentifiedImageError, OSError, SyntaxError) as e:
+        raise UploadRejectedError(f"File is not a readable image: {e}")
+
+
+def generate_thumbnails(sha256: str, extension: str, sizes: Sequence[int] = AVATAR_THUMBNAIL_SIZES) -> List[str]:
+    """
+    Write square JPEG thumbnails of a stored image (skips existing ones)
+
+    Run after the upload response (BackgroundTasks): a few tens of ms of
+    Pillow work that does not need a worker queue.
+
+    Args:
+        sha256: Content hash of the original
+        extension: Its extension
+        sizes: Edge lengths in pixels
+
+    Returns:
+        List[str]: Thumbnail paths relative to UPLOAD_PATH
+    """
+    from PIL import Image, ImageOps
+
+    root = Path(settings.UPLOAD_PATH)
+    paths = [thumbnail_path(sha256, size) for size in sizes]
+    missing = [(size, root / path) for size, path in zip(sizes, paths) if not (root / path).exists()]
+    if not missing:
+        return paths
+    started = time.perf_counter()
+    try:
+        with Image.open(root / object_path(sha256, extension)) as image:
+            # JPEG decodes straight at a reduced scale, much faster for camera photos
+            largest = max(size for size, _ in missing)
+            image.draft("RGB", (largest * 2, largest * 2))
+            image = ImageOps.exif_transpose(image)
+            if image.mode in ("RGBA", "LA", "P"):
+                image = image.convert("RGBA")
+                background = Image.new("RGB", image.size, (255, 255, 255))
+                background.paste(image, mask=image.getchannel("A"))
+                image = background
+            else:
+                image = image.convert("RGB")
+            for size, target in sorted(missing, reverse=True):
+                thumbnail = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                fd, temporary = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+                with os.fdopen(fd, "wb") as file:
+                    thumbnail.save(file, "JPEG", quality=THUMBNAIL_QUALITY, optimize=True, progressive=True)
+                os.chmod(temporary, 0o644)
+                os.replace(temporary, target)
+    except Exception as e:
+        logger.error(f"Thumbnails of {sha256} failed: {e}")
+        raise
+    logger.info(f"Generated {len(missing)} thumbnails of {sha256} in {time.perf_counter() - started:.3f}s")
+    return paths
\ No newline at end of file
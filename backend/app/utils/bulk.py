@@ -0,0 +1,64 @@
+"""Bulk inserts - COPY on PostgreSQL, executemany elsewhere
+
+Core inserts bypass the ORM: callers fill derived columns themselves, and
+Python-side column defaults are applied here so every row carries the same
+columns.
+"""
+
+from datetime import date, datetime
+from typing import List
+import enum
+import io
+
+from sqlalchemy.orm import Session
+
+
+def with_defaults(table, rows: List[dict]) -> List[dict]:
+    """Fill Python-side column defaults so every row carries the same columns"""
+    if not rows:
+        return rows
+    keys = set().union(*rows)
+    defaults = {
+        column.key: column.default
+        for column in table.columns
+        if column.default is not None and column.key not in keys
+    }
+    for row in rows:
+        for key, default in defaults.items():
+            row[key] = default.arg(None) if default.is_callable else default.arg
+    return rows
+
+
+def _copy_value(value) -> str:
+    """Render a value for COPY ... FROM STDIN in text format"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, enum.Enum):
+        # SQLAlchemy Enum columns store member names
+        return value.name
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    text = str(value)
+    return text.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def bulk_insert(db: Session, table, rows: List[dict]) -> None:
+    """COPY on PostgreSQL (psycopg2), executemany elsewhere"""
+    if not rows:
+        return
+    rows = with_defaults(table, rows)
+    connection = db.connection()
+    if connection.dialect.name == "postgresql" and connection.dialect.driver == "psycopg2":
+        columns = list(rows[0])
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write("\t".join(_copy_value(row.get(c)) for c in columns))
+            buffer.write("\n")
+        buffer.seek(0)
+        column_list = ", ".join(f'"{c}"' for c in columns)
+        with connection.connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {table.name} ({column_list}) FROM STDIN", buffer)
+    else:
+        connection.execute(table.insert(), rows)
\ No newline at end of file
@@ -0,0 +1,52 @@
+"""Vectorized date helpers over NumPy datetime64 arrays"""
+
+from datetime import date
+from typing import Iterable, Optional
+
+import numpy as np
+
+
+def to_day_array(values: Iterable[Optional[date]]) -> np.ndarray:
+    """
+    Convert dates to a datetime64[D] array
+
+    Args:
+        values: Dates, None becomes NaT
+
+    Returns:
+        np.ndarray: datetime64[D] array
+    """
+    return np.array(
+        [np.datetime64(v, "D") if v is not None else np.datetime64("NaT") for v in values],
+        dtype="datetime64[D]",
+    )
+
+
+def add_months(days: np.ndarray, months: np.ndarray) -> np.ndarray:
+    """
+    Add calendar months, clamping to the last day of the target month
+
+    31/01 + 1 month gives 28/02 (or 29/02), matching dateutil.relativedelta.
+
+    Args:
+        days: datetime64[D] array
+        months: Integer array (or scalar) of months to add
+
+    Returns:
+        np.ndarray: datetime64[D] array, NaT where the input is NaT
+    """
+    month_start = days.astype("datetime64[M]")
+    day_offset = days - month_start.astype("datetime64[D]")
+    target_month = month_start + np.asarray(months, dtype="int64").astype("timedelta64[M]")
+    last_day = (target_month + np.timedelta64(1, "M")).astype("datetime64[D]") - np.timedelta64(1, "D")
+    return np.minimum(target_month.astype("datetime64[D]") + day_offset, last_day)
+
+
+def to_dates(days: np.ndarray) -> list:
+    """
+    Convert a datetime64[D] array back to Python dates
+
+    Returns:
+        list: date objects, None for NaT
+    """
+    return [None if np.isnat(d) else d.item() for d in days]
\ No newline at end of file
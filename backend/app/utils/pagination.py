@@ -0,0 +1,249 @@
+"""Keyset (cursor) pagination
+
+Pages are selected with a WHERE on the sort key of the last row returned
+instead of OFFSET, so page 1000 costs the same index range scan as page 1 and
+rows inserted or deleted meanwhile never shift items between pages. The sort
+key must end with a unique, non-null column (usually id) and should match an
+index, e.g. (full_name, id) or (created_at, id).
+
+Cursors are opaque url-safe strings carrying the key of the last row and a
+digest of the sort order, so a cursor cannot be replayed against another sort.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Callable, List, Optional, Sequence
+import base64
+import binascii
+import enum
+import hashlib
+import json
+import uuid
+
+from fastapi import Query
+from sqlalchemy import DateTime, and_, func, literal, or_, select, text, tuple_
+from sqlalchemy.exc import CompileError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import operators
+
+from app.core.config import settings
+
+
+class InvalidCursorError(ValueError):
+    """Cursor is malformed or belongs to another sort order"""
+
+
+@dataclass
+class PageParams:
+    """Cursor paging parameters of a list request"""
+    cursor: Optional[str] = None
+    limit: int = 20
+    total: Optional[str] = None
+
+
+@dataclass
+class Page:
+    """One page of a keyset-paginated list"""
+    items: List[Any] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+
+    def to_response(self, serialize: Callable[[Any], Any] = lambda item: item) -> dict:
+        """JSON-ready dict with each item passed through serialize"""
+        return {
+            "items": [serialize(item) for item in self.items],
+            "next_cursor": self.next_cursor,
+            "has_more": self.has_more,
+            "total": self.total,
+            "total_is_estimate": self.total_is_estimate,
+        }
+
+
+def page_params(
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    total: Optional[str] = Query(None, pattern="^(exact|estimate)$", description="Also count matching rows"),
+) -> PageParams:
+    """Dependency for list routes"""
+    return PageParams(cursor=cursor, limit=limit, total=total)
+
+
+def _sort_keys(order_by: Sequence) -> List[tuple]:
+    """(column, descending) for each ORDER BY element"""
+    keys = []
+    for element in order_by:
+        modifier = getattr(element, "modifier", None)
+        if modifier is operators.desc_op:
+            keys.append((element.element, True))
+        elif modifier is operators.asc_op:
+            keys.append((element.element, False))
+        else:
+            keys.append((element, False))
+    return keys
+
+
+def _signature(keys: List[tuple]) -> str:
+    spec = ",".join(f"{column}:{'d' if descending else 'a'}" for column, descending in keys)
+    return hashlib.blake2s(spec.encode(), digest_size=4).hexdigest()
+
+
+def _encode_value(value):
+    if isinstance(value, enum.Enum):
+        value = value.value
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, uuid.UUID):
+        return {"u": value.hex}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "u" in value:
+            return uuid.UUID(hex=value["u"])
+    return value
+
+
+def encode_cursor(keys: List[tuple], values: Sequence) -> str:
+    payload = {"s": _signature(keys), "k": [_encode_value(value) for value in values]}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(keys: List[tuple], cursor: str) -> list:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        values = [_decode_value(value) for value in payload["k"]]
+        signature = payload["s"]
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError("Malformed cursor") from e
+    if signature != _signature(keys) or len(values) != len(keys):
+        raise InvalidCursorError("Cursor does not match this list's sort order")
+    return values
+
+
+def _comparable(keys: List[tuple], values: list, dialect_name: str) -> tuple:
+    """
+    SQLite keeps timestamps as text, and server defaults omit the microseconds
+    SQLAlchemy writes for bound values, so text comparison misorders equal
+    instants; compare DateTime keys as julian days there instead
+    """
+    if dialect_name != "sqlite":
+        return keys, values
+    compared_keys, compared_values = [], []
+    for (column, descending), value in zip(keys, values):
+        if isinstance(column.type, DateTime):
+            column, value = func.julianday(column), func.julianday(literal(value, DateTime()))
+        compared_keys.append((column, descending))
+        compared_values.append(value)
+    return compared_keys, compared_values
+
+
+def _after(keys: List[tuple], values: list):
+    """Rows strictly after values in the sort order"""
+    if all(descending == keys[0][1] for _, descending in keys):
+        row, bound = tuple_(*(column for column, _ in keys)), tuple_(*values)
+        return row < bound if keys[0][1] else row > bound
+    # Mixed directions cannot use a row comparison
+    clauses = []
+    for position, (column, descending) in enumerate(keys):
+        equal = [keys[i][0] == values[i] for i in range(position)]
+        clauses.append(and_(*equal, column < values[position] if descending else column > values[position]))
+    return or_(*clauses)
+
+
+def _key_of(item, keys: List[tuple]) -> list:
+    mapping = getattr(item, "_mapping", None)
+    values = []
+    for column, _ in keys:
+        if mapping is not None and column in mapping:
+            values.append(mapping[column])
+        else:
+            values.append(getattr(item, column.key))
+    return values
+
+
+def _returns_entity(query) -> bool:
+    descriptions = query.column_descriptions
+    return len(descriptions) == 1 and descriptions[0]["expr"] is descriptions[0]["entity"]
+
+
+def count_rows(db: Session, query, mode: str = "exact") -> tuple:
+    """
+    Count the rows of a list query
+
+    "estimate" reads the planner's row estimate on PostgreSQL, which costs
+    no scan; other databases fall back to an exact count.
+
+    Args:
+        db: Database session
+        query: Unpaginated list query
+        mode: "exact" or "estimate"; filters that cannot be rendered as
+            literals fall back to an exact count
+
+    Returns:
+        tuple: (count, is_estimate)
+    """
+    query = query.order_by(None)
+    bind = db.get_bind()
+    if mode == "estimate" and bind.dialect.name == "postgresql":
+        try:
+            compiled = query.compile(bind, compile_kwargs={"literal_binds": True})
+        except CompileError:
+            compiled = None
+        if compiled is not None:
+            plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"]), True
+    return db.execute(select(func.count()).select_from(query.subquery())).scalar_one(), False
+
+
+def paginate(db: Session, query, order_by: Sequence, params: PageParams) -> Page:
+    """
+    Run one page of a list query
+
+    Args:
+        db: Database session
+        query: Select without ORDER BY/LIMIT; a single ORM entity or columns
+        order_by: Sort key, ending with a unique column, e.g.
+            (Employee.full_name, Employee.id) or (Contract.created_at.desc(), Contract.id.desc())
+        params: Cursor, limit and total mode
+
+    Returns:
+        Page: Items (entities or rows) and the cursor of the next page
+
+    Raises:
+        InvalidCursorError: If the cursor cannot be used with this sort
+    """
+    keys = _sort_keys(order_by)
+    total, total_is_estimate = None, False
+    if params.total:
+        total, total_is_estimate = count_rows(db, query, params.total)
+
+    page_query = query
+    if params.cursor:
+        values = decode_cursor(keys, params.cursor)
+        page_query = page_query.where(_after(*_comparable(keys, values, db.get_bind().dialect.name)))
+    page_query = page_query.order_by(*order_by).limit(params.limit + 1)
+
+    result = db.scalars(page_query) if _returns_entity(query) else db.execute(page_query)
+    items = list(result)
+    has_more = len(items) > params.limit
+    items = items[: params.limit]
+    next_cursor = encode_cursor(keys, _key_of(items[-1], keys)) if has_more else None
+    return Page(
+        items=items,
+        next_cursor=next_cursor,
+        has_more=has_more,
+        total=total,
+        total_is_estimate=total_is_estimate,
+    )
\ No newline at end of file
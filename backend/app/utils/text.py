@@ -0,0 +1,36 @@
+"""Text helpers for Vietnamese search"""
+
+from typing import Optional
+import re
+import unicodedata
+
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+
+
+def strip_accents(value: str) -> str:
+    """
+    Remove Vietnamese diacritics - "Nguyễn Đức" -> "Nguyen Duc"
+
+    Args:
+        value: Text
+
+    Returns:
+        str: Text without combining marks, đ/Đ mapped to d/D
+    """
+    value = value.replace("đ", "d").replace("Đ", "D")
+    decomposed = unicodedata.normalize("NFD", value)
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def normalize_search_text(*parts: Optional[str]) -> str:
+    """
+    Lowercase, accent-free, space-separated words of the given parts
+
+    Args:
+        *parts: Text fragments, None values are skipped
+
+    Returns:
+        str: e.g. "nguyen van an nv001 an nguyen hrms vn"
+    """
+    text = " ".join(part for part in parts if part)
+    return " ".join(_NON_WORD.split(strip_accents(text).lower())).strip()
\ No newline at end of file
@@ -0,0 +1,88 @@
+"""Load benchmark: sync vs async database engine
+
+Runs the same route through get_session() with DATABASE_ASYNC off and on,
+driving it with many concurrent clients, and reports requests/sec and
+latency percentiles for each engine.
+
+Usage:
+    python -m benchmarks.bench_db_engines --clients 200 --requests 10000
+    python -m benchmarks.bench_db_engines --query "SELECT pg_sleep(0.005)"
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.database import dispose_engines, execute, get_session
+
+
+def build_app(query: str) -> FastAPI:
+    """Minimal app with a single route using the switchable session"""
+    app = FastAPI()
+
+    @app.get("/probe")
+    async def probe(db=Depends(get_session)):
+        result = await execute(db, text(query))
+        return {"value": result.scalar()}
+
+    return app
+
+
+async def run_load(app: FastAPI, clients: int, requests: int) -> dict:
+    """Fire `requests` calls from `clients` concurrent workers"""
+    latencies = []
+    errors = 0
+    remaining = iter(range(requests))
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            nonlocal errors
+            for _ in remaining:
+                started = time.perf_counter()
+                try:
+                    response = await client.get("/probe")
+                    response.raise_for_status()
+                except Exception:
+                    # Pool timeouts under overload count against the engine
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+    }
+
+
+async def main(args) -> None:
+    app = build_app(args.query)
+    for use_async in (False, True):
+        settings.DATABASE_ASYNC = use_async
+        # Warm up pools before measuring
+        await run_load(app, min(args.clients, 20), min(args.requests, 200))
+        stats = await run_load(app, args.clients, args.requests)
+        print(f"{'async' if use_async else 'sync':<6} {stats}")
+    await dispose_engines()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--query", default="SELECT 1")
+    asyncio.run(main(parser.parse_args()))
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""Load benchmark: /uploads serving, plain StaticFiles vs UploadStaticFiles
+
+Simulates repeated profile page loads. Each load fetches an avatar thumbnail
+and two contract scans (content-addressed paths, as app.services.uploads
+stores them) through a small browser-like client cache. For every scenario
+it reports page loads/sec, HTTP requests and body bytes per load:
+
+- static-nocache: StaticFiles, client without a cache (full download each time)
+- static-cached: StaticFiles, caching client; no Cache-Control, so every
+  load revalidates (304 when unchanged)
+- uploads-cached: UploadStaticFiles, caching client; immutable files are
+  reused without any request after the first load
+- static-viewer / uploads-viewer: a PDF viewer showing the first page of
+  each scan with a Range request (StaticFiles ignores it and sends it all)
+
+Usage:
+    python -m benchmarks.bench_file_serving --loads 200 --pdf-mb 3
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.staticfiles import StaticFiles
+
+from app.core.file_serving import UploadStaticFiles
+from app.services.uploads import object_path, thumbnail_path
+
+# First page of a scan as a viewer requests it
+VIEWER_RANGE = "bytes=0-262143"
+
+
+def write_content_addressed(root: str, data: bytes, extension: str) -> str:
+    sha256 = hashlib.sha256(data).hexdigest()
+    relative = object_path(sha256, extension)
+    os.makedirs(os.path.join(root, os.path.dirname(relative)), exist_ok=True)
+    with open(os.path.join(root, relative), "wb") as file:
+        file.write(data)
+    return relative
+
+
+def build_files(root: str, pdf_mb: float) -> List[str]:
+    """An avatar thumbnail and two scans; returns their URLs"""
+    thumbnail = thumbnail_path(hashlib.sha256(b"avatar").hexdigest(), 256)
+    os.makedirs(os.path.join(root, os.path.dirname(thumbnail)), exist_ok=True)
+    with open(os.path.join(root, thumbnail), "wb") as file:
+        file.write(b"\xff\xd8\xff" + os.urandom(12 * 1024))
+    size = int(pdf_mb * 1024 * 1024)
+    scans = [write_content_addressed(root, b"%PDF-1.7\n" + os.urandom(size), "pdf") for _ in range(2)]
+    return [f"/uploads/{path}" for path in (thumbnail, *scans)]
+
+
+def build_app(root: str, upgraded: bool) -> Starlette:
+    files = UploadStaticFiles(directory=root) if upgraded else StaticFiles(directory=root)
+    return Starlette(routes=[Mount("/uploads", app=files)])
+
+
+class BrowserCache:
+    """Just enough of a browser cache: immutable reuse and ETag revalidation"""
+
+    def __init__(self):
+        self.entries: Dict[str, Tuple[Optional[str], bool]] = {}
+
+    def request_headers(self, url: str) -> Optional[dict]:
+        """Headers for a request, None when the cached copy can be used as is"""
+        etag, immutable = self.entries.get(url, (None, False))
+        if immutable:
+            return None
+        return {"if-none-match": etag} if etag else {}
+
+    def store(self, url: str, response: httpx.Response) -> None:
+        if response.status_code == 200:
+            cache_control = response.headers.get("cache-control", "")
+            self.entries[url] = (response.headers.get("etag"), "immutable" in cache_control)
+
+
+async def run_loads(app: Starlette, urls: List[str], loads: int, cached: bool, viewer: bool) -> dict:
+    cache = BrowserCache()
+    requests = transferred = 0
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        for _ in range(loads):
+            for url in urls:
+                headers = cache.request_headers(url) if cached else {}
+                if headers is None:
+                    continue
+                if viewer and url.endswith(".pdf"):
+                    headers = {**headers, "range": VIEWER_RANGE}
+                response = await client.get(url, headers=headers)
+                requests += 1
+                transferred += len(response.content)
+                if cached:
+                    cache.store(url, response)
+        elapsed = time.perf_counter() - started
+    return {
+        "loads_per_s": round(loads / elapsed, 1),
+        "requests_per_load": round(requests / loads, 2),
+        "kib_per_load": round(transferred / loads / 1024, 1),
+    }
+
+
+async def main(args) -> None:
+    with tempfile.TemporaryDirectory() as root:
+        urls = build_files(root, args.pdf_mb)
+        static, uploads = build_app(root, False), build_app(root, True)
+        scenarios = (
+            ("static-nocache", static, False, False),
+            ("static-cached", static, True, False),
+            ("uploads-cached", uploads, True, False),
+            ("static-viewer", static, False, True),
+            ("uploads-viewer", uploads, False, True),
+        )
+        for name, app, cached, viewer in scenarios:
+            stats = await run_loads(app, urls, args.loads, cached, viewer)
+            print(f"{name:<15} {stats}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--loads", type=int, default=200)
+    parser.add_argument("--pdf-mb", type=float, default=3.0)
+    asyncio.run(main(parser.parse_args()))
\ No newline at end of file
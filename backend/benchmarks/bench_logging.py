@@ -0,0 +1,145 @@
+"""Micro-benchmark: per-call logging overhead
+
+Logs the same messages through the standard logging module (as the app's
+modules do) under several configurations and reports, per call, the time the
+calling thread spends in logger.info():
+
+- legacy: the former setup_logging - synchronous sinks and an InterceptHandler
+  walking stack frames for every record
+- loguru-enqueue: legacy with loguru's enqueue=True on every sink
+- sync-text / sync-json: the current setup_logging with LOG_ENQUEUE off
+- queue-text / queue-json: the current setup_logging with LOG_ENQUEUE on
+- sampled: queue-json with the logger sampled at 10%
+
+"drain" is the time the writer thread still needed after the last call.
+Console output goes to /dev/null, files to a temporary directory.
+
+Usage:
+    python -m benchmarks.bench_logging --calls 50000
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from app.core import logging as app_logging
+from app.core.config import settings
+
+FILE_FORMAT = "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}"
+
+
+class LegacyInterceptHandler(logging.Handler):
+    """InterceptHandler before the logging pipeline rework"""
+
+    def emit(self, record):
+        try:
+            level = logger.level(record.levelname).name
+        except ValueError:
+            level = record.levelno
+
+        frame, depth = logging.currentframe(), 2
+        while frame.f_code.co_filename == logging.__file__:
+            frame = frame.f_back
+            depth += 1
+
+        logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
+
+
+def setup_legacy(log_dir: Path, enqueue: bool = False):
+    app_logging.flush_logging()
+    logger.remove()
+    logger.configure(extra={}, patcher=None)
+    logger.add(sys.stdout, format=FILE_FORMAT, level="INFO", colorize=True, enqueue=enqueue)
+    for path, level in ((log_dir / "app.log", "INFO"), (log_dir / "error.log", "ERROR")):
+        logger.add(
+            path,
+            format=FILE_FORMAT,
+            level=level,
+            rotation="10 MB",
+            retention="30 days",
+            compression="zip",
+            enqueue=enqueue,
+        )
+    logging.basicConfig(handlers=[LegacyInterceptHandler()], level=0, force=True)
+
+
+def setup_current(log_dir: Path, log_format: str, enqueue: bool, sample_rates=None):
+    settings.LOG_FILE = str(log_dir / "app.log")
+    settings.LOG_LEVEL = "INFO"
+    settings.LOG_FORMAT = log_format
+    settings.LOG_ENQUEUE = enqueue
+    settings.LOG_QUEUE_SIZE = 1_000_000
+    settings.LOG_SAMPLE_RATES = sample_rates or {}
+    settings.LOG_RATE_LIMIT = 0
+    app_logging.setup_logging()
+
+
+def measure(label: str, setup, calls: int) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        setup(Path(directory))
+        bench_logger = logging.getLogger("app.services.bench")
+        token = app_logging.request_id_var.set("bench-request")
+        timings = []
+        try:
+            for index in range(calls):
+                started = time.perf_counter_ns()
+                bench_logger.info("Processed employee %s in department %s", index, index % 50)
+                timings.append(time.perf_counter_ns() - started)
+            drain_started = time.perf_counter()
+            app_logging.flush_logging()
+            logger.complete()
+            drain = time.perf_counter() - drain_started
+        finally:
+            app_logging.request_id_var.reset(token)
+            logger.remove()
+    timings.sort()
+    return {
+        "config": label,
+        "mean_us": round(statistics.fmean(timings) / 1000, 2),
+        "p50_us": round(timings[len(timings) // 2] / 1000, 2),
+        "p99_us": round(timings[int(len(timings) * 0.99)] / 1000, 2),
+        "drain_seconds": round(drain, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=50000)
+    args = parser.parse_args()
+
+    configs = [
+        ("legacy", setup_legacy),
+        ("loguru-enqueue", lambda d: setup_legacy(d, enqueue=True)),
+        ("sync-text", lambda d: setup_current(d, "text", False)),
+        ("sync-json", lambda d: setup_current(d, "json", False)),
+        ("queue-text", lambda d: setup_current(d, "text", True)),
+        ("queue-json", lambda d: setup_current(d, "json", True)),
+        ("sampled", lambda d: setup_current(d, "json", True, {"app.services.bench": 0.1})),
+    ]
+
+    stdout = sys.stdout
+    results = []
+    with open(os.devnull, "w") as devnull:
+        sys.stdout = devnull
+        try:
+            for label, setup in configs:
+                results.append(measure(label, setup, args.calls))
+        finally:
+            sys.stdout = stdout
+
+    baseline = results[0]["mean_us"]
+    print(f"calls={args.calls}")
+    for result in results:
+        result["speedup"] = round(baseline / result["mean_us"], 1)
+        print(result)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
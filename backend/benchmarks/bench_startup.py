@@ -0,0 +1,113 @@
+"""Startup benchmark: worker cold start
+
+Starts fresh interpreters that import app.main and run the lifespan startup,
+as a new uvicorn worker does, and reports the median of:
+
+- import_ms: importing app.main (routers, models, services)
+- startup_ms: lifespan startup, i.e. init_db's schema revision check
+- create_all_ms: what Base.metadata.create_all on an existing schema - the
+  former init_db - costs on the same database, for comparison
+- modules: modules loaded after startup, and whether numpy / openpyxl were
+
+Run it against a migrated database (alembic upgrade head). --history appends
+the result with the app version and git revision to a JSON-lines file, so
+cold start can be tracked release over release.
+
+Usage:
+    python -m benchmarks.bench_startup --runs 5
+    python -m benchmarks.bench_startup --history benchmarks/startup_history.jsonl
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+CHILD = """
+import asyncio, json, sys, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+
+async def lifespan():
+    async with app.main.app.router.lifespan_context(app.main.app):
+        ready = time.perf_counter()
+        from app.db.database import Base, engine
+        create_all_started = time.perf_counter()
+        Base.metadata.create_all(bind=engine)
+        return ready, time.perf_counter() - create_all_started
+
+ready, create_all = asyncio.run(lifespan())
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "startup_ms": (ready - imported) * 1000,
+    "create_all_ms": create_all * 1000,
+    "modules": len(sys.modules),
+    "numpy_loaded": "numpy" in sys.modules,
+    "openpyxl_loaded": "openpyxl" in sys.modules,
+}))
+"""
+
+
+def run_child() -> dict:
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["process_ms"] = (time.perf_counter() - started) * 1000
+    return result
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--history", type=Path, help="JSON-lines file to append the result to")
+    args = parser.parse_args()
+
+    runs = [run_child() for _ in range(args.runs)]
+    summary = {
+        key: round(statistics.median(run[key] for run in runs), 1)
+        for key in ("process_ms", "import_ms", "startup_ms", "create_all_ms")
+    }
+    summary["modules"] = runs[-1]["modules"]
+    summary["numpy_loaded"] = runs[-1]["numpy_loaded"]
+    summary["openpyxl_loaded"] = runs[-1]["openpyxl_loaded"]
+    print(f"runs={args.runs}")
+    print(summary)
+
+    if args.history:
+        from app.core.config import settings
+
+        record = {
+            "version": settings.APP_VERSION,
+            "revision": git_revision(),
+            "measured_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "runs": args.runs,
+            **summary,
+        }
+        with args.history.open("a", encoding="utf-8") as history:
+            history.write(json.dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
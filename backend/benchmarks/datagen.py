@@ -0,0 +1,558 @@
+"""Synthetic dataset generator - Dữ liệu giả lập
+
+Fills a database at a chosen scale with data shaped like a provincial
+agency's personnel records:
+
+- departments: a Sở / Phòng / Tổ tree of about one unit per 25 employees,
+  with its closure table
+- positions, salary grades (ngạch A3.1 ... C1) and their salary levels
+- employees: surnames, middle and given names weighted by their frequency
+  in Vietnam, ethnicity and religion shares of the census, ages 23-60
+  peaking around 40, 12-digit citizen ids with province and century codes
+- salary histories: one row per periodic raise since the start date, at
+  the Settings periods (36 months for A grades, 24 for B/C), a few early
+  raises
+- contract chains for viên chức and laborers: probation, up to two fixed
+  terms, then an indefinite contract; recent hires are still on probation
+  and some fixed terms end within the warning window
+
+Rows are built in Python and written with Core bulk INSERTs, one
+transaction per chunk of employees, so memory stays flat at 500k employees.
+The columns ORM events maintain (search_text, retirement_date, closure
+rows, effective_to / is_current) are computed here, and the workforce
+aggregates are reconciled at the end. The same seed gives the same data.
+
+Usage:
+    python -m benchmarks.datagen --employees 50000
+    python -m benchmarks.datagen --employees 1000 --reset --seed 7
+"""
+
+from bisect import bisect
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from itertools import accumulate
+from typing import Dict, List, Optional, Sequence, Tuple
+import argparse
+import calendar
+import logging
+import random
+import time
+import uuid
+
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import Base, engine
+from app.models.contract import Contract, ContractStatus, ContractType
+from app.models.department import Department, DepartmentClosure, Position
+from app.models.employee import Employee, EmployeeStatus, EmployeeType, Gender, compute_retirement_date, compute_search_text
+from app.models.salary import SalaryGrade, SalaryGradeType, SalaryHistory, SalaryLevel
+from app.services.dashboard import reconcile_workforce_aggregates
+from app.services.salary_raise import REGULAR_GRADE_TYPES
+from app.utils.text import strip_accents
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5000
+
+EMPLOYEES_PER_DEPARTMENT = 25
+
+# Lương cơ sở (VND)
+BASE_SALARY = 2_340_000
+
+EMAIL_DOMAIN = "hrms.gov.vn"
+
+
+class Weighted:
+    """Weighted choice over a fixed table, O(log n) per draw"""
+
+    def __init__(self, table: Sequence[Tuple[object, float]]):
+        self.values = [value for value, _ in table]
+        self.cumulative = list(accumulate(weight for _, weight in table))
+
+    def __call__(self, rng: random.Random):
+        return self.values[bisect(self.cumulative, rng.random() * self.cumulative[-1])]
+
+
+def _zipf(values: Sequence[str], exponent: float = 0.8) -> Weighted:
+    """Earlier names are more common"""
+    return Weighted([(value, 1 / (rank + 1) ** exponent) for rank, value in enumerate(values)])
+
+
+SURNAMES = Weighted([
+    ("Nguyễn", 38.4), ("Trần", 12.1), ("Lê", 9.5), ("Phạm", 7.0), ("Hoàng", 3.1), ("Huỳnh", 2.0),
+    ("Phan", 4.5), ("Vũ", 2.4), ("Võ", 1.5), ("Đặng", 2.1), ("Bùi", 2.0), ("Đỗ", 1.4), ("Hồ", 1.3),
+    ("Ngô", 1.3), ("Dương", 1.0), ("Lý", 0.5), ("Đinh", 0.6), ("Trương", 0.6), ("Lương", 0.4),
+    ("Mai", 0.4), ("Cao", 0.4), ("Tạ", 0.3), ("Lâm", 0.3), ("Hà", 0.4), ("Chu", 0.2), ("Kiều", 0.1),
+])
+MIDDLE_NAMES = {
+    Gender.MALE: Weighted([
+        ("Văn", 40), ("Đức", 10), ("Minh", 10), ("Hữu", 8), ("Quang", 8), ("Thành", 6), ("Xuân", 5),
+        ("Công", 5), ("Ngọc", 4), ("Thanh", 4), ("Tiến", 3), ("Trọng", 3),
+    ]),
+    Gender.FEMALE: Weighted([
+        ("Thị", 55), ("Ngọc", 8), ("Thu", 7), ("Thanh", 7), ("Minh", 5), ("Phương", 5), ("Hồng", 5),
+        ("Kim", 4), ("Bích", 4), ("Thùy", 3), ("Mai", 2),
+    ]),
+}
+GIVEN_NAMES = {
+    Gender.MALE: _zipf([
+        "Anh", "Minh", "Hùng", "Dũng", "Tuấn", "Nam", "Hải", "Long", "Thắng", "Sơn", "Quân", "Hiếu",
+        "Huy", "Trung", "Cường", "Bình", "Phong", "Đạt", "Hoàng", "Khánh", "Tùng", "Thành", "Việt",
+        "Vinh", "Kiên", "Phúc", "Tài", "Khoa", "Lâm", "Duy",
+    ]),
+    Gender.FEMALE: _zipf([
+        "Linh", "Anh", "Trang", "Hương", "Hà", "Ngọc", "Thảo", "Huyền", "Phương", "Lan", "Hằng", "Mai",
+        "Thủy", "Nhung", "Hạnh", "Hiền", "Yến", "Dung", "Giang", "Vân", "Quỳnh", "Nga", "Hoa", "Loan",
+        "Chi", "Tâm", "Uyên", "My", "Oanh", "Thu",
+    ]),
+}
+ETHNICITIES = Weighted([
+    ("Kinh", 85.3), ("Tày", 1.9), ("Thái", 1.9), ("Mường", 1.5), ("Khmer", 1.4), ("H'Mông", 1.5),
+    ("Nùng", 1.1), ("Dao", 0.9), ("Hoa", 0.8), ("Gia Rai", 0.5), ("Ê Đê", 0.4), ("Ba Na", 0.3),
+])
+RELIGIONS = Weighted([
+    ("Không", 86.0), ("Công giáo", 6.1), ("Phật giáo", 4.8), ("Tin Lành", 1.0), ("Cao Đài", 1.1),
+    ("Phật giáo Hòa Hảo", 1.0),
+])
+# Tỉnh/thành -> mã tỉnh of the citizen id
+PROVINCES = Weighted([
+    (("Hà Nội", "001"), 14), (("TP. Hồ Chí Minh", "079"), 12), (("Thanh Hóa", "038"), 6),
+    (("Nghệ An", "040"), 6), (("Hải Phòng", "031"), 4), (("Nam Định", "036"), 4), (("Thái Bình", "034"), 4),
+    (("Hà Tĩnh", "042"), 3), (("Hải Dương", "030"), 3), (("Bắc Ninh", "027"), 3), (("Quảng Ninh", "022"), 3),
+    (("Đà Nẵng", "048"), 3), (("Quảng Nam", "049"), 3), (("Thừa Thiên Huế", "046"), 3), (("Bình Định", "052"), 3),
+    (("Khánh Hòa", "056"), 2), (("Lâm Đồng", "068"), 2), (("Đồng Nai", "075"), 3), (("Bình Dương", "074"), 3),
+    (("Long An", "080"), 2), (("Cần Thơ", "092"), 2), (("An Giang", "089"), 2),
+])
+STREETS = [
+    "Trần Hưng Đạo", "Lê Lợi", "Nguyễn Huệ", "Hai Bà Trưng", "Lý Thường Kiệt", "Quang Trung", "Điện Biên Phủ",
+    "Hùng Vương", "Nguyễn Trãi", "Phan Chu Trinh", "Lê Duẩn", "Võ Thị Sáu", "Nguyễn Du", "Bà Triệu",
+]
+MOBILE_PREFIXES = ["032", "033", "034", "035", "036", "037", "038", "039", "070", "076", "077", "078", "079",
+                   "081", "082", "083", "084", "085", "086", "088", "089", "090", "091", "093", "094", "096",
+                   "097", "098"]
+
+EMPLOYEE_TYPES = Weighted([
+    (EmployeeType.PUBLIC_EMPLOYEE, 55), (EmployeeType.CIVIL_SERVANT, 25), (EmployeeType.LABORER, 15),
+    (EmployeeType.CADRE, 5),
+])
+STATUSES = Weighted([
+    (EmployeeStatus.ACTIVE, 90.0), (EmployeeStatus.ON_LEAVE, 2.0), (EmployeeStatus.MATERNITY_LEAVE, 1.5),
+    (EmployeeStatus.STUDYING, 1.0), (EmployeeStatus.UNPAID_LEAVE, 0.5), (EmployeeStatus.DISPATCHED, 0.5),
+    (EmployeeStatus.ROTATED, 0.5), (EmployeeStatus.RESIGNED, 2.0), (EmployeeStatus.TRANSFERRED, 1.0),
+    (EmployeeStatus.RETIRED, 1.0),
+])
+
+DEPARTMENT_TOPICS = [
+    "Tổ chức cán bộ", "Tài chính - Kế toán", "Kế hoạch - Đầu tư", "Hành chính - Quản trị", "Thanh tra",
+    "Pháp chế", "Công nghệ thông tin", "Hợp tác quốc tế", "Văn hóa - Xã hội", "Tài nguyên - Môi trường",
+    "Y tế", "Giáo dục - Đào tạo", "Giao thông vận tải", "Nông nghiệp", "Lao động - Thương binh và Xã hội",
+    "Xây dựng", "Nội vụ", "Tư pháp", "Công thương", "Khoa học - Công nghệ",
+]
+# Unit name by depth: 0 is the agency itself
+DEPARTMENT_KINDS = ["Ủy ban nhân dân tỉnh", "Sở", "Phòng", "Tổ", "Nhóm"]
+
+# code, name, level, allowance coefficient, leadership, management, weight, salary grade code
+POSITIONS = [
+    ("GD", "Giám đốc", 1, 0.9, True, True, 0.3, "01.002"),
+    ("PGD", "Phó Giám đốc", 2, 0.7, True, True, 1.0, "01.002"),
+    ("TP", "Trưởng phòng", 3, 0.5, False, True, 3.0, "01.002"),
+    ("PTP", "Phó Trưởng phòng", 4, 0.3, False, True, 5.0, "01.003"),
+    ("TT", "Tổ trưởng", 5, 0.2, False, True, 4.0, "01.003"),
+    ("CVCC", "Chuyên viên cao cấp", 6, 0.0, False, False, 1.0, "01.001"),
+    ("CVC", "Chuyên viên chính", 7, 0.0, False, False, 12.0, "01.002"),
+    ("CV", "Chuyên viên", 8, 0.0, False, False, 45.0, "01.003"),
+    ("CS", "Cán sự", 9, 0.0, False, False, 6.0, "01.004"),
+    ("NV", "Nhân viên", 10, 0.0, False, False, 20.0, "01.005"),
+]
+# code, name, type, levels, first coefficient, step; raise periods follow the Settings rules
+SALARY_GRADES = [
+    ("01.001", "Chuyên viên cao cấp", SalaryGradeType.A3_1, 6, 6.20, 0.36),
+    ("01.002", "Chuyên viên chính", SalaryGradeType.A2_1, 8, 4.40, 0.34),
+    ("01.003", "Chuyên viên", SalaryGradeType.A1, 9, 2.34, 0.33),
+    ("01.004", "Cán sự", SalaryGradeType.A0, 10, 2.10, 0.31),
+    ("01.005", "Nhân viên", SalaryGradeType.B, 12, 1.86, 0.20),
+    ("01.007", "Nhân viên kỹ thuật", SalaryGradeType.C1, 12, 1.65, 0.18),
+]
+FIXED_TERMS = Weighted([(ContractType.FIXED_TERM_12, 30), (ContractType.FIXED_TERM_24, 30), (ContractType.FIXED_TERM_36, 40)])
+TERM_MONTHS = {ContractType.FIXED_TERM_12: 12, ContractType.FIXED_TERM_24: 24, ContractType.FIXED_TERM_36: 36}
+
+PROBATION_DAYS = 60
+NEW_HIRE_SHARE = 0.02
+DEACTIVATED_SHARE = 0.01
+
+
+@dataclass
+class Reference:
+    """Rows employees point to"""
+    department_ids: List[uuid.UUID] = field(default_factory=list)
+    department_names: Dict[uuid.UUID, str] = field(default_factory=dict)
+    positions: List[dict] = field(default_factory=list)
+    position_weights: Optional[Weighted] = None
+    grades: Dict[str, dict] = field(default_factory=dict)
+
+
+@dataclass
+class Counters:
+    """Running sequence numbers, unique across chunks"""
+    contracts: int = 0
+    decisions: int = 0
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _add_months(value: date, months: int) -> date:
+    """relativedelta(months=...) without its per-call overhead"""
+    month = value.month - 1 + months
+    year, month = value.year + month // 12, month % 12 + 1
+    return value.replace(year=year, month=month, day=min(value.day, calendar.monthrange(year, month)[1]))
+
+
+def _insert(connection: Connection, table, rows: List[dict], chunk_size: int) -> None:
+    for start in range(0, len(rows), chunk_size):
+        connection.execute(table.insert(), rows[start:start + chunk_size])
+
+
+def _departments(rng: random.Random, count: int) -> Tuple[List[dict], List[dict]]:
+    """A tree of count units, breadth first, and its closure rows"""
+    root = {"id": _uuid(rng), "code": "D00000", "name": DEPARTMENT_KINDS[0], "parent_id": None, "order": 0}
+    departments, ancestors, depths = [root], {root["id"]: [root["id"]]}, {root["id"]: 0}
+    queue = deque([root])
+    while len(departments) < count:
+        parent = queue.popleft()
+        depth = depths[parent["id"]] + 1
+        kind = DEPARTMENT_KINDS[min(depth, len(DEPARTMENT_KINDS) - 1)]
+        for order in range(min(rng.randint(2, 10), count - len(departments))):
+            department_id = _uuid(rng)
+            topic = rng.choice(DEPARTMENT_TOPICS)
+            department = {
+                "id": department_id,
+                "code": f"D{len(departments):05d}",
+                "name": f"{kind} {topic}" if depth <= 2 else f"{kind} {topic} {order + 1}",
+                "parent_id": parent["id"],
+                "order": order,
+            }
+            departments.append(department)
+            ancestors[department_id] = ancestors[parent["id"]] + [department_id]
+            depths[department_id] = depth
+            queue.append(department)
+    closure = [
+        {"ancestor_id": ancestor_id, "descendant_id": descendant_id, "depth": len(path) - 1 - position}
+        for descendant_id, path in ancestors.items()
+        for position, ancestor_id in enumerate(path)
+    ]
+    return departments, closure
+
+
+def _reference_rows(rng: random.Random, employees: int) -> Tuple[Reference, Dict[object, List[dict]]]:
+    reference = Reference()
+    departments, closure = _departments(rng, max(3, employees // EMPLOYEES_PER_DEPARTMENT))
+    # Employees work in the units, not in the agency itself
+    reference.department_ids = [department["id"] for department in departments[1:]]
+    reference.department_names = {department["id"]: department["name"] for department in departments}
+
+    positions = []
+    for code, name, level, allowance, leadership, management, weight, grade_code in POSITIONS:
+        positions.append({
+            "id": _uuid(rng),
+            "code": code,
+            "name": name,
+            "level": level,
+            "order": level,
+            "position_allowance": allowance,
+            "responsibility_allowance": 0.0,
+            "is_leadership": leadership,
+            "is_management": management,
+            "is_executive_committee": False,
+            "is_presidium_member": False,
+        })
+        reference.positions.append({**positions[-1], "grade_code": grade_code})
+    reference.position_weights = Weighted([(position, item[6]) for position, item in zip(reference.positions, POSITIONS)])
+
+    grades, levels = [], []
+    for code, name, grade_type, level_count, first, step in SALARY_GRADES:
+        grade = {
+            "id": _uuid(rng),
+            "code": code,
+            "name": name,
+            "grade_type": grade_type,
+            "raise_period_months": None,
+            "min_level": 1,
+            "max_level": level_count,
+        }
+        grades.append(grade)
+        coefficients = [round(first + step * index, 2) for index in range(level_count)]
+        period = (
+            settings.SALARY_RAISE_REGULAR_MONTHS if grade_type in REGULAR_GRADE_TYPES else settings.SALARY_RAISE_STAFF_MONTHS
+        )
+        reference.grades[code] = {**grade, "coefficients": coefficients, "period": period}
+        levels.extend(
+            {"id": _uuid(rng), "salary_grade_id": grade["id"], "level": index + 1, "coefficient": coefficient}
+            for index, coefficient in enumerate(coefficients)
+        )
+    tables = {
+        Department.__table__: departments,
+        DepartmentClosure.__table__: closure,
+        Position.__table__: positions,
+        SalaryGrade.__table__: grades,
+        SalaryLevel.__table__: levels,
+    }
+    return reference, tables
+
+
+def _email_name(given: str, surname: str, middle: str) -> str:
+    return strip_accents(f"{given}.{surname[0]}{middle[0]}").lower().replace(" ", "")
+
+
+def _employee(rng: random.Random, index: int, reference: Reference, today: date) -> Tuple[dict, dict]:
+    """Employee row and what its contracts and salary rows need"""
+    gender = Gender.FEMALE if rng.random() < 0.52 else Gender.MALE
+    surname, middle, given = SURNAMES(rng), MIDDLE_NAMES[gender](rng), GIVEN_NAMES[gender](rng)
+    full_name = f"{surname} {middle} {given}"
+    employee_code = f"NV{index + 1:06d}"
+    email = f"{_email_name(given, surname, middle)}{index + 1}@{EMAIL_DOMAIN}"
+
+    age = rng.triangular(23, 60, 40)
+    date_of_birth = today - timedelta(days=int(age * 365.25))
+    if rng.random() < NEW_HIRE_SHARE:
+        start_date = today - timedelta(days=rng.randint(0, PROBATION_DAYS - 1))
+    else:
+        start_age = rng.uniform(22, min(age, 35))
+        start_date = date_of_birth + timedelta(days=int(start_age * 365.25))
+    (province, province_code), hometown = PROVINCES(rng), PROVINCES(rng)[0]
+    century = (0 if date_of_birth.year < 2000 else 2) + (1 if gender == Gender.FEMALE else 0)
+    citizen_id = f"{province_code}{century}{date_of_birth.year % 100:02d}{index:06d}"
+    employee_type = EMPLOYEE_TYPES(rng)
+    position = reference.position_weights(rng)
+    status = STATUSES(rng)
+    party_member = None
+    if employee_type != EmployeeType.LABORER and rng.random() < 0.35:
+        joined = start_date + timedelta(days=rng.randint(365, 3650))
+        party_member = joined if joined <= today else None
+
+    employee = {
+        "id": _uuid(rng),
+        "employee_code": employee_code,
+        "full_name": full_name,
+        "date_of_birth": date_of_birth,
+        "gender": gender,
+        "citizen_id": citizen_id,
+        # Căn cước công dân gắn chip, issued from 2021
+        "citizen_id_issue_date": date(2021, 1, 1) + timedelta(days=rng.randint(0, (today - date(2021, 1, 1)).days)),
+        "citizen_id_issue_place": "Cục Cảnh sát quản lý hành chính về trật tự xã hội",
+        "phone_number": f"{rng.choice(MOBILE_PREFIXES)}{rng.randint(0, 9999999):07d}",
+        "email": email,
+        "permanent_address": f"{rng.randint(1, 300)} {rng.choice(STREETS)}, {province}",
+        "temporary_address": None,
+        "hometown": hometown,
+        "ethnicity": ETHNICITIES(rng),
+        "religion": RELIGIONS(rng),
+        "party_member": party_member,
+        "employee_type": employee_type,
+        "status": status,
+        "start_date": start_date,
+        "social_insurance_start_date": start_date,
+        "retirement_date": compute_retirement_date(date_of_birth, gender),
+        "department_id": rng.choice(reference.department_ids),
+        "position_id": position["id"],
+        "education_level": rng.choice(["Đại học", "Đại học", "Đại học", "Thạc sĩ", "Cao đẳng", "Tiến sĩ"]),
+        "political_theory_level": rng.choice([None, "Sơ cấp", "Trung cấp", "Cao cấp"]),
+        "state_management_level": rng.choice([None, "Chuyên viên", "Chuyên viên chính"]),
+        "avatar_url": None,
+        "notes": None,
+        "search_text": compute_search_text(full_name, employee_code, citizen_id, email),
+        "is_active": rng.random() >= DEACTIVATED_SHARE,
+    }
+    grade_code = "01.007" if employee_type == EmployeeType.LABORER and rng.random() < 0.5 else position["grade_code"]
+    return employee, {"position": position, "grade": reference.grades[grade_code]}
+
+
+def _salary_histories(rng: random.Random, employee: dict, grade: dict, position: dict, counters: Counters, today: date) -> List[dict]:
+    """One row per periodic raise since the start date, the last one current"""
+    period = grade["period"]
+    rows, level, effective_date = [], 1, employee["start_date"]
+    while True:
+        counters.decisions += 1
+        at_max = level >= grade["max_level"]
+        next_raise = None if at_max else _add_months(effective_date, period)
+        early = not at_max and rng.random() < 0.05
+        if early:
+            next_raise = _add_months(next_raise, -12)
+        rows.append({
+            "id": _uuid(rng),
+            "employee_id": employee["id"],
+            "salary_grade_id": grade["id"],
+            "salary_level": level,
+            "salary_coefficient": grade["coefficients"][level - 1],
+            "effective_date": effective_date,
+            "next_raise_date": next_raise,
+            "is_raise_eligible": not at_max,
+            "decision_number": f"{counters.decisions}/QĐ-SNV",
+            "decision_date": effective_date - timedelta(days=rng.randint(3, 20)),
+            "is_early_raise": bool(rows) and rows[-1]["_early"],
+            "early_raise_reason": "Hoàn thành xuất sắc nhiệm vụ" if rows and rows[-1]["_early"] else None,
+            "seniority_allowance_percent": 0.0,
+            "position_allowance": position["position_allowance"],
+            "responsibility_allowance": 0.0,
+            "hazard_allowance": 0.0,
+            "other_allowances": 0.0,
+            "notes": None,
+            "is_active": True,
+            "_early": early,
+        })
+        if next_raise is None or next_raise > today:
+            break
+        level, effective_date = level + 1, next_raise
+    if rows[-1]["salary_level"] >= grade["max_level"]:
+        # Vượt khung: 5% after three years at the top, +1% a year after that
+        years = (today - rows[-1]["effective_date"]).days // 365
+        rows[-1]["seniority_allowance_percent"] = float(min(5 + years - 3, 15)) if years >= 3 else 0.0
+    for row, next_row in zip(rows, rows[1:] + [None]):
+        del row["_early"]
+        row["effective_to"] = next_row["effective_date"] if next_row is not None else None
+        row["is_current"] = next_row is None
+    return rows
+
+
+def _contracts(rng: random.Random, employee: dict, grade: dict, department_name: str, position: dict,
+               counters: Counters, today: date) -> List[dict]:
+    """Probation, fixed terms, then an indefinite contract, each extending the previous"""
+    if employee["employee_type"] not in (EmployeeType.PUBLIC_EMPLOYEE, EmployeeType.LABORER):
+        return []
+    coefficient = grade["coefficients"][0]
+    rows, start = [], employee["start_date"]
+    fixed_terms = 0
+    while True:
+        if not rows:
+            contract_type, end = ContractType.PROBATION, start + timedelta(days=PROBATION_DAYS)
+        elif fixed_terms < 2 and rng.random() < 0.7:
+            contract_type = FIXED_TERMS(rng)
+            end = _add_months(start, TERM_MONTHS[contract_type]) - timedelta(days=1)
+            fixed_terms += 1
+        else:
+            contract_type, end = ContractType.INDEFINITE, None
+        counters.contracts += 1
+        rows.append({
+            "id": _uuid(rng),
+            "contract_number": f"{counters.contracts:07d}/HĐ",
+            "employee_id": employee["id"],
+            "contract_type": contract_type,
+            "status": ContractStatus.ACTIVE,
+            "start_date": start,
+            "end_date": end,
+            "probation_end_date": end if contract_type == ContractType.PROBATION else None,
+            "contract_order": len(rows) + 1,
+            "previous_contract_id": rows[-1]["id"] if rows else None,
+            "basic_salary": round(coefficient * BASE_SALARY, -3),
+            "salary_coefficient": coefficient,
+            "allowances": position["position_allowance"] * BASE_SALARY,
+            "position": position["name"],
+            "department": department_name,
+            "work_location": employee["permanent_address"].rsplit(", ", 1)[-1],
+            "signed_date": start - timedelta(days=rng.randint(0, 7)),
+            "signed_by_employee": True,
+            "signed_by_employer": True,
+            "employer_representative": "Giám đốc Sở Nội vụ",
+            "extended_to_contract_id": None,
+            "termination_date": None,
+            "termination_reason": None,
+            "probation_warning_sent": False,
+            "expiry_warning_sent": False,
+            "is_active": True,
+        })
+        if end is None or end >= today:
+            break
+        rows[-1]["status"] = ContractStatus.EXTENDED
+        start = end + timedelta(days=1)
+    for row, next_row in zip(rows, rows[1:]):
+        row["extended_to_contract_id"] = next_row["id"]
+    if employee["status"] in (EmployeeStatus.RESIGNED, EmployeeStatus.TRANSFERRED, EmployeeStatus.RETIRED):
+        last = rows[-1]
+        last["status"] = ContractStatus.TERMINATED
+        last["termination_date"] = max(last["start_date"], today - timedelta(days=rng.randint(1, 365)))
+        last["termination_reason"] = employee["status"].value
+    return rows
+
+
+def generate(engine: Engine, employees: int, seed: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE, reset: bool = False) -> dict:
+    """
+    Fill the database with a synthetic dataset
+
+    Args:
+        engine: Database to fill
+        employees: Number of employees
+        seed: Random seed; the same seed gives the same rows
+        chunk_size: Employees written per transaction
+        reset: Drop and recreate all tables first
+
+    Returns:
+        dict: Rows written per table and the seconds taken
+
+    Raises:
+        RuntimeError: If the database already has employees and reset is off
+    """
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    today = date.today()
+    if reset:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.connect() as connection:
+        if connection.execute(select(func.count()).select_from(Employee.__table__)).scalar_one():
+            raise RuntimeError("The database already has employees; generate with reset to replace them")
+
+    counts: Dict[str, int] = {}
+    reference, tables = _reference_rows(rng, employees)
+    with engine.begin() as connection:
+        for table, rows in tables.items():
+            _insert(connection, table, rows, chunk_size)
+            counts[table.name] = len(rows)
+
+    counters = Counters()
+    for chunk_start in range(0, employees, chunk_size):
+        employee_rows, contract_rows, salary_rows = [], [], []
+        for index in range(chunk_start, min(chunk_start + chunk_size, employees)):
+            employee, related = _employee(rng, index, reference, today)
+            employee_rows.append(employee)
+            salary_rows.extend(_salary_histories(rng, employee, related["grade"], related["position"], counters, today))
+            department_name = reference.department_names[employee["department_id"]]
+            contract_rows.extend(
+                _contracts(rng, employee, related["grade"], department_name, related["position"], counters, today)
+            )
+        with engine.begin() as connection:
+            _insert(connection, Employee.__table__, employee_rows, chunk_size)
+            _insert(connection, SalaryHistory.__table__, salary_rows, chunk_size)
+            # Chains point forwards and backwards: insert, then link
+            _insert(connection, Contract.__table__, [{**row, "extended_to_contract_id": None} for row in contract_rows], chunk_size)
+            links = [row for row in contract_rows if row["extended_to_contract_id"] is not None]
+            if links:
+                table = Contract.__table__
+                connection.execute(
+                    table.update()
+                    .where(table.c.id == bindparam("_id"))
+                    .values(extended_to_contract_id=bindparam("_extended_to"), updated_at=table.c.updated_at),
+                    [{"_id": row["id"], "_extended_to": row["extended_to_contract_id"]} for row in links],
+                )
+        for name, rows in (("employees", employee_rows), ("salary_histories", salary_rows), ("contracts", contract_rows)):
+            counts[name] = counts.get(name, 0) + len(rows)
+        logger.info(f"Generated {chunk_start + len(employee_rows)}/{employees} employees")
+
+    # Dashboard counters are kept by ORM events, which bulk inserts skip
+    with Session(bind=engine) as db:
+        reconcile_workforce_aggregates(db)
+    return {"rows": counts, "seconds": round(time.perf_counter() - started, 1)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate all tables first")
+    args = parser.parse_args()
+    print(generate(engine, args.employees, seed=args.seed, chunk_size=args.chunk_size, reset=args.reset))
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""Test fixtures - run with `pytest` from backend/
+
+The app runs with ENVIRONMENT=test: both engines open one in-memory SQLite
+database, whose tables are created for each test and dropped after it.
+"""
+
+from datetime import date
+import os
+
+os.environ["ENVIRONMENT"] = "test"
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.database import Base, SessionLocal, engine
+from app.main import app
+from app.models.employee import Employee, EmployeeStatus, EmployeeType, Gender
+from app.models.salary import SalaryGrade, SalaryGradeType, SalaryHistory
+from app.services.employee_search import invalidate_search_index
+
+
+@pytest.fixture
+def db():
+    """Session on an empty schema"""
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+        invalidate_search_index()
+
+
+@pytest.fixture
+def client(db):
+    """Client of the app, without running its lifespan"""
+    return TestClient(app)
+
+
+@pytest.fixture
+def grade(db):
+    """Chuyên viên (A1) salary grade"""
+    grade = SalaryGrade(code="01.003", name="Chuyên viên", grade_type=SalaryGradeType.A1, min_level=1, max_level=9)
+    db.add(grade)
+    db.commit()
+    return grade
+
+
+@pytest.fixture
+def make_employee(db, grade):
+    """Factory of committed employees, with a current salary row"""
+    counter = iter(range(1, 10000))
+
+    def make(
+        status: EmployeeStatus = EmployeeStatus.ACTIVE,
+        employee_type: EmployeeType = EmployeeType.CIVIL_SERVANT,
+        date_of_birth: date = date(1980, 6, 2),
+        gender: Gender = Gender.MALE,
+        start_date: date = date(2010, 1, 1),
+    ) -> Employee:
+        number = next(counter)
+        employee = Employee(
+            employee_code=f"NV{number:05d}",
+            full_name=f"Nguyễn Văn {number}",
+            date_of_birth=date_of_birth,
+            gender=gender,
+            citizen_id=f"{number:012d}",
+            employee_type=employee_type,
+            status=status,
+            start_date=start_date,
+        )
+        db.add(employee)
+        db.flush()
+        db.add(
+            SalaryHistory(
+                employee_id=employee.id,
+                salary_grade_id=grade.id,
+                salary_level=3,
+                salary_coefficient=3.0,
+                effective_date=start_date,
+            )
+        )
+        db.commit()
+        return employee
+
+    return make
\ No newline at end of file
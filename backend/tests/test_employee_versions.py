@@ -0,0 +1,74 @@
+"""Validators and delta sync of employee views after bulk recomputes"""
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.models.employee import Employee
+from app.models.salary import SalaryHistory
+from app.services.retirement import recompute_retirement_dates
+from app.services.salary_raise import recompute_raise_schedule
+
+
+def _backdate(db) -> None:
+    """Age every row, so the recompute lands in a later second than its last write"""
+    an_hour_ago = datetime.now(timezone.utc) - timedelta(hours=1)
+    for model in (Employee, SalaryHistory):
+        db.execute(update(model).values(updated_at=an_hour_ago))
+    db.commit()
+
+
+def _etag(client, employee_id) -> str:
+    response = client.get(f"/api/v1/employees/{employee_id}")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert client.get(f"/api/v1/employees/{employee_id}", headers={"If-None-Match": etag}).status_code == 304
+    return etag
+
+
+def test_retirement_recompute_changes_the_etag(db, client, make_employee, monkeypatch):
+    employee = make_employee()
+    _backdate(db)
+    etag = _etag(client, employee.id)
+
+    monkeypatch.setattr(settings, "RETIREMENT_AGE_MALE", settings.RETIREMENT_AGE_MALE + 3)
+    assert recompute_retirement_dates(db) == 1
+
+    response = client.get(f"/api/v1/employees/{employee.id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    db.refresh(employee)
+    assert response.json()["retirement_date"] == employee.retirement_date.isoformat()
+
+
+def test_raise_schedule_recompute_changes_the_etag(db, client, make_employee):
+    employee = make_employee()
+    _backdate(db)
+    etag = _etag(client, employee.id)
+
+    assert recompute_raise_schedule(db, full=True).updated == 1
+
+    response = client.get(f"/api/v1/employees/{employee.id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    (history,) = response.json()["salary_histories"]
+    assert history["next_raise_date"] is not None
+    assert history["is_raise_eligible"] is True
+    # The row carries the run's watermark, so the next incremental run skips it
+    assert recompute_raise_schedule(db).scanned == 0
+
+
+def test_retirement_recompute_reaches_the_delta_feed(db, client, make_employee, monkeypatch):
+    employee = make_employee()
+    _backdate(db)
+    since = (datetime.now(timezone.utc) - timedelta(hours=2)).isoformat()
+    synced = client.get("/api/v1/employees/changes", params={"since": since}).json()
+    assert [item["id"] for item in synced["items"]] == [str(employee.id)]
+    assert not synced["has_more"]
+    cursor = synced["next_cursor"]
+    assert client.get("/api/v1/employees/changes", params={"cursor": cursor}).json()["items"] == []
+
+    monkeypatch.setattr(settings, "RETIREMENT_AGE_MALE", settings.RETIREMENT_AGE_MALE + 3)
+    recompute_retirement_dates(db)
+
+    changes = client.get("/api/v1/employees/changes", params={"cursor": cursor}).json()
+    assert [item["id"] for item in changes["items"]] == [str(employee.id)]
\ No newline at end of file
@@ -0,0 +1,57 @@
+"""Payroll eligibility - who is paid for a month"""
+
+from datetime import date, timedelta
+
+from app.models.contract import Contract, ContractStatus, ContractType
+from app.models.employee import EmployeeStatus, EmployeeType
+from app.services.payroll import get_payroll, month_bounds, run_payroll
+
+
+def _paid(db, period: date) -> set:
+    run_payroll(db, period)
+    return {row["employee_id"] for row in get_payroll(db, period)}
+
+
+def test_leaver_without_dates_is_not_paid(db, make_employee):
+    working = make_employee()
+    resigned = make_employee(status=EmployeeStatus.RESIGNED)
+    transferred = make_employee(status=EmployeeStatus.TRANSFERRED)
+    # Retired early: retirement_date, from the legal age, is still ahead
+    retired = make_employee(status=EmployeeStatus.RETIRED)
+    assert retired.retirement_date > date.today()
+
+    paid = _paid(db, date.today())
+
+    assert str(working.id) in paid
+    assert not {str(resigned.id), str(transferred.id), str(retired.id)} & paid
+
+
+def test_leaver_is_paid_until_the_termination_month(db, make_employee):
+    last_month = month_bounds(month_bounds(date.today())[0] - timedelta(days=1))[0]
+    laborer = make_employee(status=EmployeeStatus.RESIGNED, employee_type=EmployeeType.LABORER)
+    db.add(
+        Contract(
+            contract_number="HD-0001",
+            employee_id=laborer.id,
+            contract_type=ContractType.INDEFINITE,
+            status=ContractStatus.TERMINATED,
+            start_date=date(2010, 1, 1),
+            basic_salary=8_000_000,
+            termination_date=last_month + timedelta(days=9),
+        )
+    )
+    db.commit()
+
+    assert str(laborer.id) in _paid(db, last_month)
+    assert str(laborer.id) not in _paid(db, date.today())
+
+
+def test_retiree_is_paid_until_the_retirement_month(db, make_employee):
+    today = date.today()
+    born = today.replace(year=today.year - 62, day=1)
+    retiree = make_employee(status=EmployeeStatus.RETIRED, date_of_birth=born)
+    assert retiree.retirement_date <= today
+
+    assert str(retiree.id) in _paid(db, today)
+    next_month = month_bounds(today)[1] + timedelta(days=1)
+    assert str(retiree.id) not in _paid(db, next_month)
\ No newline at end of file